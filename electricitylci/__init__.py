@@ -24,7 +24,7 @@ __doc__ = """This module contains the main API functions to be used by the
 end user.
 
 Last updated:
-    2025-06-09
+    2026-10-17
 """
 __version__ = elci_version
 
@@ -78,15 +78,26 @@ def aggregate_gen(gen_df, subregion="BA"):
     gen_df : pandas.DataFrame
         The generation dataframe as generated by get_gen_plus_netl
         or get_generation_process_df.
-    subregion : str, optional
+    subregion : str or list, optional
         The level of subregion that the data will be aggregated to. Choices
         are 'eGRID', 'NERC', 'FERC', 'BA', 'US'. Defaults to 'BA'.
+        If a list of subregions is given, they share one pass of the
+        facility-level preparation steps (see
+        generation.aggregate_data_levels).
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame or dict
+        The aggregated data frame; or, if a list of subregions is given, a
+        dictionary of aggregated data frames (values) for each subregion
+        (keys).
     """
     from electricitylci.generation import aggregate_data
+    from electricitylci.generation import aggregate_data_levels
+
+    if isinstance(subregion, (list, tuple)):
+        logging.info(f"Aggregating to subregions - {subregion}")
+        return aggregate_data_levels(gen_df, subregions=subregion)
 
     if subregion is None:
         # This change has been made to accommodate the new method of generating
@@ -481,6 +492,12 @@ def get_generation_process_df(regions=None, **kwargs):
     # gen_plus_fuels could be retained without aggregation.
     to_agg = kwargs.get("to_agg", True)
     if to_agg:
+        from electricitylci.generation import set_inventory_dtypes
+
+        # Concatenating the upstream and Canadian data frames returns the
+        # categorical labels to objects; restore them before aggregation.
+        gen_plus_fuels = set_inventory_dtypes(gen_plus_fuels)
+
         if regions is None:
             regions = config.model_specs.regional_aggregation
 
@@ -810,10 +827,12 @@ def run_post_processes():
     from electricitylci.olca_jsonld_writer import build_product_systems
     from electricitylci.olca_jsonld_writer import clean_json
 
-    clean_json(config.model_specs.namestr)
+    # The cleaned archive is re-written by build_product_systems.
+    clean_json(config.model_specs.namestr, compression="stored")
     build_product_systems(
         file_path=config.model_specs.namestr,
-        elci_config=config.model_specs.model_name
+        elci_config=config.model_specs.model_name,
+        compression=config.model_specs.jsonld_compression
     )
 
 
@@ -1000,7 +1019,17 @@ def write_process_dicts_to_jsonld(*process_dicts):
         # dictionaries into a tuple of dictionaries, and here we are putting
         # it all back to a single dictionary!
         all_process_dicts = {**all_process_dicts, **d}
-    olca_dicts = write(all_process_dicts, config.model_specs.namestr)
+
+    # Archives that the post processes re-write need no compression.
+    compression = config.model_specs.jsonld_compression
+    if config.model_specs.run_post_processes:
+        compression = "stored"
+    olca_dicts = write(
+        all_process_dicts,
+        config.model_specs.namestr,
+        parallel=config.model_specs.parallel_jsonld,
+        compression=compression
+    )
     logging.info("Wrote JSON-LD to %s" % config.model_specs.namestr)
     return olca_dicts
 
@@ -7,11 +7,15 @@
 # REQUIRED MODULES
 ##############################################################################
 import datetime
+import json
 import logging
 import os
+import re
+import shutil
 import tempfile
 import zipfile
 
+import numpy as np
 import pandas as pd
 import requests
 
@@ -28,17 +32,29 @@ between balancing authority areas or between Federal Energy Regulatory
 Commission regions. This electricity trading ultimately decides the
 consumption mix for a given region.
 
+The :class:`SeriesFrameBuilder` (and its wrapper, :func:`series_to_df`)
+converts the bulk data series one at a time into a compact, columnar data
+frame, keeping only the hours in a given year. The :class:`SeriesStore`
+keeps the EBA.zip series on disk, partitioned by data type and year, so
+that the archive is parsed once per vintage (see :func:`read_EBA_vintage`).
+Both convert time stamps in batches of series with :func:`decode_hours`.
+
 Last updated:
-    2024-08-21
+    2026-10-17
 """
 __all__ = [
+    "SeriesFrameBuilder",
+    "SeriesStore",
     "ba_exchange_to_df",
     "check_EBA_vintage",
+    "decode_hours",
     "download_EBA",
     "download_EBA_manifest",
+    "read_EBA_vintage",
     "read_local_manifest_last_update",
     "read_remote_manifest_last_update",
     "row_to_df",
+    "series_to_df",
 ]
 
 
@@ -51,6 +67,349 @@ MANIFEST_URL = "http://api.eia.gov/bulk/manifest.txt"
 '''str : The API URL for EIA bulk data manifest.'''
 VINTAGE_THRESH = 30
 '''int : The threshold age (in days) to trigger new bulk data download.'''
+_EPOCH = pd.Timestamp("1970-01-01", tz="UTC")
+'''pandas.Timestamp : The Unix epoch, for counting hours of time stamps.'''
+_BATCH_SIZE = 2000000
+'''int : The number of time stamps to buffer before decoding their series.'''
+_TIME_FORMATS = {
+    'utc': (re.compile(rb'\d{8}T\d{2}Z'), b'00000000T00Z'),
+    'local': (re.compile(rb'\d{8}T\d{2}[+-]\d{2}'), b'00000000T00+00'),
+    'date': (re.compile(rb'\d{4}-\d{2}-\d{2}'), b'0000-00-00'),
+}
+'''dict : Fixed-width time stamp formats and their templates, where 0 is a
+digit and + is a sign (e.g., '20220101T05Z', '20220101T00-05', and
+'2022-01-01').'''
+_STORE_FILES = {
+    'datetime': ('hours.bin', np.int64),
+    'from_region': ('from_region.bin', np.int32),
+    'region': ('region.bin', np.int32),
+    'to_region': ('to_region.bin', np.int32),
+}
+'''dict : File names and types of the columns in the EBA store.'''
+
+
+##############################################################################
+# CLASSES
+##############################################################################
+class SeriesFrameBuilder:
+    """Collect EBA series into a compact, columnar data frame.
+
+    Each series (i.e., a dictionary with 'series_id' and 'data' keys, as
+    read from EBA.txt or recreated from EIA's API) is converted to typed
+    arrays when it is added: time stamps to hours since the Unix epoch
+    (int64, UTC), values to float32, and region names to the codes of a
+    categorical. Only the hours in the given year are kept, so that a series
+    may be discarded as soon as it is added. Time stamps are buffered and
+    decoded in batches of series (see :func:`decode_hours`).
+
+    Parameters
+    ----------
+    data_type : str
+        Name to use for the data column (e.g., 'net_gen' or 'ba_to_ba').
+    year : int, optional
+        The year (UTC) of data to keep. Defaults to all years.
+    exchange : bool, optional
+        Whether the series are BA-to-BA interchanges, which have both a
+        'from_region' and a 'to_region'. Defaults to false.
+
+    Attributes
+    ----------
+    n_series : int
+        The number of series added.
+    n_rows : int
+        The number of hours kept (of the series decoded so far).
+
+    Examples
+    --------
+    >>> builder = SeriesFrameBuilder('net_gen', year=2022)
+    >>> for row in NET_GEN_ROWS:
+    ...     builder.add(row)
+    >>> df = builder.to_frame()
+    >>> df.dtypes
+    region                 category
+    datetime    datetime64[ns, UTC]
+    net_gen                 float32
+    dtype: object
+    """
+    def __init__(self, data_type, year=None, exchange=False):
+        self.data_type = data_type
+        self.year = year
+        self.exchange = exchange
+        self.n_series = 0
+        self.n_rows = 0
+        self._bounds = None
+        if year is not None:
+            self._bounds = _year_hours(year)
+        self._regions = {}
+        self._codes = []
+        self._hours = []
+        self._values = []
+        self._batch = []
+        self._batch_size = 0
+
+    def add(self, row):
+        """Add the hours of a series in this builder's year.
+
+        Parameters
+        ----------
+        row : dict
+            A series with 'series_id' and 'data' keys, where data is a list
+            of time stamp and value pairs.
+        """
+        self.n_series += 1
+        times, values = _compact_series(row)
+        if len(times) == 0:
+            return
+        self._batch.append((None, row['series_id'], times, values))
+        self._batch_size += len(times)
+        if self._batch_size >= _BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        """Decode the buffered series and keep their hours."""
+        for _, series_id, hours, values in _decode_batch(self._batch):
+            if self._bounds is not None:
+                keep = (hours >= self._bounds[0]) & (hours < self._bounds[1])
+                hours = hours[keep]
+                values = values[keep]
+            if len(hours) == 0:
+                continue
+
+            codes = [
+                self._regions.setdefault(r, len(self._regions))
+                for r in _series_regions(series_id, self.exchange)
+            ]
+            self._codes.append((codes, len(hours)))
+            self._hours.append(hours)
+            self._values.append(values)
+            self.n_rows += len(hours)
+        self._batch = []
+        self._batch_size = 0
+
+    def to_frame(self):
+        """Return the hours added as a data frame.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A data frame with categorical region columns ('region', or
+            'from_region' and 'to_region' for interchanges), a 'datetime'
+            column (UTC), and a float32 data column.
+        """
+        self._flush()
+        columns = ['region']
+        if self.exchange:
+            columns = ['from_region', 'to_region']
+        categories = list(self._regions)
+        counts = np.array([n for _, n in self._codes], dtype=np.int64)
+        codes = np.array(
+            [c for c, _ in self._codes], dtype=np.int32
+        ).reshape(-1, len(columns))
+
+        df = pd.DataFrame({
+            col: pd.Categorical.from_codes(
+                np.repeat(codes[:, i], counts), categories=categories)
+            for i, col in enumerate(columns)
+        })
+        df['datetime'] = pd.to_datetime(
+            _concat(self._hours, np.int64), unit='h', utc=True)
+        df[self.data_type] = _concat(self._values, np.float32)
+
+        return df
+
+
+class SeriesStore:
+    """A local store of EBA series, partitioned by data type and year.
+
+    Each partition is a folder (e.g., 'net_gen/2022') of flat binary files,
+    one per column: 'hours.bin' (int64 hours since the Unix epoch, UTC),
+    'values.bin' (float32), and the region codes (int32). The files may be
+    memory-mapped with :class:`numpy.memmap`. A 'store.json' file has the
+    vintage key of the series, the region names of each data type, and the
+    number of rows in each partition.
+
+    The store is written to a temporary folder that replaces the existing
+    store once all series are written, so an interrupted write leaves the
+    previous store in place.
+
+    Parameters
+    ----------
+    path : str, optional
+        The store folder. Defaults to 'eba_store' in the bulk data folder.
+
+    Examples
+    --------
+    >>> store = SeriesStore()
+    >>> key = read_EBA_vintage()
+    >>> if not store.is_current(key):
+    ...     store.write(key, rows, {'net_gen': False, 'ba_to_ba': True})
+    >>> df = store.read('net_gen', 2022)
+    """
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(paths.local_path, 'bulk_data', 'eba_store')
+        self.path = path
+        self._meta = None
+
+    @property
+    def meta(self):
+        """dict : The contents of the store's 'store.json' file."""
+        if self._meta is None:
+            m_file = os.path.join(self.path, 'store.json')
+            self._meta = {}
+            if os.path.isfile(m_file):
+                self._meta = read_json(m_file)
+        return self._meta
+
+    def is_current(self, key):
+        """Return true if the store was written for the given vintage key.
+
+        Parameters
+        ----------
+        key : dict
+            A vintage key, see :func:`read_EBA_vintage`.
+
+        Returns
+        -------
+        bool
+        """
+        return self.meta.get('key') == key
+
+    def read(self, data_type, year=None, columns=None):
+        """Read a data type from the store, optionally for a single year.
+
+        Parameters
+        ----------
+        data_type : str
+            The data type (e.g., 'net_gen').
+        year : int, optional
+            The year (UTC) of data to read. Defaults to all years.
+        columns : list, optional
+            The columns to read (e.g., ['region']). Defaults to the region
+            columns, 'datetime', and the data type column.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A data frame like :meth:`SeriesFrameBuilder.to_frame`.
+
+        Raises
+        ------
+        KeyError
+            If the data type is not in the store.
+        """
+        info = self.meta.get('types', {}).get(data_type)
+        if info is None:
+            raise KeyError("No '%s' series in %s" % (data_type, self.path))
+        if columns is None:
+            columns = info['columns'] + ['datetime', data_type]
+
+        if year is None:
+            years = self.years(data_type)
+        else:
+            years = [year]
+
+        data = {}
+        for col in columns:
+            f_name, dtype = _STORE_FILES.get(col, ('values.bin', np.float32))
+            arrays = [
+                np.memmap(
+                    os.path.join(self.path, data_type, str(y), f_name),
+                    dtype=dtype,
+                    mode='r')
+                for y in years if info['years'].get(str(y), 0) > 0
+            ]
+            values = _concat(arrays, dtype)
+            if col in info['columns']:
+                data[col] = pd.Categorical.from_codes(
+                    values, categories=info['regions']
+                ).remove_unused_categories()
+            elif col == 'datetime':
+                data[col] = pd.to_datetime(values, unit='h', utc=True)
+            else:
+                data[col] = np.array(values)
+
+        return pd.DataFrame(data, columns=columns)
+
+    def write(self, key, rows, data_types):
+        """Write series to the store, replacing its contents.
+
+        Parameters
+        ----------
+        key : dict
+            The vintage key of the series, see :func:`read_EBA_vintage`.
+        rows : iterable
+            Tuples of data type and row (i.e., a dictionary with
+            'series_id' and 'data' keys).
+        data_types : dict
+            The data types and whether they are BA-to-BA interchanges
+            (e.g., {'net_gen': False, 'ba_to_ba': True}).
+        """
+        tmp_path = self.path + ".tmp"
+        if os.path.isdir(tmp_path):
+            shutil.rmtree(tmp_path)
+        os.makedirs(tmp_path)
+
+        types = {}
+        for data_type, exchange in data_types.items():
+            types[data_type] = {
+                'columns': ['from_region', 'to_region'] if exchange else [
+                    'region'],
+                'regions': {},
+                'years': {},
+            }
+
+        files = {}
+        try:
+            for data_type, series_id, hours, values in _iter_decoded(rows):
+                info = types[data_type]
+                if len(hours) == 0:
+                    continue
+                codes = [
+                    info['regions'].setdefault(r, len(info['regions']))
+                    for r in _series_regions(
+                        series_id, len(info['columns']) == 2)
+                ]
+
+                # Append the hours of each year to its partition.
+                years = hours.astype('datetime64[h]').astype('datetime64[Y]')
+                years = years.astype(np.int64) + 1970
+                for year in np.unique(years):
+                    sel = years == year
+                    n = int(sel.sum())
+                    part = os.path.join(tmp_path, data_type, str(year))
+                    columns = {'datetime': hours[sel], data_type: values[sel]}
+                    for col, code in zip(info['columns'], codes):
+                        columns[col] = np.full(n, code, dtype=np.int32)
+                    for col, arr in columns.items():
+                        f_name = _STORE_FILES.get(col, ('values.bin',))[0]
+                        f_path = os.path.join(part, f_name)
+                        if f_path not in files:
+                            os.makedirs(part, exist_ok=True)
+                            files[f_path] = open(f_path, 'wb')
+                        files[f_path].write(arr.tobytes())
+                    info['years'][str(year)] = info['years'].get(
+                        str(year), 0) + n
+        finally:
+            for f in files.values():
+                f.close()
+
+        for info in types.values():
+            info['regions'] = list(info['regions'])
+        meta = {'key': key, 'types': types}
+        with open(os.path.join(tmp_path, 'store.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        os.replace(tmp_path, self.path)
+        self._meta = meta
+        logging.info("Wrote EBA store to %s" % self.path)
+
+    def years(self, data_type):
+        """Return the years (UTC) of a data type in the store."""
+        info = self.meta.get('types', {}).get(data_type, {})
+        return sorted(int(y) for y in info.get('years', {}))
 
 
 ##############################################################################
@@ -77,6 +436,63 @@ def check_EBA_vintage():
         logging.info("Vintage is okay (%d days)" % (a-d).days)
 
 
+def decode_hours(series_times):
+    """Convert the time stamps of many series to hours since the Unix epoch.
+
+    The format of each series is detected once, from its first time stamp,
+    and all series of a format are converted together. The UTC hourly
+    (e.g., '20220101T05Z') and local hourly (e.g., '20220101T00-05')
+    formats of EBA.txt and the daily dates of EIA's API (e.g., '2022-01-01')
+    are parsed as fixed-width integers; other formats are inferred by pandas
+    and taken as UTC.
+
+    Parameters
+    ----------
+    series_times : list
+        The time stamps of each series, as lists or numpy arrays of strings
+        (or bytes).
+
+    Returns
+    -------
+    tuple
+        A tuple of length two.
+
+        - list : hours (numpy.ndarray, int64) since 1970-01-01 UTC for each
+          series, or None for a series whose time stamps fail to convert.
+        - list : the indices of the series that failed to convert.
+
+    Examples
+    --------
+    >>> hours, failed = decode_hours([
+    ...     ['20220101T01Z', '20220101T00Z'], ['20220101T00-05'], ['x']])
+    >>> hours[:2]
+    [array([455833, 455832]), array([455837])]
+    >>> failed
+    [2]
+    """
+    hours = [None]*len(series_times)
+    groups = {}
+    for i, times in enumerate(series_times):
+        times = _as_bytes(times)
+        if len(times) == 0:
+            hours[i] = np.empty(0, dtype=np.int64)
+        else:
+            groups.setdefault(_time_format(times), []).append((i, times))
+
+    for fmt, group in groups.items():
+        arrays = [x[1] for x in group]
+        if fmt in _TIME_FORMATS:
+            decoded = _decode_fixed(arrays, _TIME_FORMATS[fmt][1])
+        else:
+            decoded = _decode_inferred(arrays)
+        for (i, _), h in zip(group, decoded):
+            hours[i] = h
+
+    failed = [i for i, h in enumerate(hours) if h is None]
+
+    return (hours, failed)
+
+
 def download_EBA_manifest(out_file):
     """Download the EPA bulk data manifest for checking vintage.
 
@@ -132,6 +548,29 @@ def download_EBA():
     logging.info(f"complete.")
 
 
+def read_EBA_vintage():
+    """Return the vintage key of the local EBA.zip for the EBA store.
+
+    The key is the last updated time stamp of the local manifest (see
+    :func:`read_local_manifest_last_update`) together with the size and
+    modification time of EBA.zip, so that a replaced archive (e.g., an
+    archived EBA.zip used with a bypassed vintage check) is also detected.
+
+    Returns
+    -------
+    dict
+        The vintage key with 'last_updated', 'size', and 'modified' keys.
+    """
+    path = os.path.join(paths.local_path, 'bulk_data', 'EBA.zip')
+    stat = os.stat(path)
+
+    return {
+        'last_updated': read_local_manifest_last_update(),
+        'size': stat.st_size,
+        'modified': int(stat.st_mtime),
+    }
+
+
 def read_local_manifest_last_update():
     """Read the manifest.txt file from local machine for the last updated
     time stamp for the EIA's US Electric System Operating Data (EBA), else
@@ -194,31 +633,10 @@ def row_to_df(rows, data_type):
         Data for all regions in a single df with datetimes converted to UTC.
     """
     tuple_list = []
-    for row in rows:
-        try:
-            date_time = pd.to_datetime(
-                [x[0] for x in row['data']],
-                utc=True,
-                format='%Y%m%dT%HZ'
-            )
-        except ValueError:
-            try:
-                date_time = pd.to_datetime(
-                    [x[0]+":00" for x in row['data']],
-                    format='%Y%m%dT%H%z'
-                )
-            except ValueError:
-                try:
-                    # Last ditch, try to infer the format.
-                    # Also, necessary for daily data from API.
-                    date_time = pd.to_datetime([x[0] for x in row['data']])
-                except ValueError:
-                    logging.warning(
-                        "Failed to convert timestamps for %s" % (
-                            row['series_id']
-                        )
-                    )
-                    continue
+    for row, hours in zip(rows, _row_hours(rows)):
+        if hours is None:
+            continue
+        date_time = pd.to_datetime(hours, unit='h', utc=True)
         data = [x[1] for x in row['data']]
         region = row['series_id'].split('-')[0][4:]
         tuple_data = [
@@ -247,30 +665,10 @@ def ba_exchange_to_df(rows, data_type='ba_to_ba'):
         Data for all regions in a single df with datetimes converted and UTC
     """
     tuple_list = []
-    for row in rows:
-        try:
-            datetime = pd.to_datetime(
-                [x[0] for x in row['data']],
-                utc=True,
-                format='%Y%m%dT%HZ'
-            )
-        except ValueError:
-            try:
-                datetime = pd.to_datetime(
-                    [x[0]+"00" for x in row['data']],
-                    format='%Y%m%dT%H%z'
-                )
-            except ValueError:
-                try:
-                    # For daily data from API.
-                    datetime = pd.to_datetime([x[0] for x in row['data']])
-                except ValueError:
-                    logging.warning(
-                        "Failed to convert timestamps for %s" % (
-                            row['series_id']
-                        )
-                    )
-                    continue
+    for row, hours in zip(rows, _row_hours(rows)):
+        if hours is None:
+            continue
+        datetime = pd.to_datetime(hours, unit='h', utc=True)
         data = [x[1] for x in row['data']]
         from_region = row['series_id'].split('-')[0][4:]
         to_region = row['series_id'].split('-')[1][:-5]
@@ -291,6 +689,257 @@ def ba_exchange_to_df(rows, data_type='ba_to_ba'):
     return df
 
 
+def series_to_df(rows, data_type, year=None, exchange=False):
+    """Turn rows of a single type from the bulk data into a compact data
+    frame, optionally for a single year.
+
+    Unlike :func:`row_to_df` and :func:`ba_exchange_to_df`, the rows may be
+    any iterable (e.g., a generator reading EBA.txt line by line) and are
+    not held in memory. See :class:`SeriesFrameBuilder` for details.
+
+    Parameters
+    ----------
+    rows : iterable
+        Rows (dictionaries) from the EBA.txt file or EIA's API.
+    data_type : str
+        Name to use for the data column (e.g. demand or total_interchange)
+    year : int, optional
+        The year (UTC) of data to keep. Defaults to all years.
+    exchange : bool, optional
+        Whether the rows are BA-to-BA interchanges. Defaults to false.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Data for all regions in a single df with categorical regions,
+        datetimes in UTC, and float32 data.
+    """
+    builder = SeriesFrameBuilder(data_type, year, exchange)
+    for row in rows:
+        builder.add(row)
+
+    return builder.to_frame()
+
+
+def _concat(arrays, dtype):
+    """Concatenate a list of numpy arrays, which may be empty."""
+    if len(arrays) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(arrays)
+
+
+def _as_bytes(times):
+    """Return time stamps as a numpy array of bytes (or of objects, for
+    time stamps that are not ASCII)."""
+    if isinstance(times, np.ndarray) and times.dtype.kind == 'S':
+        return times
+    try:
+        return np.array(times, dtype='S')
+    except (UnicodeEncodeError, TypeError, ValueError):
+        return np.array(times, dtype=object)
+
+
+def _compact_series(row):
+    """Return the time stamps (bytes) and values (float32) of a series."""
+    data = row.get('data', [])
+    times = _as_bytes([x[0] for x in data])
+    values = _to_float32([x[1] for x in data])
+
+    return (times, values)
+
+
+def _decode_batch(batch):
+    """Decode the time stamps of a batch of series.
+
+    Parameters
+    ----------
+    batch : list
+        Tuples of key (e.g., the data type), series ID, time stamps, and
+        values.
+
+    Returns
+    -------
+    list
+        Tuples of key, series ID, hours, and values for the series whose
+        time stamps converted; the others are logged.
+    """
+    hours, failed = decode_hours([x[2] for x in batch])
+    for i in failed:
+        logging.warning("Failed to convert timestamps for %s" % batch[i][1])
+
+    return [
+        (key, series_id, h, values)
+        for (key, series_id, _, values), h in zip(batch, hours)
+        if h is not None
+    ]
+
+
+def _decode_fixed(arrays, template):
+    """Parse fixed-width time stamps to hours since the Unix epoch.
+
+    Parameters
+    ----------
+    arrays : list
+        Numpy arrays of bytes, one for each series, whose width matches the
+        template.
+    template : bytes
+        The format template, see _TIME_FORMATS.
+
+    Returns
+    -------
+    list
+        Hours (numpy.ndarray, int64) for each series, or None for a series
+        with any invalid time stamp.
+    """
+    width = len(template)
+    counts = np.array([len(a) for a in arrays], dtype=np.int64)
+    chars = np.frombuffer(
+        np.concatenate(arrays).tobytes(), dtype=np.uint8).reshape(-1, width)
+    tmpl = np.frombuffer(template, dtype=np.uint8)
+    digits = chars.astype(np.int64) - ord('0')
+
+    # Check the digits, signs, and literal characters.
+    is_digit = tmpl == ord('0')
+    is_sign = tmpl == ord('+')
+    is_literal = ~(is_digit | is_sign)
+    valid = np.all((digits[:, is_digit] >= 0) & (digits[:, is_digit] <= 9), 1)
+    valid &= np.all(chars[:, is_literal] == tmpl[is_literal], axis=1)
+    valid &= np.all(
+        (chars[:, is_sign] == ord('+')) | (chars[:, is_sign] == ord('-')), 1)
+
+    def field(start, stop):
+        powers = 10**np.arange(stop - start - 1, -1, -1)
+        return digits[:, start:stop] @ powers
+
+    # Year, month, and day are first; then, if any, the hour and offset.
+    sep = int(not is_digit[4])
+    year = field(0, 4)
+    month = field(4 + sep, 6 + sep)
+    day = field(6 + 2*sep, 8 + 2*sep)
+    hour = np.zeros(len(chars), dtype=np.int64)
+    if width > 10:
+        hour = field(9, 11)
+    offset = np.zeros(len(chars), dtype=np.int64)
+    if is_sign.any():
+        offset = field(12, 14)
+        offset = np.where(chars[:, 11] == ord('-'), -offset, offset)
+
+    # Count days to the first of the month, then check the day and hour.
+    month_idx = (year - 1970)*12 + np.clip(month - 1, 0, 11)
+    first = month_idx.astype('datetime64[M]').astype('datetime64[D]')
+    n_days = (month_idx + 1).astype('datetime64[M]').astype('datetime64[D]')
+    n_days = (n_days - first).astype(np.int64)
+    valid &= (month >= 1) & (month <= 12)
+    valid &= (day >= 1) & (day <= n_days) & (hour <= 23)
+    hours = (first.astype(np.int64) + day - 1)*24 + hour - offset
+
+    ends = np.cumsum(counts)
+    ok = np.logical_and.reduceat(valid, ends - counts)
+
+    return [
+        h if k else None for h, k in zip(np.split(hours, ends[:-1]), ok)]
+
+
+def _decode_inferred(arrays):
+    """Convert time stamps of a common (non-fixed) format with pandas.
+
+    All series are converted in one call; if that fails, each series is
+    converted on its own to find the ones that fail (returned as None).
+    """
+    def to_hours(times):
+        date_time = pd.to_datetime(times.astype(str), utc=True)
+        hours = (date_time - _EPOCH) // pd.Timedelta(hours=1)
+        return np.asarray(hours, dtype=np.int64)
+
+    try:
+        hours = to_hours(np.concatenate(arrays))
+    except (TypeError, ValueError):
+        decoded = []
+        for times in arrays:
+            try:
+                decoded.append(to_hours(times))
+            except (TypeError, ValueError):
+                decoded.append(None)
+        return decoded
+
+    ends = np.cumsum([len(a) for a in arrays])
+
+    return np.split(hours, ends[:-1])
+
+
+def _iter_decoded(rows):
+    """Yield the key, series ID, hours, and values of keyed rows (e.g., data
+    type and series), decoding time stamps in batches of series."""
+    batch = []
+    size = 0
+    for key, row in rows:
+        times, values = _compact_series(row)
+        if len(times) == 0:
+            continue
+        batch.append((key, row['series_id'], times, values))
+        size += len(times)
+        if size >= _BATCH_SIZE:
+            yield from _decode_batch(batch)
+            batch = []
+            size = 0
+    yield from _decode_batch(batch)
+
+
+def _row_hours(rows):
+    """Return the hours of each row (None if failed) for :func:`row_to_df`
+    and :func:`ba_exchange_to_df`."""
+    hours, failed = decode_hours([[x[0] for x in r['data']] for r in rows])
+    for i in failed:
+        logging.warning(
+            "Failed to convert timestamps for %s" % rows[i]['series_id'])
+
+    return hours
+
+
+def _series_regions(series_id, exchange=False):
+    """Return the region name(s) of a series ID (e.g., 'EBA.AEC-ALL.NG.H'
+    or, for interchanges, 'EBA.AEC-SOCO.ID.H')."""
+    regions = [series_id.split('-')[0][4:]]
+    if exchange:
+        regions.append(series_id.split('-')[1][:-5])
+    return regions
+
+
+def _time_format(times):
+    """Return the format of a series' time stamps from the first one: a key
+    of _TIME_FORMATS or, for other formats, the first time stamp with its
+    digits as zeros (e.g., '0000/00/00')."""
+    first = times[0]
+    if times.dtype.kind == 'S':
+        for fmt, (pattern, template) in _TIME_FORMATS.items():
+            width_ok = times.dtype.itemsize == len(template)
+            if width_ok and pattern.fullmatch(first) is not None:
+                return fmt
+        first = first.decode('ascii')
+
+    return re.sub(r'\d', '0', str(first))
+
+
+def _to_float32(values):
+    """Convert bulk data values to float32; missing values become NaN."""
+    try:
+        return np.array(values, dtype=np.float32)
+    except (TypeError, ValueError):
+        return pd.to_numeric(
+            pd.Series(values, dtype=object), errors='coerce'
+        ).to_numpy(dtype=np.float32)
+
+
+def _year_hours(year):
+    """Return the first hour of a year and of the next year (UTC), in hours
+    since the Unix epoch."""
+    start = pd.Timestamp(year=year, month=1, day=1, tz="UTC")
+    end = pd.Timestamp(year=year + 1, month=1, day=1, tz="UTC")
+    hour = pd.Timedelta(hours=1)
+
+    return ((start - _EPOCH) // hour, (end - _EPOCH) // hour)
+
+
 ##############################################################################
 # MAIN
 ##############################################################################
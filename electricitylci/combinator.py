@@ -13,9 +13,10 @@ import numpy as np
 from electricitylci.globals import output_dir
 from electricitylci.model_config import model_specs
 from electricitylci.eia860_facilities import eia860_balancing_authority
+from electricitylci.elementaryflows import get_fedefl_flows
+from electricitylci.elementaryflows import get_fedefl_mapping
 from electricitylci.generation import add_temporal_correlation_score
 from electricitylci.utils import read_ba_codes
-import fedelemflowlist as fedefl
 
 
 ##############################################################################
@@ -29,7 +30,7 @@ nuclear fuel cycle), and maps emissions based on the Federal LCA Commons
 Elementary Flow List in order to provide life cycle inventory.
 
 Last edited:
-    2025-02-05
+    2026-10-17
 """
 __all__ = [
     "BA_CODES",
@@ -259,13 +260,13 @@ def concat_map_upstream_databases(eia_gen_year, *arg, **kwargs):
     # standard units (e.g., kg, MJ, m2*a). Note that 'SourceFlowContext' is
     # already in lowercase letters, which is why no change happens below.
     logging.info("Creating flow mapping database")
-    flow_mapping = fedefl.get_flowmapping('eLCI')
+    flow_mapping = get_fedefl_mapping('eLCI')
 
     # as hotfix for https://github.com/USEPA/ElectricityLCI/issues/274
     # append full flowlist to the flow mapping file (dropping duplicates)
     # to catch any other mappings of flows that use the same name as already
     # in the flow list
-    flowlist = (fedefl.get_flows()
+    flowlist = (get_fedefl_flows()
                 .filter(['Flowable', 'Context', 'Unit', 'Flow UUID'])
                 .assign(SourceFlowName = lambda x: x['Flowable'])
                 .assign(SourceFlowContext = lambda x: x['Context'])
@@ -805,9 +806,9 @@ def remove_mismatched_inventories(gen_plus_up_df):
         "netlconst": ["GAS","COAL","OIL","MIXED","BIOMASS"],
         "netlnrelsolarpv" : ["SOLAR","MIXED"],
     }
-    gen_plus_up_df["mapped_fuel_category"] = gen_plus_up_df["Source"].map(
-        VALID_COMBINATIONS
-    )
+    # NOTE: map on object values; categorical sources cannot map to lists.
+    gen_plus_up_df["mapped_fuel_category"] = gen_plus_up_df["Source"].astype(
+        object).map(VALID_COMBINATIONS)
     # This list comprehension checks each row to determine whether the entry
     # in FuelCategory is in the mapped_fuel_category list assigned from above.
     # If it is not included, that index is added and will be removed in
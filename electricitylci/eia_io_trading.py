@@ -6,8 +6,11 @@
 ##############################################################################
 # REQUIRED MODULES
 ##############################################################################
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import json
 import logging
+import multiprocessing
 import os
 import time
 import zipfile
@@ -15,14 +18,17 @@ import zipfile
 import numpy as np
 import pandas as pd
 import re
+import scipy.sparse
+import scipy.sparse.linalg
 
 from electricitylci.globals import data_dir
 from electricitylci.globals import paths
 from electricitylci.globals import API_SLEEP
 from electricitylci.bulk_eia_data import download_EBA
-from electricitylci.bulk_eia_data import row_to_df
-from electricitylci.bulk_eia_data import ba_exchange_to_df
+from electricitylci.bulk_eia_data import series_to_df
 from electricitylci.bulk_eia_data import check_EBA_vintage
+from electricitylci.bulk_eia_data import read_EBA_vintage
+from electricitylci.bulk_eia_data import SeriesStore
 from electricitylci.model_config import model_specs
 import electricitylci.eia923_generation as eia923
 import electricitylci.eia860_facilities as eia860
@@ -66,11 +72,30 @@ References:
     Electricity Trade Network. Environmental Science & Technology,
     52(11), 6666-6675. https://doi.org/10.1021/acs.est.7b05191
 
+The bulk data are read into compact data frames (see
+:class:`~electricitylci.bulk_eia_data.SeriesFrameBuilder`) of the trade
+year only. EBA.zip is streamed line by line (skipping the series that are
+not used, such as local hourly data, without parsing them) into a local
+store partitioned by data type and year (see
+:class:`~electricitylci.bulk_eia_data.SeriesStore`). The store is written
+once per EBA.zip vintage, so later runs, including those for other trade
+years, read the store instead of the archive.
+
+The quasi-input-output model (:func:`qio_model`) solves for the trade
+matrix with an LU factorization (sparse when few BAs trade with each other)
+rather than with matrix inverses.
+
+To model several trade years side by side (e.g., for multi-vintage
+baselines), use :func:`ba_io_trading_models`, which reads the bulk data,
+balancing authorities, and Canadian imports once for all years and runs the
+trading model of each year, optionally in parallel worker processes.
+
 Last updated:
-    2025-06-09
+    2026-10-17
 """
 __all__ = [
     "ba_io_trading_model",
+    "ba_io_trading_models",
     "olca_schema_consumption_mix",
     "qio_model",
 ]
@@ -84,11 +109,212 @@ REGION_ACRONYMS = [
     'MIDW', 'ISNE', 'NYIS', 'NW', 'SE', 'SW',
 ]
 '''list : Region acronyms for BA-to-BA trade.'''
+_SERIES_ID_RE = re.compile(rb'"series_id"\s*:\s*"([^"\\]*)"')
+'''re.Pattern : Finds the series ID near the start of a line of EBA.txt.'''
+QIO_SPARSE_DENSITY = 0.1
+'''float : The largest share of non-zero BA-to-BA trades for which
+:func:`qio_model` uses a sparse LU solve.'''
+_TRADE_INPUTS = {}
+'''dict : The inputs of the trade years being modeled by forked worker
+processes (see :func:`ba_io_trading_models`), keyed by year.'''
 
 
 ##############################################################################
 # FUNCTIONS
 ##############################################################################
+def _ba_io_trading_fork(year, regions_to_keep=None):
+    """Run the trading model of a trade year in :data:`_TRADE_INPUTS`.
+
+    Called in forked worker processes by :func:`ba_io_trading_models`,
+    which inherit the inputs (i.e., the bulk data are not pickled).
+
+    Parameters
+    ----------
+    year : int
+        The trade year.
+    regions_to_keep : list, optional
+        A list of balancing authority names of interest.
+
+    Returns
+    -------
+    dict
+        See :func:`_ba_io_trading_year`.
+    """
+    return _ba_io_trading_year(year, _TRADE_INPUTS[year], regions_to_keep)
+
+
+def _ba_io_trading_year(year, inputs, regions_to_keep=None):
+    """Run the trading model of one trade year.
+
+    Writes the trade year's BAA_final_trade and ferc_final_trade CSV files
+    to the output folder.
+
+    Parameters
+    ----------
+    year : int
+        The trade year.
+    inputs : dict
+        The trade year's inputs, with keys:
+
+        - 'ba' (tuple): the balancing authority data frame, codes, and FERC
+          region list (see :func:`_read_ba`).
+        - 'bulk' (tuple): the trade year's net generation, BA-to-BA
+          interchange, and demand (see :func:`_read_bulk`).
+        - 'ca' (tuple): the trade year's Canadian imports (see
+          :func:`_read_ca_imports`).
+    regions_to_keep : list, optional
+        A list of balancing authority names of interest.
+        Otherwise, returns all balancing authorities.
+
+    Returns
+    -------
+    dict
+        The BA, FERC, and U.S. trade data frames (see
+        :func:`ba_io_trading_model`).
+    """
+    df_BA_NA, ba_cols, ferc_list = inputs['ba']
+    df_ng, df_ba_trade, df_demand = inputs['bulk']
+
+    # Net Generation Data Import
+    df_net_gen = _make_net_gen(year, ba_cols, df_ng)
+    del(df_ng)
+
+    # Create EIA generation dataset and Form 860 balancing authority list.
+    eia_gen_ba, eia860_ba_list = _read_eia_gen(year)
+
+    # Canadian import data for this trade year: the first data frame has
+    # annual net trades from CA to US, the second data frame has CA exports
+    # to US balancing authorities.
+    df_CA_Imports_Gen, df_CA_Imports_Rows = inputs['ca']
+
+    # Combine and correct net generation data frame with Canada.
+    df_net_gen_sum = _make_net_gen_sum(
+        df_net_gen, eia_gen_ba, df_CA_Imports_Gen)
+
+    # Make export-import trade pivot table, make it square.
+    df_trade_pivot = _make_trade_pivot(year, ba_cols, df_ba_trade)
+    del(df_ba_trade)
+    df_trade_pivot = _make_square_pivot(df_trade_pivot, ba_cols)
+
+    # Add Canadian Imports to the trading matrix
+    df_CA_Imports_Rows = _match_df_cols(df_trade_pivot, df_CA_Imports_Rows)
+    df_concat_trade_CA = pd.concat([df_trade_pivot, df_CA_Imports_Rows])
+
+    # Make it square. BUG: ELCI_1 has extra 'GRIS' column with no data.
+    all_baa = list(df_concat_trade_CA.index.values)
+    df_concat_trade_CA = _make_square_pivot(df_concat_trade_CA, all_baa)
+    df_trade_pivot = df_concat_trade_CA
+
+    # Create list of BA codes for EIA 860 data and run the QIO model.
+    eia860_bas = sorted(eia860_ba_list + list(df_CA_Imports_Rows.index))
+
+    df_final_trade_out_filt_melted_merge = qio_model(
+        df_net_gen_sum,
+        df_trade_pivot,
+        df_BA_NA,
+        eia860_bas,
+        regions_to_keep,
+        thresh=0.00001)
+
+    # Develop final df for BAA
+    BAA_final_trade = _make_ba_trade(
+        df_final_trade_out_filt_melted_merge, eia860_bas)
+
+    # There are some BAs that will have 0 trade. Some of these are legitimate.
+    # Alcoa Yadkin has no demand (i.e., all power generation is exported)
+    # others seem to be errors. For those BAs with actual demand, we'll set
+    # the consumption mix to 100% from that BA. For those without demand,
+    # fraction will be set to near 0 just to make sure systems can be built
+    # in openLCA.
+
+    # Find the zero traders.
+    # TODO: combine w/ _fix_final_trade
+    BAA_zero_trade = _get_zero_traders(BAA_final_trade)
+
+    # Find zero traders w/ demand.
+    # TODO: combine w/ _fix_final_trade
+    BAAs_from_zero_trade_with_demand = _get_zero_traders_w_demand(
+        BAA_zero_trade, df_demand)
+    del(df_demand)
+
+    # Set these regions' fractions to 1
+    BAA_final_trade = _fix_final_trade(
+        BAA_final_trade, BAA_zero_trade, BAAs_from_zero_trade_with_demand)
+
+    # Write final trade table to CSV
+    out_file = 'BAA_final_trade_{}.csv'.format(year)
+    write_csv_to_output(out_file, BAA_final_trade)
+
+    # Add balancing authority names to final trade data frame.
+    BAA_final_trade["export_name"] = BAA_final_trade["export BAA"].map(
+        df_BA_NA[["BA_Acronym", "BA_Name"]].set_index("BA_Acronym")["BA_Name"])
+    BAA_final_trade["import_name"] = BAA_final_trade["import BAA"].map(
+        df_BA_NA[["BA_Acronym", "BA_Name"]].set_index("BA_Acronym")["BA_Name"])
+
+    # Calculate fractions of trade between BA and FERC regions.
+    ferc_final_trade = _make_ferc_trade(
+        df_final_trade_out_filt_melted_merge, ferc_list)
+
+    out_file = 'ferc_final_trade_{}.csv'.format(year)
+    write_csv_to_output(out_file, ferc_final_trade)
+
+    # Add balancing authority name to export regions.
+    ferc_final_trade["export_name"] = ferc_final_trade["export BAA"].map(
+        df_BA_NA[["BA_Acronym", "BA_Name"]].set_index("BA_Acronym")["BA_Name"])
+
+    # Calculate US trade fractions by exporting balancing authority.
+    us_final_trade = _make_us_trade(df_final_trade_out_filt_melted_merge)
+
+    # Add balancing authority name to export regions.
+    us_final_trade["export_name"] = us_final_trade["export BAA"].map(
+        df_BA_NA[["BA_Acronym", "BA_Name"]].set_index("BA_Acronym")["BA_Name"])
+
+    return {
+        'BA': BAA_final_trade,
+        'FERC': ferc_final_trade,
+        'US': us_final_trade}
+
+
+def _bulk_series_type(series_id):
+    """Return the type of an EIA bulk data series used for trading.
+
+    Parameters
+    ----------
+    series_id : str
+        The series ID (e.g., 'EBA.AEC-ALL.NG.H').
+
+    Returns
+    -------
+    str or NoneType
+        'net_gen' for hourly net generation, 'ba_to_ba' for hourly BA-to-BA
+        interchange (not from one of the REGION_ACRONYMS), 'demand' for
+        hourly demand, or None for series that are not used.
+    """
+    # Changing to regex matches to allow compatibility with past and present
+    # bulk data. [2024-08-16; MJ]
+    ngh_matches = "^EBA[\\S\\w\\d]+[^NG]\\.NG\\.H$"
+    idh_matches = "^EBA.+\\.ID\\.H$"
+    dh_matches = "^EBA.+\\.D\\.H$"
+
+    # LEGACY NOTES --- The 2016 Baseline
+    # All but one BA is reporting net generation in UTC
+    # and local time. For that one BA (GRMA) only UTC time is
+    # reported - so only pulling that for now.
+    if re.search(ngh_matches, series_id) is not None:
+        return 'net_gen'
+    # Similarly there are 5 interchanges that report interchange
+    # in UTC but not in local time.
+    elif re.search(idh_matches, series_id) is not None:
+        # Split on intersection, rstrip "EBA."
+        if series_id.split('-')[0][4:] not in REGION_ACRONYMS:
+            return 'ba_to_ba'
+    # Keeping these here just in case
+    elif re.search(dh_matches, series_id) is not None:
+        return 'demand'
+
+    return None
+
+
 def _check_api(key, owner, r_txt):
     """Helper function to check and request for API key.
 
@@ -365,9 +591,11 @@ def _get_zero_traders_w_demand(z_traders, demand):
     ----------
     z_traders : list
         A list of balancing authority codes associated with zero traders.
-    demand : list
-        A list of dictionaries. Each dictionary contains the hourly demand
-        for a given region.
+    demand : pandas.DataFrame
+        Regions with hourly demand in any year ('region'), see
+        :func:`_read_bulk`. As with the demand series of EBA.zip, a
+        balancing authority counts as having demand regardless of the
+        trade year.
 
     Returns
     -------
@@ -375,17 +603,53 @@ def _get_zero_traders_w_demand(z_traders, demand):
         A list of zero trader balancing authority codes that have positive
         demand.
     """
-    r_list = []
-    for d_row in demand:
-        ba_code = d_row["series_id"].split('.')[1].split('-')[0]
-        if ba_code in z_traders:
-            r_list.append(ba_code)
-
-    r_list = list(set(r_list))
+    ba_codes = demand['region'].astype(str).unique()
+    r_list = [x for x in ba_codes if x in z_traders]
 
     return r_list
 
 
+def _iter_bulk_zip(z):
+    """Yield the series of EBA.zip used for trading.
+
+    Series that are not used (see :func:`_bulk_series_type`) are skipped by
+    their series ID before their data are parsed; lines without a series ID
+    up front are parsed to be sure.
+
+    Parameters
+    ----------
+    z : zipfile.ZipFile
+        The open EBA.zip archive.
+
+    Yields
+    ------
+    tuple
+        The data type (e.g., 'net_gen') and the series (dict).
+    """
+    with z.open('EBA.txt') as f:
+        for line in f:
+            m = _SERIES_ID_RE.search(line, 0, 1024)
+            if m is not None and _bulk_series_type(
+                    m.group(1).decode('utf-8', 'replace')) is None:
+                continue
+
+            # To improve compatibility with old/new EBA.zip
+            f_json = json.loads(line)
+
+            # All the entries should have a 'series_id' and an 'f' key.
+            # 'H' for UTC hourly; 'HL' for local hourly; hard-coded to UTC.
+            # See https://github.com/USEPA/ElectricityLCI/discussions/254.
+            if 'series_id' in f_json.keys() and f_json.get('f', '') == 'H':
+                s_type = _bulk_series_type(f_json['series_id'])
+                if s_type == 'net_gen':
+                    # HOTFIX: add single instance of JSON line checker
+                    # will throw about 82 warnings that data are not available.
+                    # (e.g., August 19, 2024 EBA.zip)
+                    _check_json(f_json)
+                if s_type is not None:
+                    yield (s_type, f_json)
+
+
 def _make_ba_trade(trade_df, ba_list):
     """Calculate the trade fractions between exporting and importing balancing authorities.
 
@@ -496,7 +760,7 @@ def _make_ferc_trade(df, import_list):
     return ferc_trade
 
 
-def _make_net_gen(year, ba_cols, ng_json_list):
+def _make_net_gen(year, ba_cols, ng_df):
     """Convert EIA bulk net generation data into time series data frame.
 
     Parameters
@@ -505,9 +769,9 @@ def _make_net_gen(year, ba_cols, ng_json_list):
         Data year (e.g., 2016)
     ba_cols : list
         A list of balancing authority abbreviation codes.
-    ng_json_list : list
-        A list of JSON dictionaries for net generation from EIA's bulk data
-        download.
+    ng_df : pandas.DataFrame
+        Hourly net generation from EIA's bulk data with 'region',
+        'datetime', and 'net_gen' columns, see :func:`_read_bulk`.
 
     Returns
     -------
@@ -519,8 +783,8 @@ def _make_net_gen(year, ba_cols, ng_json_list):
     Examples
     --------
     >>> df_BA_NA, ba_cols, ferc_list = _read_ba()
-    >>> NET_GEN_ROWS, BA_TO_BA_ROWS, DEMAND_ROWS = _read_bulk()
-    >>> df_net_gen = _make_net_gen(2016, ba_cols, NET_GEN_ROWS)
+    >>> df_ng, df_trade, df_demand = _read_bulk(ba_cols, 2016)
+    >>> df_net_gen = _make_net_gen(2016, ba_cols, df_ng)
     >>> df_net_gen.head()
     region                       AEC  ...    WACM    WALC    WWA    YAD
     datetime                          ...
@@ -530,16 +794,17 @@ def _make_net_gen(year, ba_cols, ng_json_list):
     2016-01-01 03:00:00+00:00  575.0  ...  5551.0  1081.0   165.0  170.0
     2016-01-01 04:00:00+00:00  586.0  ...  5394.0  1055.0   160.0  171.0
     """
-    # Net Generation Data Import
-    logging.info("Creating net generation data frame with datetime")
-    df_net_gen = row_to_df(ng_json_list, 'net_gen')
-
-    logging.info("Pivoting")
-    df_net_gen = df_net_gen.pivot(
+    logging.info("Pivoting net generation data frame")
+    df_net_gen = ng_df.pivot(
         index='datetime',
         columns='region',
         values='net_gen'
     )
+    # Regions are categorical and values are float32 in the bulk data;
+    # use plain column names and sum in double precision.
+    df_net_gen.columns = df_net_gen.columns.astype(str)
+    df_net_gen.columns.name = 'region'
+    df_net_gen = df_net_gen.astype('float64')
     gen_cols = list(df_net_gen.columns.values)
 
     gen_cols_set = set(gen_cols)
@@ -763,8 +1028,6 @@ def _make_trade_pivot(year, ba_cols, trade_df):
     """
     logging.info("Creating trading data frame")
     ba_trade = trade_df.set_index('datetime')
-    ba_trade['transacting regions'] = (
-        ba_trade['from_region'] + '-' + ba_trade['to_region'])
 
     # Keep only the columns that match the balancing authority names, there are
     # several other columns included in the dataset that represent states
@@ -775,6 +1038,13 @@ def _make_trade_pivot(year, ba_cols, trade_df):
     filt = filt1 & filt2
     ba_trade = ba_trade[filt]
 
+    # Regions are categorical in the bulk data; join them as strings.
+    ba_trade['transacting regions'] = (
+        ba_trade['from_region'].astype(str)
+        + '-'
+        + ba_trade['to_region'].astype(str)
+    )
+
     # Subset for eia_gen_year, need to pivot first because of non-unique
     # datetime index.
     df_ba_trade_pivot = ba_trade.pivot(
@@ -788,6 +1058,7 @@ def _make_trade_pivot(year, ba_cols, trade_df):
         df_ba_trade_pivot.dtypes.eq('object')]
     df_ba_trade_pivot[cols_to_change] = df_ba_trade_pivot[
         cols_to_change].apply(pd.to_numeric, errors="coerce")
+    df_ba_trade_pivot = df_ba_trade_pivot.astype('float64')
 
     # Sum columns - represents the net transacted amount between the two BAs
     df_ba_trade_sum = df_ba_trade_pivot.sum(axis=0).to_frame()
@@ -988,6 +1259,122 @@ def _match_df_cols(base_df, return_df):
     return (return_df)
 
 
+def _open_bulk_store():
+    """Return the local EBA store, up-to-date with EBA.zip.
+
+    Checks the vintage of EBA.zip (unless bypassed by the model
+    configuration), downloads it if it is missing, and (re)writes the store
+    if it was made from a different vintage of EBA.zip.
+
+    Returns
+    -------
+    SeriesStore
+        The local EBA store (see
+        :class:`~electricitylci.bulk_eia_data.SeriesStore`).
+    """
+    # HOTFIX: Check file vintage [2024-03-12; TWD]
+    path = os.path.join(paths.local_path, 'bulk_data', 'EBA.zip')
+    if model_specs.bypass_bulk_vintage:
+        logging.info("Skipping EBA vintage check")
+    else:
+        check_EBA_vintage()
+    if not os.path.isfile(path):
+        logging.info("Downloading new bulk data")
+        download_EBA()
+
+    store = SeriesStore()
+    key = read_EBA_vintage()
+    if store.is_current(key):
+        logging.info("Using existing EBA store, %s" % store.path)
+    else:
+        logging.info("Loading bulk data to EBA store")
+        with zipfile.ZipFile(path, 'r') as z:
+            store.write(
+                key,
+                _iter_bulk_zip(z),
+                {'net_gen': False, 'ba_to_ba': True, 'demand': False}
+            )
+
+    return store
+
+
+def _qio_matrix(net_gen_df, trade_pivot):
+    """Solve the quasi-input-output model for the trade matrix, H.
+
+    With the trade matrix, T (exports from rows to columns), net generation,
+    p, total inflows, x = p + T'1, and consumption, c = x - T1, the matrix
+    is H = (I - B)^-1 diag(c), where B = T diag(x)^-1 (Qu et al., 2018).
+    The columns of T are divided by x (rather than multiplying by an
+    inverted diagonal matrix) and H is found with one LU solve, which is
+    sparse if the share of non-zero trades is at most QIO_SPARSE_DENSITY.
+
+    Parameters
+    ----------
+    net_gen_df : pandas.DataFrame
+        A single-column data frame of net generation (MWh) with balancing
+        authority codes as row indices.
+    trade_pivot : pandas.DataFrame
+        A square pivot table of trades (exported from row to column) in
+        the same order as ``net_gen_df``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The matrix, H, with the balancing authority codes of ``net_gen_df``
+        as row indices (exporters) and columns (importers).
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If (I - B) is singular.
+
+    Notes
+    -----
+    Earlier versions computed H as ``np.matmul(G, c_hat, x_hat_inv)``,
+    where the inverse of diag(x) is numpy's ``out`` argument rather than a
+    third factor; therefore, H has always been G diag(c), which is kept
+    here. A right factor of diag(x)^-1 would only scale each importer's
+    column, which leaves the BA trade fractions unchanged but would change
+    the FERC and U.S. aggregates.
+    """
+    # Create total inflow (x) and consumption (c) vectors.
+    logging.info("Inflow and consumption vectors")
+    T = trade_pivot.to_numpy(dtype=float)
+    x = net_gen_df.to_numpy(dtype=float)[:, 0] + T.sum(axis=0)
+    c = x - T.sum(axis=1)
+
+    # If values are zero, (I - B) would be undefined,
+    # set BAAs with 0 to small value (e.g., 1.0)
+    x[x == 0] = 1
+
+    # Create matrix to split T into distinct interconnections -
+    # i.e., prevent trading between eastern and western interconnects.
+    # Connections between the western and eastern interconnects are through
+    # SWPP and WAUE.
+    logging.info("Matrix operations")
+    interconnect = trade_pivot.copy()
+    interconnect[:] = 1
+    interconnect.loc['SWPP',['EPE', 'PNM', 'PSCO', 'WACM']] = 0
+    interconnect.loc['WAUE',['WAUW', 'WACM']] = 0
+    T_split = np.multiply(T, interconnect.to_numpy(dtype=float))
+
+    # Matrix trading math (see Qu et al. 2018 ES&T paper)
+    # NOTE: B = T_split diag(x)^-1 divides each column by its inflow.
+    n = len(x)
+    B = T_split / x
+    if np.count_nonzero(B) <= QIO_SPARSE_DENSITY * n * n:
+        diff_I_B = scipy.sparse.identity(n, format='csc') - (
+            scipy.sparse.csc_matrix(B))
+        try:
+            H = scipy.sparse.linalg.splu(diff_I_B).solve(np.diag(c))
+        except RuntimeError as e:
+            raise np.linalg.LinAlgError(str(e))
+    else:
+        H = np.linalg.solve(np.identity(n) - B, np.diag(c))
+
+    return pd.DataFrame(H, index=net_gen_df.index, columns=net_gen_df.index)
+
+
 def _read_ba():
     """Generate the Balancing Authority data frame and acronym and FERC lists.
 
@@ -1020,7 +1407,7 @@ def _read_ba():
     return df_BA_NA, US_BA_acronyms, ferc_list
 
 
-def _read_bulk(ba_cols):
+def _read_bulk(ba_cols, year=None):
     """Handle both ZIP and API data sources for bulk U.S. Electric System
     Operating Data managed by model_config.
 
@@ -1029,23 +1416,41 @@ def _read_bulk(ba_cols):
     ba_cols : list
         A list of balancing authority short codes.
         These are used for querying API demand and net generation data.
+    year : int, optional
+        The year (UTC) of net generation and interchange data to keep.
+        Defaults to all years. Demand regions are from all years.
 
     Returns
     -------
     tuple
         A tuple of length three.
-        Each item is a list.
-        See :func:`_read_bulk_api` and :func:`read_bulk_zip` for details.
+
+        - pandas.DataFrame : hourly net generation ('region', 'datetime',
+          'net_gen').
+        - pandas.DataFrame : hourly BA-to-BA interchange ('from_region',
+          'to_region', 'datetime', 'ba_to_ba').
+        - pandas.DataFrame : regions with hourly demand in any year
+          ('region'), one row per region.
+
+        Regions are categorical, datetimes are UTC, and values are float32.
+        See :func:`_read_bulk_api` and :func:`_read_bulk_zip` for details.
     """
     if model_specs.use_eia_bulk_zip:
         logging.info("Reading EIA bulk zip")
-        return _read_bulk_zip()
+        return _read_bulk_zip(year)
     else:
         logging.info("Reading EIA API bulk data")
-        return _read_bulk_api(ba_cols)
+        NET_GEN_ROWS, BA_TO_BA_ROWS, DEMAND_ROWS = _read_bulk_api(
+            ba_cols, year)
+        return (
+            series_to_df(NET_GEN_ROWS, 'net_gen', year),
+            series_to_df(BA_TO_BA_ROWS, 'ba_to_ba', year, exchange=True),
+            series_to_df(DEMAND_ROWS, 'demand')[['region']].drop_duplicates(
+                ignore_index=True),
+        )
 
 
-def _read_bulk_api(ba_cols):
+def _read_bulk_api(ba_cols, year=None):
     """Read demand, net generation, and interchange data from EIA's API.
 
     Parameters
@@ -1053,6 +1458,9 @@ def _read_bulk_api(ba_cols):
     ba_cols : list
         A list of balancing authority short codes.
         Used for querying regions for demand and net generation.
+    year : int, optional
+        The year of data to query. Defaults to the trade year of the model
+        configuration (i.e., NETL_IO_trading_year).
 
     Returns
     -------
@@ -1084,7 +1492,9 @@ def _read_bulk_api(ba_cols):
     _freq = "daily" # or 'local-hourly' or 'daily'
     # NOTE: if using 'local-hourly' these times must be in timezone format!
     # NOTE: the API time filter is based on day (not hour)!
-    _yr = model_specs.NETL_IO_trading_year
+    _yr = year
+    if _yr is None:
+        _yr = model_specs.NETL_IO_trading_year
     _start = "%d-01-01" % _yr
     _end = "%d-12-31" % _yr
 
@@ -1183,90 +1593,91 @@ def _read_bulk_json(json_file):
     return row_data
 
 
-def _read_bulk_zip():
-    """Read and parse EIA's U.S. Electric System Operating Data.
+def _read_bulk_years(ba_cols, years):
+    """Read the bulk U.S. Electric System Operating Data of several years.
 
-    Creates three lists of JSON-based dictionaries.
-    Each dictionary contains metadata and a time series of data.
-    Time series data appear to go back to around 2015.
+    EBA.zip is parsed at most once (into the local EBA store) and each
+    year's partition of the store is read; API data are read (or queried)
+    by year.
+
+    Parameters
+    ----------
+    ba_cols : list
+        A list of balancing authority short codes.
+    years : list
+        The years (UTC) of data to read.
 
     Returns
     -------
-    tuple
-        A tuple of length three.
-
-        - list : rows associated with net generation.
-        - list : rows associated with BA-to-BA trade.
-        - list : rows associated with demand.
+    dict
+        The tuple of each year's net generation, BA-to-BA interchange, and
+        demand data frames (see :func:`_read_bulk`), keyed by year.
     """
-    # Initialize return lists
-    NET_GEN_ROWS = []
-    BA_TO_BA_ROWS = []
-    DEMAND_ROWS = []
+    if model_specs.use_eia_bulk_zip:
+        logging.info("Reading EIA bulk zip")
+        store = _open_bulk_store()
+        demand = _read_demand_regions(store)
+        return {x: _read_bulk_zip(x, store, demand) for x in years}
 
-    # Changing to regex matches to allow compatibility with past and present
-    # bulk data. [2024-08-16; MJ]
-    ngh_matches = "^EBA[\\S\\w\\d]+[^NG]\\.NG\\.H$"
-    idh_matches = "^EBA.+\\.ID\\.H$"
-    dh_matches = "^EBA.+\\.D\\.H$"
+    return {x: _read_bulk(ba_cols, x) for x in years}
 
-    # HOTFIX: Check file vintage [2024-03-12; TWD]
-    path = os.path.join(paths.local_path, 'bulk_data', 'EBA.zip')
-    if model_specs.bypass_bulk_vintage:
-        logging.info("Skipping EBA vintage check")
-    else:
-        check_EBA_vintage()
 
-    try:
-        z = zipfile.ZipFile(path, 'r')
-    except FileNotFoundError:
-        logging.info("Downloading new bulk data")
-        download_EBA()
-        z = zipfile.ZipFile(path, 'r')
-    else:
-        logging.info("Using existing bulk data download")
+def _read_demand_regions(store):
+    """Return the regions with hourly demand in any year of an EBA store.
 
-    logging.info("Loading bulk data to json")
-    with z.open('EBA.txt') as f:
-        for line in f:
-            # To improve compatibility with old/new EBA.zip
-            f_json = json.loads(line)
+    Parameters
+    ----------
+    store : SeriesStore
+        An EBA store (see :func:`_open_bulk_store`).
 
-            # All the entries should have a 'series_id' and an 'f' key.
-            # 'H' for UTC hourly; 'HL' for local hourly; hard-coded to UTC.
-            # See https://github.com/USEPA/ElectricityLCI/discussions/254.
-            if 'series_id' in f_json.keys() and f_json.get('f', '') == 'H':
-                series_id = f_json['series_id']
+    Returns
+    -------
+    pandas.DataFrame
+        The regions with hourly demand ('region'), one row per region.
+    """
+    return store.read('demand', columns=['region']).drop_duplicates(
+        ignore_index=True)
 
-                # LEGACY NOTES --- The 2016 Baseline
-                # All but one BA is reporting net generation in UTC
-                # and local time. For that one BA (GRMA) only UTC time is
-                # reported - so only pulling that for now.
 
-                if re.search(ngh_matches, series_id) is not None:
-                    # HOTFIX: add single instance of JSON line checker
-                    # will throw about 82 warnings that data are not available.
-                    # (e.g., August 19, 2024 EBA.zip)
-                    _check_json(f_json)
-                    NET_GEN_ROWS.append(f_json)
+def _read_bulk_zip(year=None, store=None, demand=None):
+    """Read and parse EIA's U.S. Electric System Operating Data.
 
-                # Similarly there are 5 interchanges that report interchange
-                # in UTC but not in local time.
-                elif re.search(idh_matches, series_id) is not None:
-                    # Split on intersection, rstrip "EBA."
-                    s_txt = f_json['series_id'].split('-')[0][4:]
-                    if s_txt not in REGION_ACRONYMS:
-                        BA_TO_BA_ROWS.append(f_json)
+    The series of EBA.zip are written to the local EBA store (see
+    :class:`~electricitylci.bulk_eia_data.SeriesStore`) once per vintage
+    of EBA.zip; the data frames are read from the store.
+    Time series data appear to go back to around 2015.
 
-                # Keeping these here just in case
-                elif re.search(dh_matches, series_id) is not None:
-                    DEMAND_ROWS.append(f_json)
+    Parameters
+    ----------
+    year : int, optional
+        The year (UTC) of net generation and interchange data to keep.
+        Defaults to all years. Demand regions are from all years.
+    store : SeriesStore, optional
+        An EBA store that is up-to-date with EBA.zip. Defaults to the
+        local EBA store (see :func:`_open_bulk_store`).
+    demand : pandas.DataFrame, optional
+        The regions with hourly demand (see :func:`_read_demand_regions`).
+        Defaults to reading them from the store.
 
-    logging.debug(f"Net gen rows: {len(NET_GEN_ROWS)}")
-    logging.debug(f"BA to BA rows:{len(BA_TO_BA_ROWS)}")
-    logging.debug(f"Demand rows:{len(DEMAND_ROWS)}")
+    Returns
+    -------
+    tuple
+        A tuple of length three.
 
-    return (NET_GEN_ROWS, BA_TO_BA_ROWS, DEMAND_ROWS)
+        - pandas.DataFrame : hourly net generation.
+        - pandas.DataFrame : hourly BA-to-BA trade.
+        - pandas.DataFrame : regions with hourly demand in any year.
+    """
+    if store is None:
+        store = _open_bulk_store()
+    if demand is None:
+        demand = _read_demand_regions(store)
+
+    return (
+        store.read('net_gen', year),
+        store.read('ba_to_ba', year),
+        demand,
+    )
 
 
 def _read_ca_imports(year):
@@ -1620,16 +2031,16 @@ def ba_io_trading_model(year=None, subregion=None, regions_to_keep=None):
 
     Notes
     -----
-    A candidate for parsing out the long list of methods into their own
-    separate functions.
+    Runs :func:`ba_io_trading_models` for the one trade year; to model
+    several trade years, call it directly so that the bulk data are read
+    once for all years.
 
     Warning
     -------
-    This method has a habit of requiring a lot of memory. A test run of
-    ELCI_1 maxed at 11.1 GB during the call to :func:`ba_exchange_to_df`.
-    If you are hitting Python segmentation faults, try restarting your
-    computer and re-running the model with limited other applications running.
-    You may just need more memory.
+    This method used to require a lot of memory (a test run of ELCI_1 maxed
+    at 11.1 GB when the bulk data were held as lists of dictionaries). The
+    bulk data are now streamed into compact data frames of the trade year
+    only, see :func:`_read_bulk`.
 
     Examples
     --------
@@ -1645,11 +2056,73 @@ def ba_io_trading_model(year=None, subregion=None, regions_to_keep=None):
     """
     if year is None:
         year = model_specs.NETL_IO_trading_year
+    year = int(year)
+
+    return ba_io_trading_models([year], subregion, regions_to_keep)[year]
+
+
+def ba_io_trading_models(years=None, subregion=None, regions_to_keep=None,
+                         parallel=False):
+    """Use EIA trading data to calculate the consumption mixes of several
+    trade years for balancing authority area, FERC region, and U.S.
+    national levels.
+
+    The bulk U.S. Electric System Operating Data (i.e., net generation,
+    BA-to-BA interchange, and demand), balancing authorities, and Canadian
+    imports are read once for all trade years; then, each year's trade
+    pivot is made and its quasi-input-output model is run. Each year's
+    BAA_final_trade and ferc_final_trade CSV files are written to the
+    output folder.
+
+    Parameters
+    ----------
+    years : list, optional
+        The trade years (e.g., [2016, 2018, 2019]). Defaults to the trade
+        year of the model configuration (i.e., NETL_IO_trading_year).
+    subregion : str, optional
+        Description of a group of regions (see :func:`ba_io_trading_model`).
+    regions_to_keep : list, optional
+        A list of balancing authority names of interest.
+        Otherwise, returns all balancing authorities.
+    parallel : bool, optional
+        Whether to model the trade years in parallel worker processes, by
+        default False. Requires an operating system that can fork
+        processes; otherwise, the years are modeled serially. The results
+        are the same either way.
+
+    Returns
+    -------
+    dict
+        The trade data frames of each trade year, keyed by year. Each value
+        is a dictionary of data frames keyed by the level of aggregation:
+        "BA", "FERC", "US" (see :func:`ba_io_trading_model`).
+
+    Raises
+    ------
+    ValueError
+        If the subregion is not 'BA', 'FERC', or 'US'.
+
+    Notes
+    -----
+    Bulk data from EIA's API are queried for each trade year. To read
+    2016-2018 data, use the archived bulk zip file (see model config
+    parameter, 'use_eia_bulk_zip'), which is parsed once for all years.
+
+    Examples
+    --------
+    >>> d = ba_io_trading_models([2016, 2020], parallel=True)
+    >>> ferc_final_trade_2016 = d[2016]['FERC']
+    """
+    global _TRADE_INPUTS
+    if years is None:
+        years = [model_specs.NETL_IO_trading_year]
+    years = sorted(set(int(x) for x in years))
 
     if subregion is None:
         subregion = model_specs.regional_aggregation
     logging.info(
-        "Using trade year %d and aggregation level '%s'" % (year, subregion))
+        "Using trade years %s and aggregation level '%s'" % (
+            ", ".join([str(x) for x in years]), subregion))
 
     if subregion not in ['BA', 'FERC','US']:
         raise ValueError(
@@ -1659,120 +2132,55 @@ def ba_io_trading_model(year=None, subregion=None, regions_to_keep=None):
         )
 
     # Import US and CA BA into single North America data frame.
-    df_BA_NA, ba_cols, ferc_list = _read_ba()
-
-    # Read necessary data from EIA's bulk data download.
-    # WARNING: this is a lot of data in memory!
-    NET_GEN_ROWS, BA_TO_BA_ROWS, DEMAND_ROWS = _read_bulk(ba_cols)
-
-    # Net Generation Data Import
-    df_net_gen = _make_net_gen(year, ba_cols, NET_GEN_ROWS)
-    del(NET_GEN_ROWS)
+    ba_data = _read_ba()
+    ba_cols = ba_data[1]
 
-    # Create EIA generation dataset and Form 860 balancing authority list.
-    eia_gen_ba, eia860_ba_list = _read_eia_gen(year)
+    # Read necessary data from EIA's bulk data download for the trade years.
+    bulk_data = _read_bulk_years(ba_cols, years)
 
     # Read Canadian import data. Based on annual aggregated Canadian export
     # sales (in MWh) between Canadian and US balancing authorities.
     # https://www.cer-rec.gc.ca/en/data-analysis/energy-commodities/    \
     # electricity/statistics/electricity-trade-summary/
-    # The first data frame has annual net trades from CA to US,
-    # the second data frame has CA exports to US balancing authorities;
-    # both are for this trade year.
-    logging.info("Reading canadian import data")
-    df_CA_Imports_Gen, df_CA_Imports_Rows = _read_ca_imports(year)
-
-    # Combine and correct net generation data frame with Canada.
-    df_net_gen_sum = _make_net_gen_sum(
-        df_net_gen, eia_gen_ba, df_CA_Imports_Gen)
-
-    # Group and resample trading data so that it is on an annual basis
-    # WARNING: Peaks around 11 GB of memory
-    logging.info("Creating trading data frame")
-    df_ba_trade = ba_exchange_to_df(BA_TO_BA_ROWS, data_type='ba_to_ba')
-    del(BA_TO_BA_ROWS)
-
-    # Make export-import trade pivot table, make it square.
-    df_trade_pivot = _make_trade_pivot(year, ba_cols, df_ba_trade)
-    df_trade_pivot = _make_square_pivot(df_trade_pivot, ba_cols)
-
-    # Add Canadian Imports to the trading matrix
-    df_CA_Imports_Rows = _match_df_cols(df_trade_pivot, df_CA_Imports_Rows)
-    df_concat_trade_CA = pd.concat([df_trade_pivot, df_CA_Imports_Rows])
-
-    # Make it square. BUG: ELCI_1 has extra 'GRIS' column with no data.
-    all_baa = list(df_concat_trade_CA.index.values)
-    df_concat_trade_CA = _make_square_pivot(df_concat_trade_CA, all_baa)
-    df_trade_pivot = df_concat_trade_CA
-
-    # Create list of BA codes for EIA 860 data and run the QIO model.
-    eia860_bas = sorted(eia860_ba_list + list(df_CA_Imports_Rows.index))
-
-    df_final_trade_out_filt_melted_merge = qio_model(
-        df_net_gen_sum,
-        df_trade_pivot,
-        df_BA_NA,
-        eia860_bas,
-        regions_to_keep,
-        thresh=0.00001)
-
-    # Develop final df for BAA
-    BAA_final_trade = _make_ba_trade(
-        df_final_trade_out_filt_melted_merge, eia860_bas)
-
-    # There are some BAs that will have 0 trade. Some of these are legitimate.
-    # Alcoa Yadkin has no demand (i.e., all power generation is exported)
-    # others seem to be errors. For those BAs with actual demand, we'll set
-    # the consumption mix to 100% from that BA. For those without demand,
-    # fraction will be set to near 0 just to make sure systems can be built
-    # in openLCA.
-
-    # Find the zero traders.
-    # TODO: combine w/ _fix_final_trade
-    BAA_zero_trade = _get_zero_traders(BAA_final_trade)
-
-    # Find zero traders w/ demand.
-    # TODO: combine w/ _fix_final_trade
-    BAAs_from_zero_trade_with_demand = _get_zero_traders_w_demand(
-        BAA_zero_trade, DEMAND_ROWS)
-    del(DEMAND_ROWS)
-
-    # Set these regions' fractions to 1
-    BAA_final_trade = _fix_final_trade(
-        BAA_final_trade, BAA_zero_trade, BAAs_from_zero_trade_with_demand)
-
-    # Write final trade table to CSV
-    out_file = 'BAA_final_trade_{}.csv'.format(year)
-    write_csv_to_output(out_file, BAA_final_trade)
-
-    # Add balancing authority names to final trade data frame.
-    BAA_final_trade["export_name"] = BAA_final_trade["export BAA"].map(
-        df_BA_NA[["BA_Acronym", "BA_Name"]].set_index("BA_Acronym")["BA_Name"])
-    BAA_final_trade["import_name"] = BAA_final_trade["import BAA"].map(
-        df_BA_NA[["BA_Acronym", "BA_Name"]].set_index("BA_Acronym")["BA_Name"])
-
-    # Calculate fractions of trade between BA and FERC regions.
-    ferc_final_trade = _make_ferc_trade(
-        df_final_trade_out_filt_melted_merge, ferc_list)
-
-    out_file = 'ferc_final_trade_{}.csv'.format(year)
-    write_csv_to_output(out_file, ferc_final_trade)
-
-    # Add balancing authority name to export regions.
-    ferc_final_trade["export_name"] = ferc_final_trade["export BAA"].map(
-        df_BA_NA[["BA_Acronym", "BA_Name"]].set_index("BA_Acronym")["BA_Name"])
-
-    # Calculate US trade fractions by exporting balancing authority.
-    us_final_trade = _make_us_trade(df_final_trade_out_filt_melted_merge)
-
-    # Add balancing authority name to export regions.
-    us_final_trade["export_name"] = us_final_trade["export BAA"].map(
-        df_BA_NA[["BA_Acronym", "BA_Name"]].set_index("BA_Acronym")["BA_Name"])
+    # NOTE: read here, rather than by each worker process, so the CER-rec
+    # workbook is downloaded at most once.
+    inputs = {}
+    for year in years:
+        logging.info("Reading canadian import data for %d" % year)
+        inputs[year] = {
+            'ba': ba_data,
+            'bulk': bulk_data.pop(year),
+            'ca': _read_ca_imports(year),
+        }
+
+    mp_context = None
+    if parallel and len(years) > 1:
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            logging.warning(
+                "Parallel trading requires forked processes; "
+                "modeling trade years serially")
+    if mp_context is None:
+        return {
+            x: _ba_io_trading_year(x, inputs.pop(x), regions_to_keep)
+            for x in years
+        }
+
+    logging.info("Modeling %d trade years in parallel" % len(years))
+    # Worker processes inherit the inputs when they are forked.
+    _TRADE_INPUTS = inputs
+    try:
+        with ProcessPoolExecutor(mp_context=mp_context) as executor:
+            results = list(executor.map(
+                _ba_io_trading_fork,
+                years,
+                repeat(regions_to_keep),
+            ))
+    finally:
+        _TRADE_INPUTS = {}
 
-    return {
-        'BA': BAA_final_trade,
-        'FERC': ferc_final_trade,
-        'US': us_final_trade}
+    return dict(zip(years, results))
 
 
 def olca_schema_consumption_mix(database, gen_dict, subregion="BA"):
@@ -1900,60 +2308,8 @@ def qio_model(net_gen_df, trade_pivot, ba_map, ba_list, roi=None, thresh=1e-5):
         - 'export ferc region' (str): FERC region name associated with export
         - 'export ferc region abbr' (str): FERC exporter abbreviation
     """
-    # Create total inflow vector x and then convert to a diagonal matrix x-hat
-    logging.info("Inflow vector")
-    x = []
-    for i in range(len(net_gen_df)):
-        x.append(net_gen_df.iloc[i] + trade_pivot.sum(axis=0).iloc[i])
-    x_np = np.array(x)
-
-    # If values are zero, x_hat matrix will be singular,
-    # set BAAs with 0 to small value (e.g., 1.0)
-    df_x = pd.DataFrame(data=x_np, index=trade_pivot.index)
-    df_x = df_x.rename(columns={0: 'inflow'})
-    df_x.loc[df_x['inflow'] == 0] = 1
-
-    x_np = df_x.values
-    x_hat = np.diagflat(x_np)
-
-    # Create consumption vector c and then convert to a diagonal matrix c-hat
-    # Calculate c based on x and T
-    logging.info("consumption vector")
-    c = []
-    for i in range(len(net_gen_df)):
-        c.append(x[i] - trade_pivot.sum(axis=1).iloc[i])
-
-    c_np = np.array(c)
-    c_hat = np.diagflat(c_np)
-
-    # Convert df_trade_pivot to matrix
-    T = trade_pivot.values
-
-    # Create matrix to split T into distinct interconnections -
-    # i.e., prevent trading between eastern and western interconnects.
-    # Connections between the western and eastern interconnects are through
-    # SWPP and WAUE.
-    logging.info("Matrix operations")
-    interconnect = trade_pivot.copy()
-    interconnect[:] = 1
-    interconnect.loc['SWPP',['EPE', 'PNM', 'PSCO', 'WACM']] = 0
-    interconnect.loc['WAUE',['WAUW', 'WACM']] = 0
-    interconnect_mat = interconnect.values
-    T_split = np.multiply(T, interconnect_mat)
-
-    # Matrix trading math (see Qu et al. 2018 ES&T paper)
-    x_hat_inv = np.linalg.inv(x_hat)
-    B = np.matmul(T_split, x_hat_inv)
-    I = np.identity(len(net_gen_df))
-    diff_I_B = I - B
-    G = np.linalg.inv(diff_I_B)
-    H = np.matmul(G, c_hat, x_hat_inv)
-    df_H = pd.DataFrame(H)
-
-    # Convert H to pandas data frame, populate index and columns
-    df_final_trade_out = df_H
-    df_final_trade_out.columns = net_gen_df.index
-    df_final_trade_out.index = net_gen_df.index
+    # Solve for the trade matrix, H (see :func:`_qio_matrix`).
+    df_final_trade_out = _qio_matrix(net_gen_df, trade_pivot)
 
     # Develop trading input for the eLCI code.
     # Need to melt the data frame to end up with a three column
@@ -1972,15 +2328,9 @@ def qio_model(net_gen_df, trade_pivot, ba_map, ba_list, roi=None, thresh=1e-5):
     # Set their quantities to 0 so that the consumption mixes are made up
     # of the rest of the incoming balancing authority areas.
     col_list = df_final_trade_out_filt.columns.tolist()
-    for i in col_list:
-        df_final_trade_out_filt[i] = np.where(
-            (
-                df_final_trade_out_filt[i].abs()
-                / df_final_trade_out_filt[i].sum() < thresh
-            ),
-            0,
-            df_final_trade_out_filt[i].abs()
-        )
+    df_abs = df_final_trade_out_filt.abs()
+    df_final_trade_out_filt = df_abs.mask(
+        df_abs / df_final_trade_out_filt.sum() < thresh, 0)
 
     df_final_trade_out_filt = df_final_trade_out_filt.reset_index()
     df_final_trade_out_filt = df_final_trade_out_filt.rename(
@@ -6,6 +6,7 @@
 ##############################################################################
 # REQUIRED MODULES
 ##############################################################################
+from functools import lru_cache
 import logging
 
 import pandas as pd
@@ -20,17 +21,26 @@ __doc__ = """This script compares the names of the wastes (and other flows)
 and replaces them with names in the Federal LCA Commons elementary flows list.
 Types of flows and compartment information are also determined and indexed.
 
+CHANGELOG
+
+-   Add process-wide caches of the FEDEFL flow list, its UUID index, and its
+    flow mappings (see :func:`get_fedefl_flows`), so that the package reads
+    them once per Python session.
+
 Last updated:
-    2025-06-09
+    2026-10-17
 """
 __all__ = [
     "add_flow_direction",
     "compartment_to_flowtype",
     "correct_netl_flow_names",
+    "get_fedefl_flows",
+    "get_fedefl_mapping",
     "map_compartment_to_flow_type",
     "map_emissions_to_fedelemflows",
     "map_renewable_heat_flows_to_fedelemflows",
     "mapping_to_fedelemflows",
+    "select_fedefl_flows",
 ]
 
 
@@ -111,7 +121,7 @@ def correct_netl_flow_names(df, amount_col="FlowAmount"):
     """
     # This data frame has about 4k source flow names and contexts associated
     # with NETL unit process models (e.g., petro, nuclear, coal).
-    flow_mapping = fedelemflowlist.get_flowmapping('eLCI')
+    flow_mapping = get_fedefl_mapping('eLCI').copy()
 
     # Matching occurs on name and compartment; help this along by lowering the
     # case (improves coal UP matches from 10% to 42%).
@@ -190,6 +200,48 @@ def correct_netl_flow_names(df, amount_col="FlowAmount"):
     return mapped_df
 
 
+# lru_cache allows us to only read the flow list once.
+@lru_cache(maxsize=1)
+def get_fedefl_flows():
+    """Return the Federal Elementary Flow List (FEDEFL).
+
+    Notes
+    -----
+    The flow list is read once per Python session and the same data frame
+    is returned on every call; do not modify it in place.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The FEDEFL flows, as provided by ``fedelemflowlist.get_flows()``.
+    """
+    logging.info("Reading FEDEFL flow list")
+    return fedelemflowlist.get_flows()
+
+
+@lru_cache(maxsize=10)
+def get_fedefl_mapping(source=None):
+    """Return the FEDEFL flow mapping for a given source list.
+
+    Notes
+    -----
+    Each mapping is read once per Python session and the same data frame
+    is returned on every call; make a copy before modifying it.
+
+    Parameters
+    ----------
+    source : str, optional
+        A source list name (e.g., 'eLCI'), by default None (all sources).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The flow mapping, as provided by
+        ``fedelemflowlist.get_flowmapping()``.
+    """
+    return fedelemflowlist.get_flowmapping(source)
+
+
 def map_compartment_to_flow_type(df_with_compartments):
     """Add new columns to a data frame that maps flows based on compartment."""
     df_with_flowtypes = pd.merge(
@@ -377,3 +429,39 @@ def map_renewable_heat_flows_to_fedelemflows(df_with_flows_compart_direction):
     # TODO: Need to handle steam separately
 
     return df_with_flows_compart_direction
+
+
+def select_fedefl_flows(uuids):
+    """Return the rows of the FEDEFL flow list with the given UUIDs.
+
+    Parameters
+    ----------
+    uuids : iterable
+        Flow UUIDs (str). UUIDs not in the FEDEFL are ignored.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A subset of :func:`get_fedefl_flows` in the flow list's order.
+    """
+    rows = _fedefl_rows()
+    positions = []
+    for uid in set(uuids).intersection(rows):
+        positions.extend(rows[uid])
+    return get_fedefl_flows().iloc[sorted(positions)]
+
+
+@lru_cache(maxsize=1)
+def _fedefl_rows():
+    """Index the FEDEFL flow list by UUID.
+
+    Returns
+    -------
+    dict
+        Flow UUIDs (str) and the list of their row positions (int) in
+        :func:`get_fedefl_flows`.
+    """
+    rows = {}
+    for i, uid in enumerate(get_fedefl_flows()['Flow UUID']):
+        rows.setdefault(uid, []).append(i)
+    return rows
@@ -6,16 +6,19 @@
 ##############################################################################
 # REQUIRED MODULES
 ##############################################################################
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import hashlib
+from itertools import repeat
+import json
 import logging
+import multiprocessing
 import os
 
 import numpy as np
 import pandas as pd
 from scipy.stats import t
 from scipy.special import erfinv
-from scipy.optimize import least_squares
-from scipy.stats import uniform
 
 # Presence of 'model_specs' indicates that model configuration occurred.
 from electricitylci.model_config import model_specs
@@ -30,14 +33,15 @@ from electricitylci.eia860_facilities import eia860_balancing_authority
 from electricitylci.eia923_generation import build_generation_data
 from electricitylci.eia923_generation import eia923_primary_fuel
 import electricitylci.emissions_other_sources as em_other
+from electricitylci.globals import data_dir
 from electricitylci.globals import elci_version
 from electricitylci.globals import paths
 from electricitylci.globals import output_dir
 import electricitylci.manual_edits as edits
-from electricitylci.process_dictionary_writer import flow_table_creation
+from electricitylci.process_dictionary_writer import flow_table_records
 from electricitylci.process_dictionary_writer import process_doc_creation
 from electricitylci.process_dictionary_writer import ref_exchange_creator
-from electricitylci.process_dictionary_writer import uncertainty_table_creation
+from electricitylci.process_dictionary_writer import uncertainty_table_records
 from electricitylci.process_dictionary_writer import unit
 from electricitylci.utils import make_valid_version_num
 from electricitylci.utils import check_output_dir
@@ -79,181 +83,719 @@ CHANGELOG
 -   Add uncertainty switch
 -   Drop NaNs in exchange table
 -   Move FRS file download to its own function
+-   Replace the least-squares fitting of Hawkins-Young sigma with a
+    deterministic closed-form root solver that runs on all groups at once
+    (see :func:`hawkins_young_sigma_batch`)
+-   Compute the log-normal parameters (GeomMean and GeomSD) in
+    :func:`aggregate_data` with array math rather than a row-wise apply
+    (see :func:`hawkins_young_uncertainty_batch`)
+-   Build the exchange dictionaries in :func:`turn_data_to_dict` from
+    columns rather than one-row data frame slices
+-   Collapse duplicated emissions in :func:`aggregate_facility_flows` with
+    one grouped reduction rather than a groupby and merge back
+-   Store repeated labels in the facility-level inventory as categoricals
+    (see :data:`INVENTORY_DTYPES`)
+-   Add an optional parallel, per-region mode to :func:`aggregate_data`
+    (see model config parameter, 'parallel_aggregation')
+-   Compute the flow-weighted DQI scores in :func:`aggregate_data` for all
+    groups in one pass (see :func:`_wtd_mean_by_group`)
+-   Add a content-hashed Parquet checkpoint of the facility-level inventory
+    to :func:`create_generation_process_df` (see model config parameters,
+    'cache_generation_inventory' and 'refresh_generation_cache', and
+    :func:`clear_generation_cache`)
+-   Match source strings to their facilities in
+    :func:`calculate_electricity_by_source` with a precomputed source
+    bitmask index (see :func:`build_source_index`) rather than a grouped
+    apply per flow
+-   Add :func:`aggregate_data_levels` to aggregate to several subregions
+    (e.g., BA, FERC, EIA, and US) with one pass of the shared, facility-level
+    preparation steps (each subregion is still grouped separately)
 
 Created:
     2019-06-04
 Last edited:
-    2025-06-09
+    2026-10-17
 """
 __all__ = [
+    "INVENTORY_DTYPES",
     "add_data_collection_score",
     "add_technological_correlation_score",
     "add_temporal_correlation_score",
     "aggregate_data",
+    "aggregate_data_levels",
     "aggregate_facility_flows",
+    "build_source_index",
     "calculate_electricity_by_source",
+    "clear_generation_cache",
     "create_generation_process_df",
     "eia_facility_fuel_region",
     "hawkins_young",
     "hawkins_young_sigma",
+    "hawkins_young_sigma_batch",
     "hawkins_young_uncertainty",
+    "hawkins_young_uncertainty_batch",
     "olcaschema_genprocess",
     "replace_egrid",
+    "set_inventory_dtypes",
     "turn_data_to_dict",
 ]
 
 
+##############################################################################
+# GLOBALS
+##############################################################################
+INVENTORY_DTYPES = {
+    # Repeated labels
+    "FlowName": "category",
+    "Compartment": "category",
+    "Compartment_path": "category",
+    "FuelCategory": "category",
+    "Source": "category",
+    "stage_code": "category",
+    "Balancing Authority Name": "category",
+    "Balancing Authority Code": "category",
+    "FERC_Region": "category",
+    "EIA_Region": "category",
+    # DQI scores (integers 1-5, but may be NaN)
+    "TemporalCorrelation": "float32",
+    "TechnologicalCorrelation": "float32",
+    "GeographicalCorrelation": "float32",
+    "DataCollection": "float32",
+    "DataReliability": "float32",
+}
+'''dict : Column data types for the facility-level inventory.
+
+The string columns repeat a handful of values on every row, so they are
+stored as pandas categoricals; the data quality scores are small integers,
+which are exact in single precision. Amounts (e.g., FlowAmount, Electricity,
+and PercentGenerationfromDesignatedFuelCategory) and identifiers (eGRID_ID
+and Year) keep their 64-bit types so that sums, threshold comparisons, and
+merges are unaffected. Group-bys on categorical columns must use
+``observed=True``.'''
+
+_GENERATION_CACHE_SPECS = [
+    "model_name",
+    "electricity_lci_target_year",
+    "egrid_year",
+    "eia_gen_year",
+    "replace_egrid",
+    "include_renewable_generation",
+    "inventories_of_interest",
+    "stewicombo_file",
+    "include_only_egrid_facilities_with_positive_generation",
+    "filter_on_efficiency",
+    "egrid_facility_efficiency_filters",
+    "filter_on_min_plant_percent_generation_from_primary_fuel",
+    "min_plant_percent_generation_from_primary_fuel_category",
+    "keep_mixed_plant_category",
+    "filter_non_egrid_emission_on_NAICS",
+]
+'''list : The model specs read when building the facility-level inventory
+(see :func:`create_generation_process_df`), which key its checkpoint.
+
+Specs of later stages (e.g., upstream processes, trading, aggregation, and
+JSON-LD writing) are not listed, so changing them reuses the checkpoint.'''
+
+
 ##############################################################################
 # FUNCTIONS
 ##############################################################################
-def _calc_sigma(p_series):
-    """Calculate the standard deviation for a series of facility emission
-    factors.
+def _aggregate_groups(total_db, agg_cols, calc_uncertainty=True):
+    """Aggregate facility-level flows and their emission factor statistics.
 
     Parameters
     ----------
-    p_series : pandas.Series
-        A series object sent during an aggregation or apply call.
+    total_db : pandas.DataFrame
+        Facility-level emissions with facility emission factors, as prepared
+        in :func:`aggregate_data`.
+    agg_cols : list
+        The column names to group by.
+    calc_uncertainty : bool, optional
+        Whether to fit the Hawkins-Young sigma, by default True.
 
     Returns
     -------
-    float
-        The fitted sigma for a Hawkins-Young uncertainty method.
-        Assumes a 90% confidence level (see :param:`alpha`).
+    pandas.DataFrame
+        A data frame with the group columns, 'FlowAmount', 'FlowAmountCount',
+        the five flow-weighted DQI scores, 'uncertaintyMin',
+        'uncertaintyMax', and 'uncertaintySigma'; sorted by group.
     """
-    alpha = 0.9
-    if model_specs.calculate_uncertainty:
-        (is_error, sigma) = hawkins_young_sigma(p_series.values, alpha)
-    else:
-        return None
+    dqi_cols = [
+        "TemporalCorrelation",
+        "TechnologicalCorrelation",
+        "GeographicalCorrelation",
+        "DataCollection",
+        "DataReliability",
+    ]
+    database_f3 = total_db.groupby(agg_cols, observed=True).agg({
+        "FlowAmount": ["sum", "count"],
+        "facility_emission_factor": ["min", "max", "mean", "count"],
+    })
+    database_f3.columns = [
+        "FlowAmount",
+        "FlowAmountCount",
+        "uncertaintyMin",
+        "uncertaintyMax",
+        "ef_mean",
+        "ef_count",
+    ]
 
-    if is_error:
-        return None
+    # Fit Hawkins-Young sigma for all groups at once; assumes a 90%
+    # confidence level. NOTE: std is the population standard deviation
+    # (ddof=0) to match np.std in :func:`hawkins_young_sigma`.
+    if calc_uncertainty:
+        ef_std = total_db.groupby(agg_cols, observed=True)[
+            "facility_emission_factor"].std(ddof=0)
+        is_error, sigma = hawkins_young_sigma_batch(
+            database_f3["ef_count"].values,
+            ef_std.values,
+            database_f3["ef_mean"].values,
+            alpha=0.9,
+        )
+        sigma[is_error] = np.nan
+        database_f3["uncertaintySigma"] = sigma
     else:
-        return sigma
+        database_f3["uncertaintySigma"] = None
+    database_f3.drop(columns=["ef_mean", "ef_count"], inplace=True)
+
+    # Flow-amount weighted DQI scores, all five computed in one pass
+    database_f3 = database_f3.join(
+        _wtd_mean_by_group(total_db, agg_cols, dqi_cols)
+    ).reset_index()
+
+    # Reset the column order
+    database_f3 = database_f3[agg_cols + [
+        "FlowAmount",
+        "FlowAmountCount",
+        "TemporalCorrelation",
+        "TechnologicalCorrelation",
+        "GeographicalCorrelation",
+        "DataCollection",
+        "DataReliability",
+        "uncertaintyMin",
+        "uncertaintyMax",
+        "uncertaintySigma",
+    ]]
+
+    return database_f3
 
 
-def _calc_geom_params(p_series):
-    """Location-adjusted geometric mean and standard deviation based on the
-    Hawkins-Young uncertainty method.
+def _aggregate_groups_by_region(
+        total_db, agg_cols, region_agg, calc_uncertainty=True):
+    """Run :func:`_aggregate_groups` for each region in a process pool.
+
+    The regions are independent once the electricity totals are known, so
+    the data frame is partitioned by region, each partition is aggregated
+    by a worker process, and the results are concatenated in sorted region
+    order (i.e., the same order as :func:`_aggregate_groups`).
 
     Parameters
     ----------
-    p_series : pandas.Series
-        A data series for aggregated (or disaggregated) emissions,
-        including variables for 'uncertaintySigma' (as calculated
-        by :func:`_calc_sigma`), 'Emission_factor' (emission amounts
-        per MWh),
+    total_db : pandas.DataFrame
+        Facility-level emissions with facility emission factors, as prepared
+        in :func:`aggregate_data`.
+    agg_cols : list
+        The column names to group by (including the region column).
+    region_agg : list
+        The region column (e.g., from :func:`subregion_col`).
+    calc_uncertainty : bool, optional
+        Whether to fit the Hawkins-Young sigma, by default True.
 
     Returns
     -------
-    tuple
-        Geometric mean : float or NaN
-        Geometric standard deviation : float or NaN
+    pandas.DataFrame
+        See :func:`_aggregate_groups`.
 
+    Notes
+    -----
+    Worker processes are forked so they share the configured model specs;
+    where forking is not available (e.g., Windows), the regions are
+    aggregated serially.
     """
-    sigma = p_series["uncertaintySigma"]
-    ef = p_series["Emission_factor"]
+    try:
+        mp_context = multiprocessing.get_context("fork")
+    except ValueError:
+        logging.warning(
+            "Parallel aggregation requires forked processes; "
+            "aggregating serially")
+        return _aggregate_groups(total_db, agg_cols, calc_uncertainty)
+
+    partitions = [
+        x for _, x in total_db.groupby(region_agg, observed=True, sort=True)
+    ]
+    logging.info("Aggregating %d regions in parallel" % len(partitions))
+    with ProcessPoolExecutor(mp_context=mp_context) as executor:
+        results = list(executor.map(
+            _aggregate_groups,
+            partitions,
+            repeat(agg_cols),
+            repeat(calc_uncertainty),
+        ))
+
+    if len(results) == 0:
+        return _aggregate_groups(total_db, agg_cols, calc_uncertainty)
+
+    return pd.concat(results, ignore_index=True)
+
+
+def _aggregate_subregion(total_db, subregion="BA", source_index=None):
+    """Aggregate prepared facility-level emissions to a subregion.
+
+    See :func:`aggregate_data` for details.
+
+    Parameters
+    ----------
+    total_db : pandas.DataFrame
+        Facility-level emissions from :func:`_prepare_for_aggregation`.
+        Not modified.
+    subregion : str, optional
+        The level of subregion that the data will be aggregated to, by
+        default 'BA'.
+    source_index : tuple, optional
+        The source index of `total_db` (see :func:`build_source_index`),
+        by default None.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The aggregated emissions (see :func:`aggregate_data`).
+    """
+    region_agg = subregion_col(subregion)
+    fuel_agg = ["FuelCategory"]
+    if region_agg:
+        groupby_cols = (
+            region_agg
+            + fuel_agg
+            + ["stage_code", "FlowName", "Compartment", "FlowUUID", "Unit"]
+        )
+        # NOTE: datatypes should be str, str, int, str
+        elec_df_groupby_cols = (
+            region_agg + fuel_agg + ["Year", "source_string"]
+        )
+    else:
+        groupby_cols = fuel_agg + [
+            "stage_code",
+            "FlowName",
+            "Compartment",
+            "FlowUUID",
+            "Unit"
+        ]
+        # NOTE: datatypes should be str, int, str
+        elec_df_groupby_cols = fuel_agg + ["Year", "source_string"]
+
+    # Calculate electricity totals by region and source
+    total_db, electricity_df = calculate_electricity_by_source(
+        total_db, subregion, source_index
+    )
+
+    # Assign data score based on percent generation
+    total_db = add_data_collection_score(total_db, electricity_df, subregion)
+
+    # Calculate the facility-level emission factor (E/MWh)
+    # HOTFIX ZeroDivisionError [2024-05-14; TWD]
+    crit_zero = total_db["Electricity"] != 0
+    total_db.loc[crit_zero, "facility_emission_factor"] = (
+        total_db.loc[crit_zero, "FlowAmount"]
+        / total_db.loc[crit_zero, "Electricity"]
+    )
+    # Effectively removes rows with zero Electricity or nan flow amounts.
+    #  For 2016 generation, it's all caused by nans in flow amounts.
+    #  For 2020 generation, it's all zero electricity.
+    #  For 2022 generation, it's a mixed bag.
+    total_db.dropna(subset=["facility_emission_factor"], inplace=True)
 
-    if sigma is None:
-        return (float('nan'), float('nan'))
+    info_txt = "Aggregating flow amounts and dqi information"
+    if model_specs.calculate_uncertainty:
+        info_txt += ", calculating uncertainty"
+    logging.info(info_txt)
 
-    d = hawkins_young_uncertainty(ef, sigma, False)
-    is_error = d['error']
-    if is_error:
-        return (float('nan'), float('nan'))
+    # BUG: Getting occasional ValueError, zero-size array reduction operation
+    # minimum which has no identity; likely due to an empty group.
+    # Consider iterating over groups, checking their size, and concatenating
+    # the results.
+    agg_cols = groupby_cols + ["Year", "source_string"]
+    if model_specs.parallel_aggregation and region_agg:
+        database_f3 = _aggregate_groups_by_region(
+            total_db,
+            agg_cols,
+            region_agg,
+            model_specs.calculate_uncertainty
+        )
     else:
-        return (d['mu_g'], d['sigma_g'])
+        database_f3 = _aggregate_groups(
+            total_db, agg_cols, model_specs.calculate_uncertainty)
 
+    logging.info("Removing uncertainty from input flows")
+    criteria = database_f3["Compartment"] == "input"
+    database_f3.loc[criteria, "uncertaintySigma"] = None
 
-def _combine_sources(p_series, df, cols, source_limit=None):
-    """Take the sources from a groupby.apply and return a list that
-    contains one column containing a list of the sources and another
-    that concatenates them into a string. This is all in an effort to find
-    another approach for summing electricity for all plants in an aggregation
-    that matches the same data sources.
+    # Merge electricity_sum, electricity_mean, and facility_count data
+    # HOTFIX: 'Year' must be integer in both dataframes [2023-12-18; TWD]
+    electricity_df['Year'] = electricity_df['Year'].astype(int)
+    database_f3['Year'] = database_f3['Year'].astype(int)
+    database_f3 = database_f3.merge(
+        right=electricity_df,
+        on=elec_df_groupby_cols,
+        how="left"
+    )
+
+    # Fix Canada by importing 'Electricity' whilst maintaining the indexes
+    logging.info("Fixing Canadian electricity amounts")
+    canadian_criteria = database_f3["FuelCategory"] == "ALL"
+    if region_agg:
+        canada_db = pd.merge(
+            left=database_f3.loc[canadian_criteria, :],
+            right=total_db[groupby_cols + ["Electricity","DataReliability"]],
+            left_on=groupby_cols,
+            right_on=groupby_cols,
+            how="left",
+        ).drop_duplicates(subset=groupby_cols)
+    else:
+        total_grouped = total_db.groupby(
+            by=groupby_cols+["DataReliability"],
+            as_index=False,
+            observed=True)["Electricity"].sum()
+        canada_db = pd.merge(
+            left=database_f3.loc[canadian_criteria, :],
+            right=total_grouped,
+            left_on=groupby_cols,
+            right_on=groupby_cols,
+            how="left",
+        )
+
+    # Reverse the dummy UUID assignment
+    database_f3.loc[
+        database_f3["FlowUUID"] == "dummy-uuid", "FlowUUID"
+    ] = float("nan")
+
+    # Create emission factors, adjust accordingly for for Canadian BA's
+    logging.info("Creating emission factors")
+    canada_db.index = database_f3.loc[canadian_criteria, :].index
+    database_f3.loc[canada_db.index, "electricity_sum"] = canada_db[
+        "Electricity"
+    ]
+    # HOTFIX: Address ZeroDivideError [2023-12-18; TWD]
+    # NOTE: Set to zero because the units are per net generation;
+    #       the `fix_val` is used to search for replacements (there are
+    #       no known electricity_sum values less than 0.01, except for
+    #       those that are 0).
+    fix_val = 1e-4
+    database_f3.loc[
+        database_f3['electricity_sum'] == 0, 'electricity_sum'] += fix_val
+    database_f3["Emission_factor"] = (
+        database_f3["FlowAmount"] / database_f3["electricity_sum"]
+    )
+    database_f3.loc[
+        database_f3['electricity_sum'] == fix_val, 'Emission_factor'] = 0
+
+    # Calculate the log-normal parameters for uncertainty; see Hawkins-Young
+    # https://github.com/USEPA/ElectricityLCI/discussions/240
+    # NOTE: missing sigmas (e.g., input flows) give NaNs.
+    d = hawkins_young_uncertainty_batch(
+        database_f3["Emission_factor"], database_f3["uncertaintySigma"])
+    database_f3["GeomMean"] = np.where(d['error'], np.nan, d['mu_g'])
+    database_f3["GeomSD"] = np.where(d['error'], np.nan, d['sigma_g'])
+    database_f3.sort_values(by=groupby_cols, inplace=True)
+
+    # The aggregated data are small; return categorical group keys (see
+    # INVENTORY_DTYPES) as plain strings for the process dictionary writers.
+    cat_cols = database_f3.select_dtypes("category").columns
+    database_f3[cat_cols] = database_f3[cat_cols].astype(object)
+
+    return database_f3
+
+
+def _file_fingerprint(file_path, hash_contents=False):
+    """Return a short description of a file for checkpoint keys.
 
     Parameters
     ----------
-    p_series : pandas.Series
-        A column of source strings from inventory data frame.
-    df: pandas.DataFrame
-        Dataframe containing merged generation and emissions data; it includes
-        a column for data source (e.g., eGRID, NEI, and RCRAInfo).
-    cols : list
-        Unused column list, except for debugging statement.
-    source_limit : int, optional
-        The maximum number of sources allowed to be found.
-        Defaults to none.
+    file_path : str
+        A file path.
+    hash_contents : bool, optional
+        If true, the file's SHA-256 digest is used (best for small files,
+        such as YAMLs); otherwise, the file size and modification time are
+        used. Defaults to false.
 
     Returns
+    -------
+    str
+        The fingerprint (e.g., 'manual_edits.yml:9f86d0...'); if the file
+        does not exist, 'missing' is used in place of the file details.
+    """
+    f_name = os.path.basename(file_path)
+    if not os.path.isfile(file_path):
+        return "%s:missing" % f_name
+    if hash_contents:
+        with open(file_path, "rb") as f:
+            return "%s:%s" % (f_name, hashlib.sha256(f.read()).hexdigest())
+    f_stat = os.stat(file_path)
+    return "%s:%d:%d" % (f_name, f_stat.st_size, f_stat.st_mtime_ns)
+
+
+def _folder_fingerprints(folder):
+    """Return the fingerprints of the files in a folder (and its
+    subfolders) for checkpoint keys.
+
+    Parameters
     ----------
+    folder : str
+        A folder path.
+
+    Returns
+    -------
     list
-        A list of length two.
+        The file fingerprints, sorted by path (see
+        :func:`_file_fingerprint`); if the folder does not exist, its name
+        with 'missing' (e.g., ['f923_2022:missing']).
+    """
+    if not os.path.isdir(folder):
+        return ["%s:missing" % os.path.basename(folder)]
+    fingerprints = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        fingerprints += [
+            _file_fingerprint(os.path.join(root, x)) for x in sorted(files)
+        ]
+
+    return fingerprints
+
+
+def _generation_cache_path():
+    """Return the checkpoint file path for the facility-level inventory.
 
-        1. The first item is a list of all sources or nan.
-        2. The second item is a string of concatenated sources or nan.
+    The file name is keyed by a SHA-256 digest of the model specs that
+    the inventory depends on (see :data:`_GENERATION_CACHE_SPECS`), the
+    package version, and fingerprints of the input files (i.e.,
+    manual_edits.yml, the FRS bridge file, the stewicombo inventories, and
+    the EIA Form 923, EIA Form 860, and EPA CEMS data of each generation
+    year), such that any change to the inputs results in a new checkpoint.
+
+    Returns
+    -------
+    str
+        A Parquet file path (e.g.,
+        '.../electricitylci/generation_cache/ELCI_2022_4e1f0c2a9b7d.parquet').
     """
-    logging.debug(
-        f"Combining sources for {str(df.loc[p_series.index[0],cols].values)}"
+    specs = {k: getattr(model_specs, k) for k in _GENERATION_CACHE_SPECS}
+
+    fingerprints = [
+        _file_fingerprint(
+            os.path.join(data_dir, "manual_edits.yml"), hash_contents=True),
+    ]
+    # See create_generation_process_df for the FRS bridge file name.
+    frs_name = "_".join(sorted([
+        f"{x}_{model_specs.inventories_of_interest[x]}"
+        for x in model_specs.inventories_of_interest.keys()
+    ]))
+    fingerprints.append(_file_fingerprint(
+        os.path.join(paths.local_path, "FRS_bridges", frs_name + ".csv")))
+    # NOTE: stewicombo shares the esupy data store with electricitylci.
+    combo_dir = os.path.join(os.path.dirname(paths.local_path), "stewicombo")
+    combo_name = model_specs.stewicombo_file or model_specs.model_name
+    if os.path.isdir(combo_dir):
+        fingerprints += [
+            _file_fingerprint(os.path.join(combo_dir, x))
+            for x in sorted(os.listdir(combo_dir)) if x.startswith(combo_name)
+        ]
+    # The EIA and CEMS data folders of each generation year (e.g., f923_2022).
+    for year in get_generation_years():
+        for folder in ["f923_%d", "eia860_%d", "epacems%d"]:
+            fingerprints += _folder_fingerprints(
+                os.path.join(paths.local_path, folder % year))
+
+    key = json.dumps(
+        {"version": elci_version, "specs": specs, "files": fingerprints},
+        sort_keys=True,
+        default=str
     )
-    source_list = list(np.unique(p_series))
-    if source_limit is not None:
-        if len(source_list) > source_limit:
-            result = [float("nan"), float("nan")]
-            return result
-        else:
-            source_list.sort()
-            source_list_string = "_".join(source_list)
-            result = [source_list, source_list_string]
-            return result
-    else:
-        source_list.sort()
-        # HOTFIX: rm redundant calls [2023-11-08; TWD]
-        source_list_string = "_".join(source_list)
-        result = [source_list, source_list_string]
-        return result
+    key = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
 
+    return os.path.join(
+        paths.local_path,
+        "generation_cache",
+        "%s_%s.parquet" % (model_specs.model_name, key)
+    )
 
-def _wtd_mean(pdser, total_db):
-    """The weighted mean method.
+
+def _prepare_for_aggregation(total_db):
+    """Prepare facility-level emissions for aggregation.
+
+    Replaces eGRID primary fuel categories (if requested), removes
+    mismatched inventories, and sums duplicated emissions; none of which
+    depend on the level of aggregation.
 
     Parameters
     ----------
-    pdser : pandas.Series
-        A pandas series of numerical values.
-        Examples include correlation and data quality values.
     total_db : pandas.DataFrame
-        A data frame with the same indices as the pandas series and
-        with a column, 'FlowAmount,' that represents the emission
-        amount used as the weighting factor (i.e., higher emissions
-        means more contribution towards the average).
+        Facility-level emissions as generated by create_generation_process_df
 
     Returns
     -------
-    float or nan
-        The flow-amount-weighted average of values.
+    pandas.DataFrame
+        The prepared facility-level emissions.
     """
-    # HOTFIX: averaging with NaNs in the array.
-    non_nans = pdser.values[~np.isnan(pdser.values)]
-    if len(non_nans) == 0:
-        logging.debug("Encountered a NaN array!")
-        result = float("nan")
-    else:
-        try:
-            wts = total_db.loc[
-                pdser[~np.isnan(pdser)].index, "FlowAmount"].values
-            result = np.average(non_nans, weights=wts)
-        except:
-            logging.debug(
-                f"Error calculating weighted mean for {pdser.name}-"
-                f"likely from 0 FlowAmounts"
-            )
-            try:
-                with np.errstate(all='raise'):
-                    result = np.average(non_nans)
-            except (ArithmeticError, ValueError, FloatingPointError):
-                result = float("nan")
+    from electricitylci.combinator import remove_mismatched_inventories
+
+    # Replace primary fuel categories based on EIA Form 923, if requested
+    if model_specs.replace_egrid:
+        total_db = replace_egrid(total_db, model_specs.eia_gen_year)
+
+    # USEPA Issue #282. After replacing primary fuel categories with EIA data,
+    # in rare instances there will be renewable O&M emissions assigned to plants
+    # of conflicting fuel types - like solar O&M emissions assigned to coal
+    # plants. This should filter those out, along with remove mismatched
+    # construction inputs.
+    total_db = remove_mismatched_inventories(total_db)
+    # Use a dummy UUID to avoid groupby errors
+    total_db["FlowUUID"] = total_db["FlowUUID"].fillna(value="dummy-uuid")
+
+    # Aggregate multiple emissions of the same type
+    logging.info("Aggregating multiples of plant emissions")
+    sz_tdb = len(total_db)
+    total_db = aggregate_facility_flows(total_db)
+    logging.debug("Reduce data from %d to %d rows" % (sz_tdb, len(total_db)))
+
+    return total_db
+
+
+def _read_generation_cache(cache_path):
+    """Read a facility-level inventory checkpoint.
+
+    Parameters
+    ----------
+    cache_path : str
+        A Parquet file path (see :func:`_generation_cache_path`).
+
+    Returns
+    -------
+    pandas.DataFrame or NoneType
+        The facility-level inventory; or NoneType if the checkpoint does not
+        exist or could not be read.
+    """
+    if not os.path.isfile(cache_path):
+        return None
+    try:
+        df = pd.read_parquet(cache_path)
+    except Exception as e:
+        logging.warning(
+            "Failed to read generation checkpoint, %s (%s)" % (cache_path, e))
+        return None
+    logging.info("Read facility-level inventory from %s" % cache_path)
+    return df
+
+
+def _source_masks(db, keys, source_bits):
+    """Find the combination of data sources reported for each group.
+
+    Parameters
+    ----------
+    db : pandas.DataFrame
+        Facility-level inventory with a 'Source' column.
+    keys : list
+        The column names to group by.
+    source_bits : pandas.Series
+        The bit flag (int) for each data source name (index).
+
+    Returns
+    -------
+    numpy.ndarray
+        The bitwise-or of the source flags in each row's group (int64);
+        zero for rows with missing group keys.
+    """
+    row_bits = db["Source"].astype(object).map(source_bits).fillna(0)
+    row_bits = row_bits.values.astype("int64")
+    # NOTE: rows with missing keys are not grouped (NaN group number)
+    group_ids = db.groupby(keys, observed=True, sort=False).ngroup()
+    group_ids = group_ids.fillna(-1).values.astype("int64")
+    is_valid = group_ids >= 0
+    group_masks = np.zeros(group_ids.max(initial=-1) + 1, dtype="int64")
+    np.bitwise_or.at(group_masks, group_ids[is_valid], row_bits[is_valid])
+
+    return np.where(is_valid, group_masks[group_ids.clip(0)], 0)
+
+
+def _write_generation_cache(df, cache_path):
+    """Write a facility-level inventory checkpoint.
+
+    Replaces other checkpoints for the same model, which are out of date.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The facility-level inventory (see
+        :func:`create_generation_process_df`).
+    cache_path : str
+        A Parquet file path (see :func:`_generation_cache_path`).
+    """
+    cache_dir = os.path.dirname(cache_path)
+    check_output_dir(cache_dir)
+    try:
+        df.to_parquet(cache_path)
+    except Exception as e:
+        logging.warning(
+            "Failed to write generation checkpoint, %s (%s)" % (cache_path, e))
+        return
+    logging.info("Wrote facility-level inventory to %s" % cache_path)
+
+    clear_generation_cache(keep=cache_path)
+
+
+def _wtd_mean_by_group(df, groupby_cols, value_cols, weight_col="FlowAmount"):
+    """The weighted mean method, vectorized across groups and columns.
+
+    Computes the flow-amount weighted mean (i.e., higher emissions means
+    more contribution towards the average) for every group and every value
+    column in one grouped reduction. Values that are NaN (and their
+    weights) are masked out of the sums; groups with no values are NaN;
+    groups whose masked weights sum to zero (e.g., from zero flow amounts)
+    fall back to the unweighted mean; and a NaN weight paired with a valid
+    value makes the result NaN.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        A data frame with the group, value, and weight columns.
+    groupby_cols : list
+        The column names that define the groups.
+    value_cols : list
+        The numeric column names to be averaged (e.g., DQI scores).
+    weight_col : str, optional
+        The column used as the weighting factor, by default "FlowAmount".
+
+    Returns
+    -------
+    pandas.DataFrame
+        A data frame indexed by the (sorted) group keys with one column of
+        weighted means for each column in ``value_cols``.
+    """
+    wts = df[weight_col].to_numpy(dtype=float)
+    wts_nan = np.isnan(wts)
+    sums = df[groupby_cols].copy()
+    for col in value_cols:
+        vals = df[col].to_numpy(dtype=float)
+        has_val = ~np.isnan(vals)
+        # Zero out masked rows so they do not contribute to the group sums.
+        with np.errstate(invalid='ignore'):
+            sums[col + "_wv"] = np.where(has_val, wts*vals, 0.0)
+        sums[col + "_w"] = np.where(has_val & ~wts_nan, wts, 0.0)
+        sums[col + "_v"] = np.where(has_val, vals, 0.0)
+        sums[col + "_n"] = has_val.astype(int)
+        sums[col + "_nan_w"] = (has_val & wts_nan).astype(int)
+    sums = sums.groupby(groupby_cols, observed=True).sum()
+
+    result = pd.DataFrame(index=sums.index)
+    for col in value_cols:
+        w_sum = sums[col + "_w"].to_numpy()
+        count = sums[col + "_n"].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wtd = sums[col + "_wv"].to_numpy() / w_sum
+            unwtd = sums[col + "_v"].to_numpy() / count
+        vals = np.where(w_sum != 0, wtd, unwtd)
+        vals[count == 0] = np.nan
+        vals[sums[col + "_nan_w"].to_numpy() > 0] = np.nan
+        result[col] = vals
+
     return result
 
 
@@ -290,7 +832,8 @@ def add_data_collection_score(db, elec_df, subregion="BA"):
         how="left",
     )
     reduced_db = db.drop_duplicates(subset=groupby_cols + ["eGRID_ID"])
-    region_elec = reduced_db.groupby(groupby_cols, as_index=False)[
+    region_elec = reduced_db.groupby(
+        groupby_cols, as_index=False, observed=True)[
         "Electricity"
     ].sum()
     region_elec.rename(
@@ -390,221 +933,99 @@ def aggregate_data(total_db, subregion="BA"):
     2.  The DQI for DataCollection is negative where emission factor is
         negative, which does not make sense for a DQI.
 
-    Parameters
-    ----------
-    total_db : pandas.DataFrame
-        Facility-level emissions as generated by create_generation_process_df
-    subregion : str, optional
-        The level of subregion that the data will be aggregated to. Choices
-        are 'all', 'NERC', 'BA', 'US', by default 'BA'.
-
-    Returns
-    -------
-    pandas.DataFrame
-        The dataframe provides emissions aggregated to the specified
-        subregion for each technology and stage found in the input data.
-        In addition to the aggregated emissions (FlowAmount), the output
-        dataframe also contains a facility count (i.e., the number of
-        individual facilities contributing to a given emission) and an
-        average emission factor with units of emissions in units (Unit)
-        per MWh of total electricity generation within the given region
-        and for the specified fuel type. Regions that have no net
-        electricity generation (i.e., electricity_sum == 0), are assigned
-        a zero emission factor, even if there are positive flow amounts.
-
-        Computed columns include:
-
-        - 'source_string' (str): underscore-delimited data sources
-        - 'TemporalCorrelation' (float): DQI weighted value between 1-5
-        - 'TechnologicalCorrelation' (float): DQI weighted value between 1-5
-        - 'GeographicalCorrelation' (float): DQI weighted value between 1-5
-        - 'DataCollection' (float): DQI weighted value between 1-5
-        - 'DataReliability' (float): DQI weighted value between 1-5
-        - 'uncertaintyMin' (float): min of facility-level emission factor
-        - 'uncertaintyMax' (float): max of facility-level emission factor
-        - 'uncertaintySigma' (float): standard deviation of flow amounts
-        - 'electricity_sum' (float): aggregated electricity gen (MWh)
-        - 'electricity_mean' (float): mean electricity gen (MWh)
-        - 'facility_count' (float): count of facilities for electricity stats
-        - 'Emission_factor' (float): emission amount per MWh
-        - 'GeomMean' (float): geometric mean of emission factor (units/MWh)
-        - 'GeomSD' (float): geometric standard deviation of emission factor
-    """
-    from electricitylci.combinator import remove_mismatched_inventories
-    region_agg = subregion_col(subregion)
-    fuel_agg = ["FuelCategory"]
-    if region_agg:
-        groupby_cols = (
-            region_agg
-            + fuel_agg
-            + ["stage_code", "FlowName", "Compartment", "FlowUUID", "Unit"]
-        )
-        # NOTE: datatypes should be str, str, int, str
-        elec_df_groupby_cols = (
-            region_agg + fuel_agg + ["Year", "source_string"]
-        )
-    else:
-        groupby_cols = fuel_agg + [
-            "stage_code",
-            "FlowName",
-            "Compartment",
-            "FlowUUID",
-            "Unit"
-        ]
-        # NOTE: datatypes should be str, int, str
-        elec_df_groupby_cols = fuel_agg + ["Year", "source_string"]
-
-    # Replace primary fuel categories based on EIA Form 923, if requested
-    if model_specs.replace_egrid:
-        total_db = replace_egrid(total_db, model_specs.eia_gen_year)
-
-    # USEPA Issue #282. After replacing primary fuel categories with EIA data,
-    # in rare instances there will be renewable O&M emissions assigned to plants
-    # of conflicting fuel types - like solar O&M emissions assigned to coal
-    # plants. This should filter those out, along with remove mismatched
-    # construction inputs.
-    total_db = remove_mismatched_inventories(total_db)
-    # Use a dummy UUID to avoid groupby errors
-    total_db["FlowUUID"] = total_db["FlowUUID"].fillna(value="dummy-uuid")
-
-    # Aggregate multiple emissions of the same type
-    logging.info("Aggregating multiples of plant emissions")
-    sz_tdb = len(total_db)
-    total_db = aggregate_facility_flows(total_db)
-    logging.debug("Reduce data from %d to %d rows" % (sz_tdb, len(total_db)))
-
-    # Calculate electricity totals by region and source
-    total_db, electricity_df = calculate_electricity_by_source(
-        total_db, subregion
-    )
-
-    # Assign data score based on percent generation
-    total_db = add_data_collection_score(total_db, electricity_df, subregion)
-
-    # Calculate the facility-level emission factor (E/MWh)
-    # HOTFIX ZeroDivisionError [2024-05-14; TWD]
-    crit_zero = total_db["Electricity"] != 0
-    total_db.loc[crit_zero, "facility_emission_factor"] = (
-        total_db.loc[crit_zero, "FlowAmount"]
-        / total_db.loc[crit_zero, "Electricity"]
-    )
-    # Effectively removes rows with zero Electricity or nan flow amounts.
-    #  For 2016 generation, it's all caused by nans in flow amounts.
-    #  For 2020 generation, it's all zero electricity.
-    #  For 2022 generation, it's a mixed bag.
-    total_db.dropna(subset=["facility_emission_factor"], inplace=True)
-
-    # Define the weighted mean function, which relies on the full database
-    # for flow amounts (i.e., the flow-amount weighted method)
-    wm = lambda x: _wtd_mean(x, total_db)
+    Parameters
+    ----------
+    total_db : pandas.DataFrame
+        Facility-level emissions as generated by create_generation_process_df
+    subregion : str, optional
+        The level of subregion that the data will be aggregated to. Choices
+        are 'all', 'NERC', 'BA', 'US', by default 'BA'.
 
-    info_txt = "Aggregating flow amounts and dqi information"
-    if model_specs.calculate_uncertainty:
-        info_txt += ", calculating uncertainty"
-    logging.info(info_txt)
+    Returns
+    -------
+    pandas.DataFrame
+        The dataframe provides emissions aggregated to the specified
+        subregion for each technology and stage found in the input data.
+        In addition to the aggregated emissions (FlowAmount), the output
+        dataframe also contains a facility count (i.e., the number of
+        individual facilities contributing to a given emission) and an
+        average emission factor with units of emissions in units (Unit)
+        per MWh of total electricity generation within the given region
+        and for the specified fuel type. Regions that have no net
+        electricity generation (i.e., electricity_sum == 0), are assigned
+        a zero emission factor, even if there are positive flow amounts.
 
-    # BUG: Getting occasional ValueError, zero-size array reduction operation
-    # minimum which has no identity; likely due to an empty group.
-    # Consider iterating over groups, checking their size, and concatenating
-    # the results.
-    database_f3 = total_db.groupby(
-        groupby_cols + ["Year", "source_string"], as_index=False
-    ).agg({
-        "FlowAmount": ["sum", "count"],
-        "TemporalCorrelation": wm,
-        "TechnologicalCorrelation": wm,
-        "GeographicalCorrelation": wm,
-        "DataCollection": wm,
-        "DataReliability": wm,
-        "facility_emission_factor": ["min", "max", _calc_sigma],
-    })
+        Computed columns include:
 
-    # Reset and define new column names
-    database_f3.columns = groupby_cols + [
-        "Year",
-        "source_string",
-        "FlowAmount",
-        "FlowAmountCount",
-        "TemporalCorrelation",
-        "TechnologicalCorrelation",
-        "GeographicalCorrelation",
-        "DataCollection",
-        "DataReliability",
-        "uncertaintyMin",
-        "uncertaintyMax",
-        "uncertaintySigma",
-    ]
+        - 'source_string' (str): underscore-delimited data sources
+        - 'TemporalCorrelation' (float): DQI weighted value between 1-5
+        - 'TechnologicalCorrelation' (float): DQI weighted value between 1-5
+        - 'GeographicalCorrelation' (float): DQI weighted value between 1-5
+        - 'DataCollection' (float): DQI weighted value between 1-5
+        - 'DataReliability' (float): DQI weighted value between 1-5
+        - 'uncertaintyMin' (float): min of facility-level emission factor
+        - 'uncertaintyMax' (float): max of facility-level emission factor
+        - 'uncertaintySigma' (float): standard deviation of flow amounts
+        - 'electricity_sum' (float): aggregated electricity gen (MWh)
+        - 'electricity_mean' (float): mean electricity gen (MWh)
+        - 'facility_count' (float): count of facilities for electricity stats
+        - 'Emission_factor' (float): emission amount per MWh
+        - 'GeomMean' (float): geometric mean of emission factor (units/MWh)
+        - 'GeomSD' (float): geometric standard deviation of emission factor
+    """
+    total_db = _prepare_for_aggregation(total_db)
 
-    logging.info("Removing uncertainty from input flows")
-    criteria = database_f3["Compartment"] == "input"
-    database_f3.loc[criteria, "uncertaintySigma"] = None
+    return _aggregate_subregion(total_db, subregion)
 
-    # Merge electricity_sum, electricity_mean, and facility_count data
-    # HOTFIX: 'Year' must be integer in both dataframes [2023-12-18; TWD]
-    electricity_df['Year'] = electricity_df['Year'].astype(int)
-    database_f3['Year'] = database_f3['Year'].astype(int)
-    database_f3 = database_f3.merge(
-        right=electricity_df,
-        on=elec_df_groupby_cols,
-        how="left"
-    )
 
-    # Fix Canada by importing 'Electricity' whilst maintaining the indexes
-    logging.info("Fixing Canadian electricity amounts")
-    canadian_criteria = database_f3["FuelCategory"] == "ALL"
-    if region_agg:
-        canada_db = pd.merge(
-            left=database_f3.loc[canadian_criteria, :],
-            right=total_db[groupby_cols + ["Electricity","DataReliability"]],
-            left_on=groupby_cols,
-            right_on=groupby_cols,
-            how="left",
-        ).drop_duplicates(subset=groupby_cols)
-    else:
-        total_grouped = total_db.groupby(
-            by=groupby_cols+["DataReliability"], as_index=False)["Electricity"].sum()
-        canada_db = pd.merge(
-            left=database_f3.loc[canadian_criteria, :],
-            right=total_grouped,
-            left_on=groupby_cols,
-            right_on=groupby_cols,
-            how="left",
-        )
+def aggregate_data_levels(total_db, subregions=("BA", "FERC", "EIA", "US")):
+    """Aggregate facility-level emissions to several subregions at once.
 
-    # Reverse the dummy UUID assignment
-    database_f3.loc[
-        database_f3["FlowUUID"] == "dummy-uuid", "FlowUUID"
-    ] = float("nan")
+    The aggregation-independent steps (i.e., primary fuel replacement,
+    mismatched inventory removal, the summing of duplicated emissions, and
+    the facility source index) are run once and shared across the levels,
+    rather than repeated for each level with :func:`aggregate_data`. Each
+    level is then grouped separately, with the same emission factor,
+    uncertainty, and DQI calculations as those of :func:`aggregate_data`.
 
-    # Create emission factors, adjust accordingly for for Canadian BA's
-    logging.info("Creating emission factors")
-    canada_db.index = database_f3.loc[canadian_criteria, :].index
-    database_f3.loc[canada_db.index, "electricity_sum"] = canada_db[
-        "Electricity"
-    ]
-    # HOTFIX: Address ZeroDivideError [2023-12-18; TWD]
-    # NOTE: Set to zero because the units are per net generation;
-    #       the `fix_val` is used to search for replacements (there are
-    #       no known electricity_sum values less than 0.01, except for
-    #       those that are 0).
-    fix_val = 1e-4
-    database_f3.loc[
-        database_f3['electricity_sum'] == 0, 'electricity_sum'] += fix_val
-    database_f3["Emission_factor"] = (
-        database_f3["FlowAmount"] / database_f3["electricity_sum"]
-    )
-    database_f3.loc[
-        database_f3['electricity_sum'] == fix_val, 'Emission_factor'] = 0
+    Notes
+    -----
+    The model run aggregates the facility-level emissions to one level
+    (see ``get_generation_process_df``); for FERC and U.S. aggregation, the
+    generation processes are made at the BA level and the consumption mixes
+    are made from BA-level trade. This method is for users who need more
+    than one level of aggregated emissions (e.g., for comparisons).
 
-    # Calculate the log-normal parameters for uncertainty; see Hawkins-Young
-    # https://github.com/USEPA/ElectricityLCI/discussions/240
-    database_f3["GeomMean"], database_f3["GeomSD"] = zip(
-        *database_f3[["Emission_factor", "uncertaintySigma"]].apply(
-            _calc_geom_params, axis=1
-    ))
-    database_f3.sort_values(by=groupby_cols, inplace=True)
+    Parameters
+    ----------
+    total_db : pandas.DataFrame
+        Facility-level emissions as generated by create_generation_process_df
+    subregions : list or tuple, optional
+        The levels of subregion to aggregate to (e.g., 'BA', 'FERC', 'EIA',
+        and 'US'), by default ("BA", "FERC", "EIA", "US").
 
-    return database_f3
+    Returns
+    -------
+    dict
+        Aggregated emissions data frames (values) for each subregion (keys).
+        See :func:`aggregate_data` for data frame columns.
+
+    Examples
+    --------
+    >>> plant_df = create_generation_process_df()
+    >>> agg_dict = aggregate_data_levels(plant_df, ["BA", "US"])
+    >>> ba_df = agg_dict["BA"]
+    """
+    total_db = _prepare_for_aggregation(total_db)
+    source_index = build_source_index(total_db)
+
+    agg_dict = {}
+    for subregion in subregions:
+        logging.info("Aggregating to subregion - %s" % subregion)
+        agg_dict[subregion] = _aggregate_subregion(
+            total_db, subregion, source_index)
+
+    return agg_dict
 
 
 def aggregate_facility_flows(df):
@@ -615,8 +1036,9 @@ def aggregate_facility_flows(df):
     then those show up as separate emissions in the inventory and artificially
     inflate the number of emissions for uncertainty calculations.
 
-    This method sums all duplicated emissions together (taking the average of
-    their data quality indicators).
+    This method sums all duplicated emissions together (taking the flow-weighted
+    average of their data reliability scores). The other columns are taken
+    from the first of the duplicated rows.
 
     Parameters
     ----------
@@ -659,40 +1081,106 @@ def aggregate_facility_flows(df):
             "FacilityID in dataframe"
         )
 
-    wm = lambda x: _wtd_mean(x, df)
     emissions = df["Compartment"].isin(emission_compartments)
     df_emissions = df[emissions]
     df_nonemissions = df[~emissions]
-    df_dupes = df_emissions.duplicated(subset=groupby_cols, keep=False)
-    df_red = df_emissions.drop(df_emissions[df_dupes].index)
-    group_db = df_emissions.loc[df_dupes, :].groupby(
-        groupby_cols, as_index=False
-    ).agg({
-        "FlowAmount": "sum",
-        "DataReliability": wm
+
+    # Number each group of duplicated emissions (in order of appearance),
+    # then reduce all groups at once; rows with NaN keys are kept.
+    group_ids = df_emissions.groupby(
+        groupby_cols, sort=False, dropna=False, observed=True).ngroup()
+    group_ids = group_ids.to_numpy()
+    _, first_rows = np.unique(group_ids, return_index=True)
+    group_sizes = np.bincount(group_ids)
+    is_dupe = group_sizes > 1
+
+    sums = pd.DataFrame({
+        "group_id": group_ids,
+        "FlowAmount": df_emissions["FlowAmount"].to_numpy(dtype=float),
+        "DataReliability": df_emissions["DataReliability"].to_numpy(
+            dtype=float),
     })
+    flow_sum = sums.groupby("group_id")["FlowAmount"].sum().to_numpy()
+    flow_rel = _wtd_mean_by_group(
+        sums, ["group_id"], ["DataReliability"])["DataReliability"].to_numpy()
 
-    group_db_merge = group_db.merge(
-        right=df_emissions.drop_duplicates(subset=groupby_cols),
-        on=groupby_cols,
-        how="left",
-        suffixes=("", "_right"),
-    )
-    try:
-        delete_cols = ["FlowAmount_right", "DataReliability_right"]
-        group_db_merge.drop(columns=delete_cols, inplace=True)
-    except KeyError:
-        logging.debug("Failed to drop columns.")
-        pass
-    df = pd.concat(
-        [df_nonemissions, df_red, group_db_merge],
-        ignore_index=True
+    # Keep the first row of each group, updating only the duplicates
+    df_red = df_emissions.iloc[first_rows].copy()
+    df_red["FlowAmount"] = np.where(
+        is_dupe, flow_sum, df_red["FlowAmount"].to_numpy())
+    df_red["DataReliability"] = np.where(
+        is_dupe, flow_rel, df_red["DataReliability"].to_numpy())
+
+    logging.info(
+        "Collapsed %d duplicated emissions into %d rows (%d to %d rows; "
+        "frame size %.1f to %.1f MB)" % (
+            group_sizes[is_dupe].sum(),
+            is_dupe.sum(),
+            len(df),
+            len(df_nonemissions) + len(df_red),
+            df.memory_usage(deep=True).sum()/1e6,
+            (df_nonemissions.memory_usage(deep=True).sum()
+             + df_red.memory_usage(deep=True).sum())/1e6,
+        )
     )
+    df = pd.concat([df_nonemissions, df_red], ignore_index=True)
 
     return df
 
 
-def calculate_electricity_by_source(db, subregion="BA"):
+def build_source_index(db):
+    """Index the data sources reported by each facility.
+
+    The index holds one row per facility, fuel category, and year with
+    its electricity generation, region columns, and a bitmask of the data
+    sources (e.g., eGRID, NEI, TRI) found in its emissions. It does not
+    depend on the regional aggregation, so it may be built once and
+    reused across aggregation levels (see
+    :func:`calculate_electricity_by_source`).
+
+    Parameters
+    ----------
+    db : pandas.DataFrame
+        Dataframe containing facility-level emissions as generated by
+        create_generation_process_df.
+
+    Returns
+    -------
+    tuple
+        pandas.Series :
+            The bit flag (int) for each source name (index), sorted by name.
+        pandas.DataFrame :
+            The facility index with columns 'eGRID_ID', 'FuelCategory',
+            'Year', 'Electricity', 'source_mask', and any region columns
+            found in the inventory (e.g., 'Balancing Authority Name').
+    """
+    sources = sorted(db["Source"].dropna().astype(str).unique())
+    if len(sources) > 62:
+        raise ValueError(
+            "Too many data sources (%d) for a source bitmask" % len(sources))
+    source_bits = pd.Series(
+        [1 << i for i in range(len(sources))], index=sources, dtype="int64")
+
+    fac_cols = ["FuelCategory", "eGRID_ID", "Year"]
+    region_cols = [
+        "Subregion",
+        "NERC",
+        "Balancing Authority Name",
+        "FERC_Region",
+        "EIA_Region",
+    ]
+    region_cols = [x for x in region_cols if x in db.columns]
+
+    # Keep the first row of each facility, as drop_duplicates would.
+    fac_df = db[fac_cols + region_cols + ["Electricity"]].copy()
+    fac_df["source_mask"] = _source_masks(db, fac_cols, source_bits)
+    fac_df = fac_df.drop_duplicates(subset=fac_cols)
+    fac_df = fac_df.loc[fac_df["source_mask"] != 0].reset_index(drop=True)
+
+    return source_bits, fac_df
+
+
+def calculate_electricity_by_source(db, subregion="BA", source_index=None):
     """Calculate the electricity totals by region and source.
 
     This method uses the same approach as the original generation.py with
@@ -704,6 +1192,10 @@ def calculate_electricity_by_source(db, subregion="BA"):
     TRI then the denominator will be all production from plants that reported
     into NEI or TRI for that subregion.
 
+    The source combinations are found with bitmasks (see
+    :func:`build_source_index`), such that each source string is matched
+    to its facilities by a single bitwise-and.
+
     Parameters
     ----------
     db : pandas.DataFrame
@@ -712,6 +1204,10 @@ def calculate_electricity_by_source(db, subregion="BA"):
     subregion : str, optional
         The level of subregion that the data will be aggregated to. Choices
         are 'all', 'NERC', 'BA', 'US', by default 'BA'
+    source_index : tuple, optional
+        The source index of `db` from :func:`build_source_index`; for
+        reuse across aggregation levels. Defaults to None (i.e., the index
+        is built from `db`).
 
     Returns
     -------
@@ -722,7 +1218,11 @@ def calculate_electricity_by_source(db, subregion="BA"):
             The calculation of average and total electricity for each source
             along with the facility count for each source.
     """
-    all_sources = '_'.join(sorted(list(db["Source"].unique())))
+    if source_index is None:
+        source_index = build_source_index(db)
+    source_bits, fac_df = source_index
+    source_names = np.array(source_bits.index, dtype=object)
+    all_sources = '_'.join(source_names)
 
     # HOTFIX: not separating the data frame in hopes of generating electricity
     # amounts for fuel inputs that doesn't make the plants "too efficient"
@@ -749,101 +1249,70 @@ def calculate_electricity_by_source(db, subregion="BA"):
         elec_groupby_cols = fuel_agg + ["Year"]
 
     # HOTFIX: add check for empty power plant data frame [2023-12-19; TWD]
+    src_masks = {all_sources: int(source_bits.sum())}
     if len(db_powerplant) == 0:
         db_cols = list(db_powerplant.columns) + ['source_list', 'source_string']
         db_powerplant = pd.DataFrame(columns=db_cols)
     else:
-        # This is a pretty expensive process when we have to start looking
-        # at each flow generated in each compartment for each balancing
-        # authority area. To hopefully speed this up, we'll group by FlowName
-        # and Compartment and look and try to eliminate flows where all
-        # sources are single entities.
-        combine_source_by_flow = lambda x: _combine_sources(
-            x, db, ["FlowName", "Compartment"], 1
-        )
-        # Find all single-source flows (all multiple sources are nans)
-        source_df = pd.DataFrame(
-            db_powerplant.groupby(["FlowName", "Compartment"])[
-                ["Source"]].apply(combine_source_by_flow),
-            columns=["source_list"],
-        )
-        source_df[["source_list", "source_string"]] = pd.DataFrame(
-            source_df["source_list"].values.tolist(),
-            index=source_df.index
-        )
-        source_df.reset_index(inplace=True)
-        old_index = db_powerplant.index
-        db_powerplant = db_powerplant.merge(
-            right=source_df,
-            left_on=["FlowName", "Compartment"],
-            right_on=["FlowName", "Compartment"],
-            how="left",
-        )
-        db_powerplant.index = old_index
-
-        # Filter out single flows; leaving only multi-flows
-        db_multiple_sources = db_powerplant.loc[
-            db_powerplant["source_string"].isna(), :].copy()
-        if len(db_multiple_sources) > 0:
-            combine_source_lambda = lambda x: _combine_sources(
-                x, db_multiple_sources, groupby_cols
-            )
-            # HOTFIX: it doesn't make sense to groupby a different group;
-            # it gives different results from the first-pass filter;
-            # changed to match criteria above. [2023-12-19; TWD]
-            # HOTFIX undone [2024-08-13; MBJ]
-            source_df = pd.DataFrame(
-                db_multiple_sources.groupby(groupby_cols)[
-                    ["Source"]].apply(combine_source_lambda),
-                columns=["source_list"],
-            )
-            source_df[["source_list", "source_string"]] = pd.DataFrame(
-                source_df["source_list"].values.tolist(),
-                index=source_df.index
-            )
-            source_df.reset_index(inplace=True)
-            db_multiple_sources.drop(
-                columns=["source_list", "source_string"], inplace=True
-            )
-            old_index = db_multiple_sources.index
-            db_multiple_sources = db_multiple_sources.merge(
-                right=source_df,
-                left_on=groupby_cols,
-                right_on=groupby_cols,
-                how="left",
-            )
-            db_multiple_sources.index = old_index
-            db_powerplant.loc[
-                db_powerplant["source_string"].isna(),
-                ["source_string", "source_list"]
-            ] = db_multiple_sources[["source_string", "source_list"]]
+        # Group by FlowName and Compartment to find flows where all sources
+        # are single entities; only the remaining multi-source flows are
+        # grouped by the full set of aggregation columns.
+        masks = _source_masks(
+            db_powerplant, ["FlowName", "Compartment"], source_bits)
+        is_multi = (masks & (masks - 1)) != 0
+        if is_multi.any():
+            masks[is_multi] = _source_masks(
+                db_powerplant.loc[is_multi], groupby_cols, source_bits)
+
+        # Translate each unique mask to its source list and string
+        u_masks, u_idx = np.unique(masks, return_inverse=True)
+        u_lists = np.empty(len(u_masks), dtype=object)
+        u_strings = np.empty(len(u_masks), dtype=object)
+        for i, m in enumerate(u_masks):
+            if m == 0:
+                u_lists[i] = float("nan")
+                u_strings[i] = float("nan")
+            else:
+                u_lists[i] = list(source_names[
+                    (int(m) & source_bits.values) != 0])
+                u_strings[i] = "_".join(u_lists[i])
+        db_powerplant["source_list"] = u_lists[u_idx]
+        db_powerplant["source_string"] = u_strings[u_idx]
+        src_masks.update(zip(u_strings, u_masks))
+
     unique_source_lists = list(db_powerplant["source_string"].unique())
     unique_source_lists = [x for x in unique_source_lists if str(x) != "nan"]
     unique_source_lists += [all_sources]
+
+    # Sum the facility generation for each region, fuel, year, and source
+    # combination once; each source string then selects its combinations.
     # One set of emissions passed into this routine may be life cycle emissions
     # used as proxies for Canadian generation. In those cases the electricity
     # generation will be equal to the Electricity already in the dataframe.
+    # NOTE: the mean is over facilities with generation data (i.e.,
+    # non-null Electricity), whereas the facility count is over all.
+    mask_sums = fac_df.groupby(
+        elec_groupby_cols + ["source_mask"], observed=True).agg(
+        electricity_sum=("Electricity", "sum"),
+        electricity_count=("Electricity", "count"),
+        facility_count=("eGRID_ID", "count"),
+    ).reset_index()
     elec_sum_lists = list()
     for src in unique_source_lists:
         logging.info(f"Calculating electricity for {src}")
-        db["temp_src"] = src
-        src_filter = [
-            a in b
-            for a, b in zip(
-                db["Source"].values.tolist(), db["temp_src"].values.tolist()
-            )
-        ]
-        sub_db = db.loc[src_filter, :].copy()
-        sub_db.drop_duplicates(subset=fuel_agg + ["eGRID_ID","Year"], inplace=True)
-        # HOTFIX: fix pandas futurewarning syntax [2024-03-08; TWD]
-        sub_db_group = sub_db.groupby(elec_groupby_cols, as_index=False).agg(
-            {"Electricity": ["sum", "mean"], "eGRID_ID": "count"}
-        )
-        sub_db_group.columns = elec_groupby_cols + [
-            "electricity_sum",
+        sub_db_group = mask_sums.loc[
+            (mask_sums["source_mask"].values & src_masks[src]) != 0
+        ].groupby(elec_groupby_cols, as_index=False, observed=True).agg({
+            "electricity_sum": "sum",
+            "electricity_count": "sum",
+            "facility_count": "sum",
+        })
+        sub_db_group.insert(
+            len(elec_groupby_cols) + 1,
             "electricity_mean",
-            "facility_count",
-        ]
+            sub_db_group["electricity_sum"]
+            / sub_db_group.pop("electricity_count").replace(0, np.nan)
+        )
         sub_db_group["source_string"] = src
         elec_sum_lists.append(sub_db_group)
     elec_sums = pd.concat(elec_sum_lists, ignore_index=True)
@@ -853,13 +1322,49 @@ def calculate_electricity_by_source(db, subregion="BA"):
     return db, elec_sums
 
 
-def create_generation_process_df():
+def clear_generation_cache(keep=None):
+    """Delete the facility-level inventory checkpoints of the current model.
+
+    Use this (or the `refresh_cache` parameter of
+    :func:`create_generation_process_df`) to force the inventory to be
+    rebuilt from its sources.
+
+    Parameters
+    ----------
+    keep : str, optional
+        A checkpoint file path not to be deleted, by default None.
+    """
+    cache_dir = os.path.join(paths.local_path, "generation_cache")
+    if not os.path.isdir(cache_dir):
+        return
+    for f_name in os.listdir(cache_dir):
+        f_path = os.path.join(cache_dir, f_name)
+        is_model = f_name.startswith(model_specs.model_name + "_")
+        if is_model and f_name.endswith(".parquet") and f_path != keep:
+            logging.info("Removing generation checkpoint, %s" % f_name)
+            os.remove(f_path)
+
+
+def create_generation_process_df(refresh_cache=None):
     """Read emissions and generation data from different sources to provide
     facility-level emissions. Most important inputs to this process come
     from the model configuration file.
 
     Maps balancing authorities to FERC and EIA regions.
 
+    If the model config parameter, 'cache_generation_inventory', is true,
+    the facility-level emissions are saved to a Parquet checkpoint in the
+    data store and are read from there on subsequent runs, so long as the
+    model specs and input files are unchanged (see
+    :func:`_generation_cache_path`).
+
+    Parameters
+    ----------
+    refresh_cache : bool, optional
+        Whether to ignore an existing checkpoint and rebuild the
+        facility-level emissions from their sources. Defaults to the model
+        config parameter, 'refresh_generation_cache'.
+
     Returns
     ----------
     pandas.DataFrame
@@ -867,6 +1372,17 @@ def create_generation_process_df():
     """
     from electricitylci.combinator import BA_CODES
 
+    if refresh_cache is None:
+        refresh_cache = model_specs.refresh_generation_cache
+
+    cache_path = None
+    if model_specs.cache_generation_inventory:
+        cache_path = _generation_cache_path()
+        if not refresh_cache:
+            final_database = _read_generation_cache(cache_path)
+            if final_database is not None:
+                return final_database
+
     COMPARTMENT_DICT = {
         "emission/air": "air",
         "emission/water": "water",
@@ -1148,6 +1664,15 @@ def create_generation_process_df():
     final_database = edits.check_for_edits(
         final_database, "generation.py", "create_generation_process_df")
 
+    # Reduce the memory of the facility-level inventory
+    final_database = set_inventory_dtypes(final_database)
+
+    if cache_path is not None:
+        # Re-key the checkpoint; the EIA and CEMS input files may have been
+        # downloaded while building the inventory.
+        cache_path = _generation_cache_path()
+        _write_generation_cache(final_database, cache_path)
+
     return final_database
 
 
@@ -1364,40 +1889,73 @@ def hawkins_young_sigma(data, alpha):
       y_hat is the expected value.
     """
     # Note that there is no assumed log-normal distribution here.
+    data = np.asarray(data)
+    (is_error, sigma) = hawkins_young_sigma_batch(
+        [len(data)], [np.std(data)], [data.mean()], alpha)
+
+    return (bool(is_error[0]), sigma[0])
+
+
+def hawkins_young_sigma_batch(n, std, mean, alpha=0.9):
+    """Model log-normal uncertainty distributions for many datasets at once.
+
+    The vectorized counterpart of :func:`hawkins_young_sigma`, which takes
+    the summary statistics of each dataset (e.g., of each aggregated flow
+    group) rather than the data themselves.
+
+    Parameters
+    ----------
+    n : numpy.array
+        The sample size of each dataset.
+    std : numpy.array
+        The (population) standard deviation of each dataset (i.e., ddof=0).
+    mean : numpy.array
+        The mean of each dataset.
+    alpha : float, optional
+        The confidence level, expressed as a fraction, by default 0.9.
+
+    Returns
+    -------
+    tuple
+        A tuple of length two: an array of error booleans and an array of
+        sigma values (the standard deviation of the normally distributed
+        values of Y = log(X)).
+
+    Notes
+    -----
+    The model in :func:`hawkins_young` is the quadratic,
+    :math:`0.5 x^2 - sqrt(2) erfinv(alpha) x + ln(1 + ciu) = 0`, which is
+    solved here in closed form rather than by least-squares fitting from
+    random starting points. The smallest positive root is returned:
+
+    -   for ciu > 0, both roots are positive and the smaller one is taken;
+    -   for ciu <= 0, only the larger root is positive (for ciu = 0, the
+        other root is zero); and
+    -   where there is no real root (i.e., large ciu), the vertex of the
+        quadratic is returned, which is where the least-squares residual
+        is minimized.
+    """
     # HOTFIX nans in z and ciu calcs [2024-05-14; TWD]
-    is_error = True
-    n = len(data)
-    z = 0.0
-    if n > 1:
-        is_error = False
-        z = t.ppf(q=alpha, df=n-1)
-    se = np.std(data)/np.sqrt(n)
-    y_hat = data.mean()
-    ciu = 0.0
-    if y_hat != 0:
-        ciu = se*np.sqrt(1 + 1/n)*z/y_hat
-    if ciu <= -1:
-        is_error = True
-        ciu = -9.999999e-1  # makes log(0.0000001) in hawkins_young
-
-    # Use least-squares fitting for the quadratic.
-    # NOTE: remember, we are fitting sigma, the standard deviation of the
-    #       underlying normal distribution. A 'safe' assumption is to
-    #       expect sigma to be between 1 and 5. So run a few fits and
-    #       get the one that isn't negative (most positive).
-    #       Alternatively, we could take std(ddof=1) of the log of the data
-    #       to get an estimate of the standard deviation and search across
-    #       4x's of it. See snippet code for method:
-    #       `s_std = np.round(4*np.log(data).std(ddof=1), 0)`
-    all_ans = []
-    for i in uniform.rvs(0, 6, size=10):
-        ans = least_squares(
-            hawkins_young, i, kwargs={'alpha': alpha, 'ciu': ciu})
-        all_ans.append(ans['x'][0])
-
-    # Find the minimum of all positive values:
-    all_ans = np.array(all_ans)
-    sigma = all_ans[np.where(all_ans > 0)].min()
+    n = np.asarray(n, dtype=float)
+    std = np.asarray(std, dtype=float)
+    mean = np.asarray(mean, dtype=float)
+
+    is_error = n <= 1
+    z = np.zeros(n.shape)
+    z[~is_error] = t.ppf(q=alpha, df=n[~is_error] - 1)
+    se = std/np.sqrt(n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ciu = np.where(mean != 0, se*np.sqrt(1 + 1/n)*z/mean, 0.0)
+    is_clamped = ciu <= -1
+    is_error = is_error | is_clamped
+    ciu[is_clamped] = -9.999999e-1  # makes log(0.0000001) in hawkins_young
+
+    # The quadratic coefficients; see hawkins_young
+    a = 0.5
+    b = -2**0.5*erfinv(alpha)
+    c = np.log(1 + ciu)
+    root = np.sqrt(np.clip(b**2 - 4*a*c, 0, None))
+    sigma = np.where(c > 0, (-b - root)/(2*a), (-b + root)/(2*a))
 
     return (is_error, sigma)
 
@@ -1455,6 +2013,51 @@ def hawkins_young_uncertainty(ef, sigma, is_error):
     }
 
 
+def hawkins_young_uncertainty_batch(ef, sigma, is_error=False):
+    """Compute the log-normal distribution parameters for arrays of emission
+    factors.
+
+    The vectorized counterpart of :func:`hawkins_young_uncertainty`.
+
+    Parameters
+    ----------
+    ef : numpy.array or pandas.Series
+        Emission factors (emission units/MWh).
+    sigma : numpy.array or pandas.Series
+        Fitted standard deviations to emissions data (e.g., from
+        :func:`hawkins_young_sigma_batch`). None values are treated as NaN.
+    is_error : bool or numpy.array, optional
+        The error flag(s) returned from :func:`hawkins_young_sigma_batch`,
+        by default False.
+
+    Returns
+    -------
+    dict
+        A dictionary of numpy arrays, each the same length as `ef`, with the
+        same keys as :func:`hawkins_young_uncertainty` (i.e., 'mu', 'sigma',
+        'mu_g', 'sigma_g', and 'error').
+    """
+    ef = pd.to_numeric(pd.Series(np.asarray(ef)), errors='coerce').values
+    sigma = pd.to_numeric(pd.Series(np.asarray(sigma)), errors='coerce').values
+
+    # NOTE: NaN emission factors are not flagged, but give NaN results.
+    is_neg = ef <= 0
+    is_error = np.broadcast_to(is_error, ef.shape) | is_neg
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mu = np.where(is_neg, np.nan, np.log(ef) - 0.5*sigma**2)
+
+    mu_g = np.exp(mu)
+    sigma_g = np.exp(sigma)
+
+    return {
+        'mu': mu,
+        'sigma': sigma,
+        'mu_g': mu_g,
+        'sigma_g': sigma_g,
+        'error': is_error,
+    }
+
+
 def olcaschema_genprocess(database, upstream_dict={}, subregion="BA"):
     """Turn a database containing generator facility emissions into a
     dictionary that contains required data for an openLCA-compatible JSON-LD.
@@ -1729,13 +2332,46 @@ def replace_egrid(total_db, year=None):
     key_df = primary_fuel_df[
         ["eGRID_ID", "FuelCategory"]].dropna().drop_duplicates(
             subset="eGRID_ID").set_index("eGRID_ID")
+    # Categorical fuel categories (see INVENTORY_DTYPES) may receive new
+    # values, so the categories are rebuilt after the replacement.
+    is_cat = isinstance(total_db["FuelCategory"].dtype, pd.CategoricalDtype)
+    if is_cat:
+        total_db["FuelCategory"] = total_db["FuelCategory"].astype(object)
     not_all = total_db["FuelCategory"] != "ALL"
     total_db.loc[not_all, "FuelCategory"] = total_db.loc[
         not_all, "eGRID_ID"].map(key_df["FuelCategory"])
+    if is_cat:
+        total_db["FuelCategory"] = total_db["FuelCategory"].astype("category")
 
     return total_db
 
 
+def set_inventory_dtypes(df):
+    """Convert the columns of a facility-level inventory to the data types
+    defined in :data:`INVENTORY_DTYPES`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        A facility-level inventory (e.g., from
+        :func:`create_generation_process_df`). Columns not found in the data
+        frame are skipped.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same data frame with converted columns.
+    """
+    dtypes = {k: v for k, v in INVENTORY_DTYPES.items() if k in df.columns}
+    mem_before = df.memory_usage(deep=True).sum()
+    df = df.astype(dtypes)
+    logging.info(
+        "Set inventory data types (%.1f to %.1f MB)" % (
+            mem_before/1e6, df.memory_usage(deep=True).sum()/1e6))
+
+    return df
+
+
 def turn_data_to_dict(data, upstream_dict):
     """Turn aggregated emission data into exchange dictionary for openLCA.
 
@@ -1778,25 +2414,6 @@ def turn_data_to_dict(data, upstream_dict):
     logging.debug(f"Turning flows from {data.name} into dictionaries")
 
     # NOTE: the new olca-schema names are handled in olca_jsonld_writer.py
-    cols_for_exchange_dict = [
-        "internalId",
-        "@type",
-        "avoidedProduct",
-        "flow",
-        "flowProperty",
-        "input",
-        "quantitativeReference",
-        "baseUncertainty",
-        "provider",
-        "amount",
-        "amountFormula",
-        "unit",
-        "pedigreeUncertainty", # defunct
-        "dqEntry",
-        "uncertainty",
-        "comment",
-    ]
-
     # HOTFIX: remove exchanges that have NaNs for Emission_factor;
     #   they crash openLCA. [240813; TWD]
     #   https://github.com/USEPA/ElectricityLCI/issues/246
@@ -1805,59 +2422,28 @@ def turn_data_to_dict(data, upstream_dict):
         logging.info("Removing %d nans from exchange table" % num_nans)
     data = data.dropna(subset='Emission_factor')
 
-    data["internalId"] = ""
-    data["@type"] = "Exchange"
-    data["avoidedProduct"] = False
-    data["flowProperty"] = ""
-    data["baseUncertainty"] = ""
-    data["provider"] = ""
-    data["FlowType"] = "ELEMENTARY_FLOW"
-
-    # Effectively rename 'Unit' to 'unit', 'uncertainty Max/Min' to 'Max/Min'
-    data["unit"] = data["Unit"]
-    data["Maximum"] = data["uncertaintyMax"]
-    data["Minimum"] = data["uncertaintyMin"]
-
-    # Define inputs based on compartment label
-    data["input"] = False
-    input_filter = (
-        (data["Compartment"].str.lower().str.contains("input"))
-        | (data["Compartment"].str.lower().str.contains("resource"))
-        | (data["Compartment"].str.lower().str.contains("technosphere"))
-    )
-    data.loc[input_filter, "input"] = True
+    # Define inputs, products, and wastes based on compartment label;
+    # the label searches are made once for each unique compartment.
+    codes, comps = pd.factorize(data["Compartment"], use_na_sentinel=False)
+    comps = pd.Series(comps).astype(str).str.lower()
+    has_input = comps.str.contains("input").to_numpy()[codes]
+    has_resource = comps.str.contains("resource").to_numpy()[codes]
+    has_techno = comps.str.contains("technosphere").to_numpy()[codes]
+    has_valuable = comps.str.contains("valuable").to_numpy()[codes]
 
-    # Define products based on compartment label
+    is_input = has_input | has_resource | has_techno
     # HOTFIT: input compartment tends to be technosphere flow
-    product_filter=(
-        (data["Compartment"].str.lower().str.contains("technosphere"))
-        | (data["Compartment"].str.lower().str.contains("valuable"))
-        | (data["Compartment"].str.lower().str.contains("input"))
-    )
-    data.loc[product_filter, "FlowType"] = "PRODUCT_FLOW"
+    # NOTE: wastes (technosphere) will all be inputs!
+    flow_type = np.full(len(data), "ELEMENTARY_FLOW", dtype=object)
+    flow_type[has_techno | has_valuable | has_input] = "PRODUCT_FLOW"
+    flow_type[has_techno] = "WASTE_FLOW"
+    data = data.assign(FlowType=flow_type)
 
-    # Define wastes based on compartment label; NOTE they will all be inputs!
-    waste_filter = (
-        (data["Compartment"].str.lower().str.contains("technosphere"))
-    )
-    data.loc[waste_filter, "FlowType"] = "WASTE_FLOW"
-
-    data["flow"] = ""
-    data["uncertainty"] = ""
-    for index, row in data.iterrows():
-        data.at[index, "uncertainty"] = uncertainty_table_creation(
-            data.loc[index:index, :]
-        )
-        data.at[index, "flow"] = flow_table_creation(
-            data.loc[index:index, :]
-        )
-
-    data["amount"] = data["Emission_factor"]
-    data["amountFormula"] = ""
-    data["quantitativeReference"] = False
+    flows = flow_table_records(data)
+    uncertainties = uncertainty_table_records(data)
 
     # Pull pedigree matrix values for DQI
-    data["dqEntry"] = (
+    dq_entry = (
         "("
         + str(round(data["DataReliability"].iloc[0], 1))
         + ";"
@@ -1870,16 +2456,38 @@ def turn_data_to_dict(data, upstream_dict):
         + str(round(data["DataCollection"].iloc[0], 1))
         + ")"
     )
-    data["pedigreeUncertainty"] = ""
 
-    data["comment"] = data["source_string"].str.replace(
+    comments = data["source_string"].str.replace(
         "_", "," , regex=False) + ", " + data["Year"].astype(str)
 
-    # Copy the columns for exchange process list
-    data_for_dict = data[cols_for_exchange_dict]
-
-    # Create a list of dictionaries:
-    data_dict = data_for_dict.to_dict("records")
+    # Create a list of exchange dictionaries straight from the columns
+    data_dict = [
+        {
+            "internalId": "",
+            "@type": "Exchange",
+            "avoidedProduct": False,
+            "flow": flw,
+            "flowProperty": "",
+            "input": inp,
+            "quantitativeReference": False,
+            "baseUncertainty": "",
+            "provider": "",
+            "amount": amt,
+            "amountFormula": "",
+            "unit": unt,
+            "pedigreeUncertainty": "", # defunct
+            "dqEntry": dq_entry,
+            "uncertainty": unc,
+            "comment": cmt,
+        } for flw, inp, amt, unt, unc, cmt in zip(
+            flows,
+            is_input.tolist(),
+            data["Emission_factor"].tolist(),
+            data["Unit"].tolist(),
+            uncertainties,
+            comments.tolist(),
+        )
+    ]
 
     # HOTFIX: append the product flow dictionary to the list [2023-11-13; TWD]
     # NOTE: This is the quantitative reference flow.
@@ -120,7 +120,8 @@ def generate_canadian_mixes(us_inventory, gen_year):
             "FuelCategory",
             "FlowName",
             "FlowUUID",
-        ]
+        ],
+        observed=True,
     )[["FlowAmount", "quantity"]].sum()
     us_inventory_electricity = (
         us_inventory.drop_duplicates(
@@ -137,7 +138,8 @@ def generate_canadian_mixes(us_inventory, gen_year):
                 "FuelCategory",
                 "FlowName",
                 "FlowUUID",
-            ]
+            ],
+            observed=True,
         )["Electricity"]
         .sum()
     )
@@ -211,6 +213,7 @@ def generate_canadian_mixes(us_inventory, gen_year):
             "Unit",
         ],
         as_index=False,
+        observed=True,
     )[["Electricity", "FlowAmount", "quantity"]].sum()
     ca_mix_inventory["stage_code"] = "life cycle"
     ca_mix_inventory.sort_values(
@@ -7,6 +7,7 @@
 # REQUIRED MODULES
 ##############################################################################
 import logging
+import os
 
 from electricitylci import get_generation_mix_process_df
 from electricitylci import get_generation_process_df
@@ -30,9 +31,11 @@ for the analysis are contained in the configuration YAML files. This module
 performs the functions necessary to generate the JSON-LD according to those
 options. The selection of configuration file will occur after the start
 of this script or it may be passed following the command-line argument, '-c'.
+The JSON-LD of a failed run with staging (see 'stage_jsonld') may be recovered
+with the command-line argument, '-r', followed by its staging folder.
 
 Last updated:
-    2025-03-14
+    2026-10-17
 
 Changelog:
     -   Address logging handler import for Python 3.12 compatibility.
@@ -46,9 +49,15 @@ Changelog:
     -   Test facility-level inventory generation.
     -   Make use of the post-processing configuration parameter.
     -   Make main() runnable (add ``is_set`` param)
+    -   Write the JSON-LD zip file once per run using a JSON-LD session.
+    -   Pass the JSON-LD compression and parallel settings to the session.
+    -   Optionally save a JSON-LD write profile next to the JSON-LD zip file.
+    -   Add :func:`recover_jsonld` (and the '-r' command-line argument) to
+        write the JSON-LD zip file of a failed run from its staging folder.
 """
 __all__ = [
     "main",
+    "recover_jsonld",
     "run_distribution",
     "run_generation",
 ]
@@ -83,6 +92,9 @@ def main(is_set=False):
         -   Remove untracked flows (i.e., flows not in a process exchange).
         -   Generate product systems for consumption mix (at user) processes.
 
+    The JSON-LD is built in memory across all three steps and the zip file
+    is written once, at the end (see olca_jsonld_writer.JSONLDSession).
+
     Examples
     --------
     >>> # To show where data files are exported:
@@ -99,12 +111,102 @@ def main(is_set=False):
         # eLCI package; you might have to search site-packages under lib.
         config.model_specs = config.build_model_class()
 
-    gen_dict = run_generation()
-    run_distribution(gen_dict)
+    from electricitylci.olca_jsonld_writer import JSONLDSession
+    from electricitylci.olca_jsonld_writer import WriteProfile
+    from electricitylci.olca_jsonld_writer import set_time_stamp
+
+    # Optionally stage openLCA entities for recovery of a failed run
+    # (see recover_jsonld).
+    stage_dir = None
+    if config.model_specs.stage_jsonld:
+        stage_dir = _staging_dir(config.model_specs.namestr)
+
+    # Optionally pin the dates of new openLCA entities (for reproducibility).
+    set_time_stamp(config.model_specs.jsonld_time_stamp)
+
+    # Optionally time and count the JSON-LD writer's work.
+    profile = None
+    if config.model_specs.profile_jsonld:
+        profile = WriteProfile().start()
+
+    # Keep the JSON-LD in memory; it is written when the session closes.
+    try:
+        with JSONLDSession(
+                config.model_specs.namestr,
+                stage_dir,
+                compression=config.model_specs.jsonld_compression,
+                parallel=config.model_specs.parallel_jsonld):
+            gen_dict = run_generation()
+            run_distribution(gen_dict)
+
+            if config.model_specs.run_post_processes:
+                # Clean JSON-LD and generate product systems.
+                run_post_processes()
+    finally:
+        if profile is not None:
+            profile.stop()
+            profile.save(
+                os.path.splitext(config.model_specs.namestr)[0]
+                + "_profile.json"
+            )
+
+
+def recover_jsonld(stage_dir, compression=None):
+    """Write the JSON-LD zip file of a failed run from its staging folder.
 
-    if config.model_specs.run_post_processes:
-        # Clean JSON-LD and generate product systems.
-        run_post_processes()
+    If the model config parameter, 'stage_jsonld', is true, :func:`main`
+    saves openLCA entities to a folder named after the run's time-stamped
+    JSON-LD zip file (e.g., 'ELCI_1_jsonld_20240101_120000_staging' for
+    'ELCI_1_jsonld_20240101_120000.zip'). A new run has a new zip file
+    name, so it does not pick up the staging folder of a failed run; this
+    method writes the failed run's zip file from the staged entities and
+    deletes the staging folder.
+
+    Parameters
+    ----------
+    stage_dir : str
+        The staging folder of a failed run.
+    compression : int or str, optional
+        The compression of the zip file (see the model config parameter,
+        'jsonld_compression'), by default None (deflated).
+
+    Returns
+    -------
+    str
+        The path to the recovered JSON-LD zip file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the staging folder does not exist.
+    ValueError
+        If the folder name does not end with '_staging'.
+
+    Notes
+    -----
+    The zip file has the entities staged before the failure; the steps
+    that did not run (e.g., the post-processes) are not re-done.
+
+    Examples
+    --------
+    >>> recover_jsonld("output/ELCI_1_jsonld_20240101_120000_staging")
+    'output/ELCI_1_jsonld_20240101_120000.zip'
+    """
+    from electricitylci.olca_jsonld_writer import JSONLDSession
+
+    stage_dir = os.path.normpath(stage_dir)
+    if not os.path.isdir(stage_dir):
+        raise FileNotFoundError("No staging folder, %s" % stage_dir)
+    if not stage_dir.endswith("_staging"):
+        raise ValueError(
+            "Expected a staging folder ending in '_staging', not %s"
+            % stage_dir)
+
+    file_path = stage_dir[:-len("_staging")] + ".zip"
+    logging.info("Recovering %s" % os.path.basename(file_path))
+    JSONLDSession(file_path, stage_dir, compression=compression).close()
+
+    return file_path
 
 
 def run_distribution(generation_process_dict):
@@ -227,6 +329,12 @@ def run_generation():
     return generation_process_dict
 
 
+def _staging_dir(file_path):
+    """Return the staging folder of a JSON-LD zip file (i.e., its path
+    without the extension, with '_staging' appended)."""
+    return os.path.splitext(file_path)[0] + "_staging"
+
+
 ##############################################################################
 # MAIN
 ##############################################################################
@@ -244,6 +352,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "-c", "--model_config", help="specify model configuration", default="")
+    parser.add_argument(
+        "-r", "--recover_jsonld",
+        help="write the JSON-LD of a failed run from its staging folder",
+        default="")
     args = parser.parse_args()
     if args.model_config != "":
         config.model_specs = config.build_model_class(args.model_config)
@@ -252,7 +364,13 @@ if __name__ == "__main__":
 
     # Execute main; make is_set true in this block.
     try:
-        main(True)
+        if args.recover_jsonld != "":
+            compression = None
+            if config.model_specs is not None:
+                compression = config.model_specs.jsonld_compression
+            recover_jsonld(args.recover_jsonld, compression)
+        else:
+            main(True)
         #get_facility_level_inventory(True, False)
     except Exception as e:
         log.error("Crashed on main!\n%s" % repr(e))
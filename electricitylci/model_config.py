@@ -34,7 +34,7 @@ configuration settings are set once and shared with the rest of the Python
 package. To change configuration settings, restart Python.
 
 Last edited:
-    2025-05-13
+    2026-10-17
 """
 __all__ = [
     "ConfigurationError",
@@ -137,6 +137,48 @@ class ModelSpecs:
         Defaults to false.
     calculate_uncertainty : bool
         Whether or not to compute the uncertainty of emission flows.
+    parallel_aggregation : bool
+        Whether to aggregate facility-level emissions for each region in
+        parallel worker processes (see generation.py).
+        Defaults to false.
+    cache_generation_inventory : bool
+        Whether to save the facility-level inventory to a checkpoint file in
+        the data store and re-use it while the model specs it is built from
+        and its input files are unchanged (see generation.py).
+        Defaults to false.
+    refresh_generation_cache : bool
+        Whether to rebuild the facility-level inventory checkpoint from its
+        sources, even if its model specs and input files are unchanged
+        (see generation.py). Only used if 'cache_generation_inventory' is
+        true. Defaults to false.
+    stage_jsonld : bool
+        Whether to save root entities to a staging folder next to the
+        JSON-LD zip file while the model runs, so that they may be
+        recovered after a failed run (see olca_jsonld_writer.JSONLDSession).
+        The staging folder is named after the run's time-stamped zip file,
+        so a new run does not pick it up; recover the failed run's zip file
+        with main.recover_jsonld (or ``python main.py -r <staging folder>``).
+        Defaults to false.
+    parallel_jsonld : bool
+        Whether to make the exchanges of openLCA processes in parallel
+        worker processes when writing JSON-LD (see olca_jsonld_writer.py).
+        Defaults to false.
+    jsonld_compression : str or int or NoneType
+        The compression of the JSON-LD zip file: 'stored', 'deflated', or a
+        deflate level (0--9). Defaults to None (deflated at the default
+        level). Intermediate zip files that are re-written by the post
+        processes are always stored.
+    jsonld_time_stamp : str or datetime.datetime or NoneType
+        The creation and last-change date of new openLCA entities (e.g.,
+        '2024-01-01T00:00:00Z'), so that two runs on the same inputs give
+        the same JSON-LD zip file (see
+        olca_jsonld_writer.set_time_stamp). Defaults to None (the current
+        time).
+    profile_jsonld : bool
+        Whether to save a report of the JSON-LD writer's stage times, lookup
+        hit rates, entities and bytes written, and peak memory as a JSON
+        file next to the JSON-LD zip file (see
+        olca_jsonld_writer.WriteProfile). Defaults to false.
     namestr : str
         Absolute path to JSON-LD zip output file.
         File name includes the model name and current time stamp and is
@@ -197,6 +239,17 @@ class ModelSpecs:
         self.gen_mix_from_model_generation_data = False
         self.calculate_uncertainty = model_specs.get(
             "calculate_uncertainty", True)
+        self.parallel_aggregation = model_specs.get(
+            "parallel_aggregation", False)
+        self.cache_generation_inventory = model_specs.get(
+            "cache_generation_inventory", False)
+        self.refresh_generation_cache = model_specs.get(
+            "refresh_generation_cache", False)
+        self.stage_jsonld = model_specs.get("stage_jsonld", False)
+        self.parallel_jsonld = model_specs.get("parallel_jsonld", False)
+        self.jsonld_compression = model_specs.get("jsonld_compression", None)
+        self.jsonld_time_stamp = model_specs.get("jsonld_time_stamp", None)
+        self.profile_jsonld = model_specs.get("profile_jsonld", False)
         self.namestr = (
             f"{output_dir}/{model_name}_jsonld_"
             f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
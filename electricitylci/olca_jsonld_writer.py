@@ -6,15 +6,33 @@
 ##############################################################################
 # REQUIRED MODULES
 ##############################################################################
+import collections
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
 import datetime
+from functools import lru_cache
 import io
 import json
 import logging
 import math
+import multiprocessing
 import os
 import re
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+import shutil
+import sys
+import tempfile
+import time
 import uuid
+from zipfile import ZIP_DEFLATED
+from zipfile import ZIP_STORED
 from zipfile import ZipFile
+from zipfile import ZipInfo
 
 import fedelemflowlist
 import olca_schema as o
@@ -23,6 +41,7 @@ import olca_schema.zipio as zipio
 import pytz
 import requests
 
+from electricitylci.elementaryflows import select_fedefl_flows
 from electricitylci.globals import paths
 from electricitylci.globals import elci_version as VERSION
 from electricitylci.utils import check_output_dir
@@ -79,22 +98,858 @@ Changelog:
     -   Add EPA's DQI pedigree matrices to JSON-LD
     -   Fix removal of untracked flows (new :func:`rm_untracked_flows`)
     -   Add two more corrections to :func:`clean_json`
+    -   Replace the parallel 'ids' and 'objs' lists of the root entity
+        dictionary with :class:`RootEntityRegistry` (constant time lookups
+        by UUID and bulk deletes of untracked flows)
+    -   New :class:`JSONLDSession` that keeps root entities in memory across
+        calls to :func:`write`, :func:`clean_json`, and
+        :func:`build_product_systems` and writes the zip archive once (with
+        optional staging of entities to disk for crash recovery)
+    -   Build all product systems from one index of default providers
+        (iterative search with memoized supply chains) in place of the
+        recursive ``_build_supply_chain``, which re-read processes from the
+        zip archive
+    -   Make processes in two steps (shared root entities, then exchanges),
+        with optional parallel construction of exchanges in :func:`write`
+    -   Read JSON-LD archives lazily (entities are indexed on open, parsed
+        on first access, and copied unparsed on save if never accessed)
+    -   Rewrite :func:`clean_json` as a single pass over each process's
+        exchanges with a pipeline of exchange rules (reports hits and time
+        per rule); fixes exchanges skipped by removal during iteration
+    -   Select FEDEFL flows from a cached, UUID-indexed flow list (see
+        :func:`electricitylci.elementaryflows.select_fedefl_flows`) and read
+        the Federal LCA Commons' JSON assets once per Python session
+    -   Write reproducible JSON-LD archives (sorted members with a fixed
+        time stamp) with selectable compression (including stored, for
+        intermediate archives) and optional parallel JSON serialization
+    -   Replace ``_uid`` and ``_uid_is_valid`` with public, memoized
+        :func:`make_uuid` (and its batch version, :func:`make_uuids`) and a
+        regular expression check, :func:`is_valid_uuid`
+    -   New :class:`WriteProfile` that reports the wall time of each stage,
+        lookup hit rates, entities and bytes written, and peak memory
+    -   Derive product system UUIDs from their reference process and add
+        :func:`set_time_stamp` to pin the creation and last-change dates of
+        new root entities (i.e., the same inputs give the same JSON-LD)
 
 Last edited:
-    2025-06-10
+    2026-10-17
 """
 __all__ = [
+    "JSONLDSession",
+    "RootEntityRegistry",
+    "WriteProfile",
     "build_product_systems",
     "check_exchanges",
     "clean_json",
+    "is_valid_uuid",
+    "make_uuid",
+    "make_uuids",
+    "set_time_stamp",
     "write",
 ]
 
 
+##############################################################################
+# CLASSES
+##############################################################################
+class JSONLDSession:
+    """A session-scoped JSON-LD writer.
+
+    The root entity registries are held in memory across all calls to
+    :func:`write`, :func:`clean_json`, and :func:`build_product_systems`
+    for the session's file path, and the zip archive is written exactly
+    once, when the session is closed (rather than read, merged, and
+    re-written on each call).
+
+    If a staging directory is given, each batch of new or modified root
+    entities is also saved there as individual JSON files, so that the
+    work done is not lost if the run fails before the session is closed.
+    A new session on the same file path and staging directory picks up
+    the staged entities (i.e., call :meth:`close` to recover the JSON-LD).
+    The staging directory is deleted once the zip archive is written.
+
+    Attributes
+    ----------
+    file_path : str
+        The path to the JSON-LD zip file.
+    staging_dir : str or NoneType
+        The folder where entities are staged; None for no staging.
+    compression : int, str, or NoneType
+        The compression of the zip archive's members (see
+        :func:`_zip_compression`); None for the default.
+    parallel : bool
+        Whether to serialize entities in parallel worker processes when
+        the zip archive is written (see :func:`_write_jsonld`).
+    data : dict
+        The root entity registries (see :func:`_root_entity_dict`).
+
+    Examples
+    --------
+    >>> with JSONLDSession(config.model_specs.namestr) as session:
+    ...     write(process_dict, config.model_specs.namestr)  # in memory
+    ...     clean_json(config.model_specs.namestr)           # in memory
+    >>> # the JSON-LD zip is written on leaving the context
+    """
+    def __init__(self, file_path, staging_dir=None, compression=None,
+                 parallel=False):
+        _zip_compression(compression)
+        self.file_path = file_path
+        self.staging_dir = staging_dir
+        self.compression = compression
+        self.parallel = parallel
+        with _profiled("init_root_entities"):
+            self.data = _init_root_entities(file_path)
+        if staging_dir is not None and os.path.isdir(staging_dir):
+            self._load_staged()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep staged entities for recovery; do not write the zip.
+            logging.error("JSON-LD session for %s ended without saving" % (
+                os.path.basename(self.file_path)))
+            _SESSIONS.pop(_session_key(self.file_path), None)
+        return False
+
+    def _load_staged(self):
+        """Read staged root entities into the session's registries."""
+        count = 0
+        for name, registry in self.data.items():
+            s_dir = os.path.join(self.staging_dir, name)
+            if not os.path.isdir(s_dir):
+                continue
+            for s_file in sorted(os.listdir(s_dir)):
+                if not s_file.endswith(".json"):
+                    continue
+                with open(os.path.join(s_dir, s_file), 'r') as f:
+                    r_obj = registry.spec.from_dict(json.load(f))
+                registry.add(r_obj.id, r_obj)
+                count += 1
+        logging.info("Read %d staged entities from %s" % (
+            count, self.staging_dir))
+
+    def _stage(self, uids):
+        """Save root entities to the staging directory (if any).
+
+        Parameters
+        ----------
+        uids : dict
+            Root entity names (e.g., 'Flow') and the UUIDs to be staged.
+        """
+        if self.staging_dir is None:
+            return
+        with _profiled("stage_entities"):
+            for name, u_list in uids.items():
+                s_dir = os.path.join(self.staging_dir, name)
+                if u_list:
+                    check_output_dir(s_dir)
+                for uid in u_list:
+                    r_obj = self.data[name].get(uid)
+                    if r_obj is None or isinstance(r_obj, o.Ref):
+                        continue
+                    # Write-then-rename, so a crash never leaves a partial
+                    # file behind
+                    s_file = os.path.join(s_dir, "%s.json" % uid)
+                    with open(s_file + ".part", 'w') as f:
+                        json.dump(r_obj.to_dict(), f)
+                    os.replace(s_file + ".part", s_file)
+
+    def build_product_systems(self, elci_config):
+        """Add product systems to the session (see
+        :func:`build_product_systems`)."""
+        n_ps = len(self.data['ProductSystem'])
+        with _profiled("add_product_systems"):
+            _add_product_systems(self.data, elci_config)
+        self._stage({
+            'ProductSystem': self.data['ProductSystem'].ids()[n_ps:]})
+
+    def clean(self, rules=None):
+        """Clean the session's data (see :func:`clean_json`)."""
+        # Archived flows are read back with the FEDEFL metadata written by
+        # fedelemflowlist; do the same here before the clean-up steps.
+        with _profiled("fedefl_update"):
+            _fedefl_update(self.data)
+        with _profiled("clean_data"):
+            self.data, stats = _clean_data(self.data, rules)
+        self._stage({
+            'Flow': self.data['Flow'].ids(),
+            'Process': self.data['Process'].ids(),
+        })
+        return stats
+
+    def close(self):
+        """Write the JSON-LD zip file and end the session."""
+        self.flush()
+        _SESSIONS.pop(_session_key(self.file_path), None)
+        if self.staging_dir is not None and os.path.isdir(self.staging_dir):
+            logging.info("Removing staging folder, %s" % self.staging_dir)
+            shutil.rmtree(self.staging_dir)
+
+    def flush(self):
+        """Write the session's data to the JSON-LD zip file."""
+        check_output_dir(os.path.dirname(self.file_path))
+        if os.path.exists(self.file_path):
+            logging.info("Replacing %s" % os.path.basename(self.file_path))
+        with _profiled("rm_untracked_flows"):
+            self.data = _rm_untracked_flows(self.data)
+        with _profiled("write_jsonld"):
+            _write_jsonld(
+                self.file_path, self.data, self.compression, self.parallel)
+
+    def open(self):
+        """Register the session, so that :func:`write`, :func:`clean_json`,
+        and :func:`build_product_systems` work in memory on its file path.
+
+        Returns
+        -------
+        JSONLDSession
+            This session.
+
+        Raises
+        ------
+        ValueError
+            If another session is already open on the same file path.
+        """
+        key = _session_key(self.file_path)
+        if _SESSIONS.get(key, self) is not self:
+            raise ValueError(
+                "A JSON-LD session is already open for %s" % self.file_path)
+        _SESSIONS[key] = self
+        return self
+
+    def write(self, processes, parallel=False):
+        """Add processes to the session (see :func:`write`).
+
+        Parameters
+        ----------
+        processes : dict
+            OLCA schema dictionaries (e.g. Process).
+        parallel : bool, optional
+            Whether to make process exchanges in parallel worker processes,
+            by default False.
+
+        Returns
+        -------
+        dict
+            Original processes dictionary updated.
+        """
+        # Stage new entities and those replaced by this write (e.g., flows
+        # are re-created when their UUID is generated), as recorded by the
+        # registries (see RootEntityRegistry.pop_changes).
+        for registry in self.data.values():
+            registry.pop_changes()
+        with _profiled("write_processes"):
+            processes = _write_processes(processes, self.data, parallel)
+        self._stage({k: v.pop_changes() for k, v in self.data.items()})
+        return processes
+
+
+class RootEntityRegistry:
+    """An insertion-ordered registry of olca-schema root entities of one
+    type (e.g., Flow), indexed by UUID.
+
+    Replaces the parallel 'ids' and 'objs' lists of the root entity
+    dictionary (see :func:`_root_entity_dict`); lookups, additions, and
+    deletions by UUID are constant time. For compatibility, the registry
+    may still be indexed by 'class', 'ids', and 'objs', where the latter two
+    are read-only, list-like views.
+
+    Entities read from a JSON-LD zip archive may be registered unread (see
+    :func:`_read_jsonld`); they are parsed the first time they are accessed
+    (e.g., by :meth:`get` or :meth:`objs`) and the parsed object is kept.
+    Entities that are never accessed are copied from the archive as-is
+    when the JSON-LD is written (see :func:`_write_jsonld`).
+
+    The UUIDs of added or replaced entities are recorded until they are
+    collected by :meth:`pop_changes` (e.g., for staging new entities in a
+    :class:`JSONLDSession`).
+
+    Attributes
+    ----------
+    spec : class
+        The olca-schema root entity class (e.g., olca_schema.Flow).
+
+    Examples
+    --------
+    >>> r = RootEntityRegistry(o.Flow)
+    >>> r.add(f.id, f)
+    >>> f.id in r
+    True
+    >>> r['objs'][r['ids'].index(f.id)] is r.get(f.id)
+    True
+    """
+    def __init__(self, spec):
+        self.spec = spec
+        self._objs = {}
+        self._ids = None
+        self._pos = None
+        self._changed = {}
+
+    def __contains__(self, uid):
+        return uid in self._objs
+
+    def __getitem__(self, key):
+        if key == "class":
+            return self.spec
+        elif key == "ids":
+            return _RegistryView(self, 0)
+        elif key == "objs":
+            return _RegistryView(self, 1)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.objs())
+
+    def __len__(self):
+        return len(self._objs)
+
+    def _index(self):
+        """Build (if needed) the cached UUID list and positions."""
+        if self._ids is None:
+            self._ids = list(self._objs.keys())
+            self._pos = {k: i for i, k in enumerate(self._ids)}
+        return self._ids
+
+    def add(self, uid, obj=None):
+        """Add an entity; an existing entity keeps its position but is
+        replaced by the new object.
+
+        Parameters
+        ----------
+        uid : str
+            The entity's UUID.
+        obj : olca_schema.RootEntity, optional
+            The entity object; NoneType for UUID-only records.
+        """
+        if uid not in self._objs and self._ids is not None:
+            self._pos[uid] = len(self._ids)
+            self._ids.append(uid)
+        self._objs[uid] = obj
+        self._changed[uid] = None
+
+    def _raw_items(self):
+        """Return (UUID, object) pairs in insertion order without reading
+        unread entities (i.e., values may be :class:`_LazyEntity`)."""
+        return list(self._objs.items())
+
+    def get(self, uid, default=None):
+        """Return the entity object for a given UUID (or default)."""
+        obj = self._objs.get(uid, default)
+        if isinstance(obj, _LazyEntity):
+            obj = obj.load()
+            if obj is None:
+                # Failed to read from file; forget the entity
+                self.remove([uid])
+                return default
+            self._objs[uid] = obj
+        return obj
+
+    def ids(self):
+        """Return the list of UUIDs in insertion order."""
+        return list(self._index())
+
+    def index(self, uid):
+        """Return the insertion position of a UUID.
+
+        Raises
+        ------
+        ValueError
+            If the UUID is not registered.
+        """
+        self._index()
+        try:
+            return self._pos[uid]
+        except KeyError:
+            raise ValueError("%s is not in registry" % uid)
+
+    def is_loaded(self, uid):
+        """Return whether a registered entity is in memory (i.e., it was
+        not read from file or it has been accessed)."""
+        return not isinstance(self._objs.get(uid), _LazyEntity)
+
+    def items(self):
+        """Return (UUID, object) pairs in insertion order."""
+        return [(uid, self.get(uid)) for uid in list(self._objs)]
+
+    def objs(self):
+        """Return the list of entity objects in insertion order."""
+        r_list = [self.get(uid) for uid in list(self._objs)]
+        return [x for x in r_list if x is not None]
+
+    def pop_changes(self):
+        """Return the UUIDs of the entities added or replaced (see
+        :meth:`add`) since the last call, in order, and reset the record.
+
+        Returns
+        -------
+        list
+            The UUIDs of the registered entities that were added or
+            replaced.
+        """
+        uids = list(self._changed)
+        self._changed = {}
+        return uids
+
+    def remove(self, uids):
+        """Delete entities by UUID; unknown UUIDs are ignored.
+
+        Parameters
+        ----------
+        uids : iterable
+            The UUIDs to delete.
+        """
+        for uid in uids:
+            self._objs.pop(uid, None)
+            self._changed.pop(uid, None)
+        self._ids = None
+        self._pos = None
+
+    def update(self, other):
+        """Add all entities from another registry (see :meth:`add`);
+        unread entities are added unread."""
+        for uid, obj in other._raw_items():
+            self.add(uid, obj)
+
+
+class WriteProfile:
+    """A timing and counting report for the JSON-LD writer.
+
+    While a profile is running, :func:`write`, :func:`clean_json`,
+    :func:`build_product_systems` (and their :class:`JSONLDSession`
+    counterparts) record the wall time of each stage, the lookups of
+    existing flows, locations, and UUIDs, and the root entities and bytes
+    written to the zip archive. When no profile is running, nothing is
+    recorded.
+
+    Attributes
+    ----------
+    stages : dict
+        Stage names and their number of calls ('calls') and wall time
+        ('seconds').
+    caches : dict
+        Lookup names (e.g., 'flow') and their number of 'hits' and
+        'misses'.
+    entities : dict
+        Zip archive folders (e.g., 'flows') and their number of members in
+        the last archive written.
+    bytes : dict
+        Zip archive folders and their members' 'uncompressed' and
+        'compressed' size (in bytes) in the last archive written.
+    clean_rules : dict
+        The statistics of the last JSON-LD clean-up (see
+        :func:`clean_json`).
+
+    Examples
+    --------
+    >>> with WriteProfile() as profile:
+    ...     write(process_dict, config.model_specs.namestr)
+    >>> profile.save(config.model_specs.namestr.replace(".zip", ".json"))
+    """
+    def __init__(self):
+        self.stages = {}
+        self.caches = {}
+        self.entities = {}
+        self.bytes = {}
+        self.clean_rules = {}
+        self.seconds = 0.0
+        self._start = None
+        self._uuid_info = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def add_stage(self, name, seconds):
+        """Add a call and its wall time to a stage."""
+        stage = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+        stage['calls'] += 1
+        stage['seconds'] += seconds
+
+    def add_lookup(self, name, hit):
+        """Add a hit (or miss) to a lookup."""
+        cache = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+        if hit:
+            cache['hits'] += 1
+        else:
+            cache['misses'] += 1
+
+    def start(self):
+        """Start recording.
+
+        Returns
+        -------
+        WriteProfile
+            This profile.
+
+        Raises
+        ------
+        ValueError
+            If another profile is already running.
+        """
+        global _PROFILE
+        if _PROFILE is not None and _PROFILE is not self:
+            raise ValueError("A JSON-LD write profile is already running")
+        _PROFILE = self
+        self._start = time.perf_counter()
+        self._uuid_info = _uuid_of_path.cache_info()
+        return self
+
+    def stop(self):
+        """Stop recording."""
+        global _PROFILE
+        if _PROFILE is self:
+            _PROFILE = None
+        if self._start is not None:
+            self.seconds += time.perf_counter() - self._start
+            u_info = _uuid_of_path.cache_info()
+            self.caches['uuid'] = {
+                'hits': u_info.hits - self._uuid_info.hits,
+                'misses': u_info.misses - self._uuid_info.misses,
+            }
+            self._start = None
+
+    def to_dict(self):
+        """Return the profile report as a dictionary.
+
+        Returns
+        -------
+        dict
+            The report, with the attributes above, the total wall time
+            ('seconds'), each lookup's 'hit_rate', and the peak resident
+            set size of this and its (finished) child processes
+            ('peak_rss_mb'; NoneType where not available).
+        """
+        caches = {}
+        for name, cache in self.caches.items():
+            n = cache['hits'] + cache['misses']
+            caches[name] = dict(cache)
+            caches[name]['hit_rate'] = cache['hits'] / n if n else None
+        return {
+            'version': VERSION,
+            'created': _current_time(),
+            'seconds': self.seconds,
+            'stages': self.stages,
+            'caches': caches,
+            'entities': self.entities,
+            'bytes': self.bytes,
+            'clean_rules': self.clean_rules,
+            'peak_rss_mb': _peak_rss(),
+        }
+
+    def save(self, file_path):
+        """Write the profile report to a JSON file.
+
+        Parameters
+        ----------
+        file_path : str
+            The JSON file path (e.g., next to the JSON-LD zip file).
+        """
+        check_output_dir(os.path.dirname(file_path))
+        with open(file_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        logging.info("Saved JSON-LD write profile to %s" % file_path)
+
+
+class _EntityCollector:
+    """A stand-in for :class:`olca_schema.zipio.ZipWriter` that keeps the
+    root entities written to it (e.g., by ``fedelemflowlist.write_jsonld``)
+    in a list, so that they are written with the rest of the archive.
+    """
+    def __init__(self):
+        self.entities = []
+
+    def write(self, entity):
+        """Keep a root entity (with the pinned last-change date, if any;
+        see :func:`set_time_stamp`)."""
+        if entity.id is None or entity.id == "":
+            raise ValueError("entity must have an ID")
+        if _TIME_STAMP is not None:
+            entity.last_change = _current_time()
+        self.entities.append(entity)
+
+
+class _JsonldArchive:
+    """A read-only view of a JSON-LD zip archive that reads root entities on
+    demand.
+
+    The archive members are indexed by root entity folder and UUID when
+    the archive is opened. Duplicate members (e.g., from appending to an
+    archive) are indexed once, in order of first appearance, and read from
+    their last appearance. The file handle is opened on demand and may be
+    closed at any time (e.g., before the file is replaced); re-opening
+    re-indexes the file.
+
+    Parameters
+    ----------
+    path : str
+        A file path to a JSON-LD zip archive.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._index = None
+        self._zip = None
+
+    def _open(self):
+        """Open the archive and index its root entity members."""
+        self._zip = ZipFile(self.path, mode="r")
+        self._index = {}
+        for info in self._zip.infolist():
+            name = info.filename
+            if info.is_dir() or not name.endswith(".json"):
+                continue
+            parts = name.split("/")
+            if len(parts) < 2:
+                continue
+            self._index[(parts[-2], parts[-1][:-5])] = info
+
+    def close(self):
+        """Close the file handle (see :func:`_close_archive`)."""
+        if self._zip is not None:
+            self._zip.close()
+        self._index = None
+        self._zip = None
+
+    def ids_of(self, spec):
+        """Return the UUIDs of a root entity type in the archive."""
+        if self._zip is None:
+            self._open()
+        folder = zipio._folder_of_class(spec)
+        return [uid for (f, uid) in self._index.keys() if f == folder]
+
+    def read(self, spec, uid):
+        """Return a root entity object (or NoneType if not found)."""
+        data = self.read_bytes(spec, uid)
+        if data is None:
+            return None
+        return spec.from_json(data)
+
+    def read_bytes(self, spec, uid):
+        """Return the JSON data of a root entity (or NoneType)."""
+        if self._zip is None:
+            self._open()
+        info = self._index.get((zipio._folder_of_class(spec), uid))
+        if info is None:
+            return None
+        return self._zip.read(info)
+
+
+class _LazyEntity:
+    """A root entity in a JSON-LD zip archive that has not been read."""
+    __slots__ = ("archive", "spec", "uid")
+
+    def __init__(self, archive, spec, uid):
+        self.archive = archive
+        self.spec = spec
+        self.uid = uid
+
+    def load(self):
+        """Read the entity object (or NoneType on failure)."""
+        try:
+            return self.archive.read(self.spec, self.uid)
+        except Exception as e:
+            logging.warning("Failed to read %s (%s) from file! %s" % (
+                self.spec.__name__, self.uid, str(e)))
+            return None
+
+
+class _ProviderGraph:
+    """The default provider links between the processes of a root entity
+    dictionary, used to build product systems.
+
+    The graph is indexed once (process UUID to its input exchanges with a
+    default provider and their provider UUIDs) and each process's supply
+    chain is found by an iterative breadth-first search. Process
+    references, process links, and the supply chains found are memoized,
+    so the many product systems that share upstream processes (e.g.,
+    generation mixes) are built from the same objects.
+
+    Parameters
+    ----------
+    p_registry : RootEntityRegistry
+        The registry of olca-schema Process objects.
+
+    Notes
+    -----
+    1.  Providers that are not found in the registry are linked, but are
+        not added to the product system's processes.
+    2.  The methods here are heavily based on those from NETL's NetlOlca class
+        currently under development by KeyLogic, here:
+        https://github.com/KeyLogicLCA/netlolca
+    """
+    def __init__(self, p_registry):
+        self._procs = p_registry
+        self._adj = {}
+        for pid, p_obj in p_registry.items():
+            if p_obj is None:
+                continue
+            self._adj[pid] = [
+                (ex, ex.default_provider.id)
+                for ex in p_obj.exchanges
+                if ex.is_input and (ex.default_provider is not None)
+            ]
+        self._links = {}
+        self._reach = {}
+        self._refs = {}
+
+    def _process_links(self, pid):
+        """Return the (memoized) process links of a process."""
+        if pid not in self._links:
+            p_ref = self.ref(pid)
+            self._links[pid] = [
+                o.ProcessLink(
+                    exchange=o.ExchangeRef(internal_id=ex.internal_id),
+                    flow=ex.flow,
+                    process=p_ref,
+                    provider=ex.default_provider,
+                )
+                for ex, _ in self._adj[pid]
+            ]
+        return self._links[pid]
+
+    def ref(self, pid):
+        """Return the (memoized) reference to a process (see
+        :func:`_make_process_ref`)."""
+        if pid not in self._refs:
+            self._refs[pid] = _make_process_ref(self._procs.get(pid))
+        return self._refs[pid]
+
+    def reachable(self, pid):
+        """Return the UUIDs of a process and all its providers.
+
+        Parameters
+        ----------
+        pid : str
+            A process's universally unique identifier.
+
+        Returns
+        -------
+        list
+            Process UUIDs in breadth-first order, starting with `pid`.
+        """
+        if pid in self._reach:
+            return self._reach[pid]
+
+        seen = {pid}
+        order = [pid]
+        queue = collections.deque([pid])
+        while queue:
+            n = queue.popleft()
+            if n != pid and n in self._reach:
+                # The provider's supply chain is already known
+                for x in self._reach[n]:
+                    if x not in seen:
+                        seen.add(x)
+                        order.append(x)
+                continue
+            for _, prov in self._adj[n]:
+                if prov not in seen and prov in self._adj:
+                    seen.add(prov)
+                    order.append(prov)
+                    queue.append(prov)
+        self._reach[pid] = order
+
+        return order
+
+    def supply_chain(self, pid):
+        """Return the process links and process references for the supply
+        chain of a process.
+
+        Parameters
+        ----------
+        pid : str
+            A process's universally unique identifier.
+
+        Returns
+        -------
+        tuple
+            A tuple of length two: list of ProcessLinks and a list of
+            process Ref objects.
+        """
+        p_list = self.reachable(pid)
+        e_list = []
+        for x in p_list:
+            e_list += self._process_links(x)
+
+        return (e_list, [self.ref(x) for x in p_list])
+
+
+class _RegistryView(Sequence):
+    """Read-only list view of the UUIDs (0) or objects (1) of a
+    :class:`RootEntityRegistry`."""
+    def __init__(self, registry, which):
+        self._r = registry
+        self._which = which
+
+    def _list(self):
+        if self._which == 0:
+            return self._r._index()
+        return self._r.objs()
+
+    def __contains__(self, value):
+        if self._which == 0:
+            return value in self._r
+        return any(x is value for x in self._r.objs())
+
+    def __getitem__(self, i):
+        if self._which == 0:
+            return self._r._index()[i]
+        if isinstance(i, slice):
+            return self._list()[i]
+        uid = self._r._index()[i]
+        return self._r.get(uid)
+
+    def __len__(self):
+        if self._which == 0:
+            return len(self._r)
+        return len(self._r.objs())
+
+    def index(self, value, *args):
+        if self._which == 0:
+            return self._r.index(value)
+        return self._list().index(value, *args)
+
+
+##############################################################################
+# GLOBALS
+##############################################################################
+_ARCHIVES = {}
+'''dict : JSON-LD archives opened for reading on demand (see
+:class:`_JsonldArchive`), keyed by their absolute file path.'''
+_DROP = object()
+'''object : The return value of an exchange rule (see :func:`_clean_data`)
+that removes the exchange.'''
+_PROFILE = None
+'''WriteProfile : The running JSON-LD write profile, if any (see
+:class:`WriteProfile`).'''
+_SESSIONS = {}
+'''dict : Open JSON-LD sessions (see :class:`JSONLDSession`), keyed by
+their absolute file path.'''
+_TIME_STAMP = None
+'''datetime.datetime : The time used for the creation and last-change
+dates of new root entities in place of the current time, if any (see
+:func:`set_time_stamp`).'''
+_TO_JSON = []
+'''list : Root entities being serialized by forked worker processes (see
+:func:`_iter_json`).'''
+_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+'''re.Pattern : A UUID string in its canonical (lowercase) form.'''
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+'''tuple : The fixed modification time of JSON-LD archive members, so that
+the same entities always give the same zip file.'''
+
+
 ##############################################################################
 # FUNCTIONS
 ##############################################################################
-def build_product_systems(file_path, elci_config):
+def build_product_systems(file_path, elci_config, compression=None):
     """Generates product systems for electricity at user consumption mixes.
 
     Parameters
@@ -103,6 +958,9 @@ def build_product_systems(file_path, elci_config):
         A file path to an existing JSON-LD file with process data saved.
     elci_config : str
         The model configuration used to make the inventory (e.g., "ELCI_1")
+    compression : int or str, optional
+        The compression of the re-written zip archive (see
+        :func:`_zip_compression`), by default None (deflated).
 
     Notes
     -----
@@ -110,50 +968,27 @@ def build_product_systems(file_path, elci_config):
         openLCA to crash.
     -   This method overwrites the existing JSON-LD with the new product
         systems.
+    -   If a :class:`JSONLDSession` is open for the file path, the product
+        systems are added to the session's data (in memory) instead.
     """
+    session = _SESSIONS.get(_session_key(file_path))
+    if session is not None:
+        session.build_product_systems(elci_config)
+        return
+
     try:
         # Read all JSON-LD data in order to overwrite.
-        data = _read_jsonld(file_path, _root_entity_dict())
+        with _profiled("read_jsonld"):
+            data = _read_jsonld(file_path, _root_entity_dict(), lazy=True)
     except OSError:
         logging.warning("Failed to read JSON-LD file, %s" % file_path)
     else:
-        check_exchanges(data['Process']['objs'])
-        logging.info("Building product systems in JSON-LD")
-
-    # Find all processes for 'at user' consumption mixes
-    q1 = re.compile("^Electricity; at user; consumption mix - (.*) - BA$")
-    q2 = re.compile("^Electricity; at user; consumption mix - (.*) - FERC$")
-    q3 = re.compile("^Electricity; at user; consumption mix - US - US$")
-    r1 = _match_process_names(data['Process']['objs'], q1)
-    r2 = _match_process_names(data['Process']['objs'], q2)
-    r3 = _match_process_names(data['Process']['objs'], q3)
-    r = r1 + r2 + r3
-    logging.info("Processing %d product systems" % len(r))
-
-    # Create a common description text
-    t_now = datetime.datetime.now()
-    d_txt = (
-        "This product system was created in openLCA "
-        "by linking default providers. "
-        "The processes were generated by ElectricityLCI "
-        "(https://github.com/USEPA/ElectricityLCI) "
-        f"version {VERSION} using "
-        f"the {elci_config} configuration. "
-        f"Created: {t_now.isoformat()}."
-    )
-
-    for pid in r:
-        p_idx = data['Process']['ids'].index(pid)
-        p_obj = data['Process']['objs'][p_idx]
-        ps_obj = _make_product_system(file_path, p_obj, d_txt)
+        with _profiled("add_product_systems"):
+            data = _add_product_systems(data, elci_config)
 
-        # Update master data dictionary
-        data['ProductSystem']['objs'].append(ps_obj)
-        data['ProductSystem']['ids'].append(ps_obj.id)
-        logging.debug("Created %s" % ps_obj.name)
-
-    # Overwrite JSON-LD
-    _save_to_json(file_path, data)
+        # Overwrite JSON-LD
+        with _profiled("save_to_json"):
+            _save_to_json(file_path, data, compression)
 
 
 def check_exchanges(p_list):
@@ -182,7 +1017,7 @@ def check_exchanges(p_list):
                 ))
 
 
-def clean_json(file_path):
+def clean_json(file_path, rules=None, compression=None):
     """Perform the following clean-up steps on JSON-LD.
 
     1.  Remove zero-valued product flows from processes.
@@ -194,128 +1029,213 @@ def clean_json(file_path):
     6.  Fix compartment for two product flows: 'Light fuel oil' and
         'Ammonium nitrate' from the coal model.
 
+    Steps 1, 4, 5, and 6 (and the correction of output exchanges of
+    resource flows) are exchange rules, which are run in a single pass over
+    each process's exchanges (see :func:`_clean_data`).
+
     Parameters
     ----------
     file_path : str
         A file path to an existing JSON-LD zip archive.
+    rules : list, optional
+        The exchange rules, as (name, function) tuples, by default None
+        (i.e., the rules listed above; see :func:`_clean_rules`).
+    compression : int or str, optional
+        The compression of the re-written zip archive (see
+        :func:`_zip_compression`), by default None (deflated).
+
+    Returns
+    -------
+    dict
+        Rule names and their number of hits ('hits') and run time
+        ('seconds'); empty if the JSON-LD file was not read.
+
+    Notes
+    -----
+    If a :class:`JSONLDSession` is open for the file path, its data are
+    cleaned in memory instead.
     """
+    session = _SESSIONS.get(_session_key(file_path))
+    if session is not None:
+        return session.clean(rules)
+
+    stats = {}
     try:
-        data = _read_jsonld(file_path, _root_entity_dict())
+        with _profiled("read_jsonld"):
+            data = _read_jsonld(file_path, _root_entity_dict(), lazy=True)
     except OSError:
         logging.warning("Failed to read JSON-LD file, %s" % file_path)
     else:
-        logging.info("Cleaning JSON-LD")
-
-        # Pull flows from each process's exchange list; remove zero product
-        # flows along the way.
-        # https://github.com/USEPA/ElectricityLCI/issues/217
-        e_list = []
-        for p in data["Process"]['objs']:
-            for e in p.exchanges:
-                # Get the flow object
-                fid = data["Flow"]['ids'].index(e.flow.id)
-                f_obj = data["Flow"]['objs'][fid]
-
-                # Remove if flow is a product flow with zero exchange value
-                # NOTE: don't add as an exchange flow!
-                if e.amount == 0 and (
-                        f_obj.flow_type != o.FlowType.ELEMENTARY_FLOW):
-                    logging.debug(
-                        "Removing zero product flow, %s, from %s" % (
-                            e.flow.name, p.name))
-                    p.exchanges.remove(e)
-                else:
-                    # Add to list of tracked exchanges
-                    e_list.append(e.flow.id)
-
-                # Check if output exchange is labeled as a resource flow
-                # https://github.com/USEPA/ElectricityLCI/issues/233
-                if not e.is_input and 'resource' in f_obj.category.lower():
-                    logging.warning(
-                        "Fixing resource flow in output exchange! "
-                        "'%s' in %s (%s)" % (f_obj.name, p.name, p.id))
-                    # HOTFIX: remove troublesome exchange, fix meta & re-add:
-                    p.exchanges.remove(e)
-                    e.is_input = True
-                    e.description = "mislabeled resources"
-                    p.exchanges.append(e)
-
-                # Correct heat resource flows;
-                # https://github.com/USEPA/ElectricityLCI/issues/293
-                if e.is_input and e.flow.name == 'Heat':
-                    # The new FEDEFL heat resource flow
-                    h_flow = _heat_elem_flow()
-                    # Add elementary flow if missing
-                    if h_flow.id not in data['Flow']['ids']:
-                        data['Flow']['ids'].append(h_flow.id)
-                        data['Flow']['objs'].append(h_flow)
-                    # Add new heat to tracked list (if not already)
-                    if h_flow.id not in e_list:
-                        e_list.append(h_flow.id)
-                    # Remove the defunct heat flow from tracked list
-                    if e.flow.id in e_list:
-                        e_fid = e_list.index(e.flow.id)
-                        e_list.pop(e_fid)
-                    # Remove old exchange, add new with updated description.
-                    p.exchanges.remove(e)
-                    e.flow = h_flow.to_ref()
-                    if e.description:
-                        e.description = "mapped to FEDEFL; " + e.description
-                    else:
-                        e.description = "mapped to FEDEFL"
-                    p.exchanges.append(e)
-
-                # Correct double Elementary Flows category
-                # https://github.com/USEPA/ElectricityLCI/issues/149
-                if f_obj.category.startswith(
-                        "Elementary flows/Elementary Flows"):
-                    logging.warning(
-                        "Fixing duplicate Elementary flows category "
-                        "for '%s'" % f_obj.name)
-                    f_obj.category = f_obj.category.replace(
-                        "/Elementary Flows/", "/")
-
-                # Map third-party technosphere flows to NAICS
-                # https://github.com/USEPA/ElectricityLCI/issues/149
-                # NOTE: this overwrite breaks the reproducibility of the
-                # UUIDs for these two flows
-                tech_cat = "Technosphere Flows"
-                pri_cat = "31-33: Manufacturing"
-                lfo_cat = "3241: Petroleum and Coal Products Manufacturing"
-                an_cat = (
-                    "3253: Pesticide, Fertilizer, and Other Agricultural "
-                    "Chemical Manufacturing"
-                )
-                if (f_obj.name == "Light fuel oil") and (
-                    f_obj.flow_type == o.FlowType.PRODUCT_FLOW) and not (
-                        pri_cat in f_obj.category):
-                    logging.warning(
-                        "Mapping 'Light fuel oil' technosphere flow to "
-                        "NAICS 3241")
-                    f_obj.category = "/".join([tech_cat, pri_cat, lfo_cat])
-                elif (f_obj.name == "Ammonium nitrate") and (
-                    f_obj.flow_type == o.FlowType.PRODUCT_FLOW) and not (
-                        pri_cat in f_obj.category):
-                    logging.warning(
-                        "Mapping 'Ammonium nitrate' technosphere flow to "
-                        "NAICS 3253")
-                    f_obj.category = "/".join([tech_cat, pri_cat, an_cat])
-
-            # Loop through exchanges a second time and re-number their
-            # internal IDs to a consecutive order.
-            p.last_internal_id = 0
-            for e in p.exchanges:
-                p.last_internal_id += 1
-                e.internal_id = p.last_internal_id
-
-        # Sort unique values to speed up search
-        e_list = sorted(list(set(e_list)))
+        with _profiled("clean_data"):
+            data, stats = _clean_data(data, rules)
 
         # Overwrite
-        _save_to_json(file_path, data)
+        with _profiled("save_to_json"):
+            _save_to_json(file_path, data, compression)
+
+    return stats
+
+
+def is_valid_uuid(uuid_str, version=3):
+    """Check if string is a valid UUID.
+
+    Parameters
+    ----------
+    uuid_str : str
+    version : {1, 2, 3, 4, 5}
 
+    Returns
+    -------
+    bool
+        `True` if uuid_str is a valid UUID, otherwise `False`.
+
+    Examples
+    --------
+    >>> is_valid_uuid('c9bf9e57-1685-4c89-bafb-ff5af830be8a', 4)
+    True
+    >>> is_valid_uuid('c9bf9e58')
+    False
+
+    Notes
+    -----
+    A valid UUID is one that is unchanged by
+    ``str(uuid.UUID(uuid_str, version=version))`` (after Rafael, 2020,
+    CC-BY-SA 4.0, https://stackoverflow.com/a/33245493); that is, it is in
+    canonical form with the given version number and the RFC 4122 variant.
+    This is checked with a regular expression instead of a UUID object.
+    """
+    # HOTFIX: deal with non-strings (e.g., nan) [2023-11-14; TWD]
+    if not isinstance(uuid_str, str) or _UUID_RE.fullmatch(uuid_str) is None:
+        return False
+    if version not in (1, 2, 3, 4, 5):
+        return False
+    return uuid_str[14] == str(version) and uuid_str[19] in "89ab"
+
+
+def make_uuid(*args):
+    """Generate UUID from the MD5 hash of a namespace identifier and a name.
+
+    This method uses OID namespace, which assumes that the name is an ISO OID.
+    Essentially, two strings are hashed together to create a UUID and, if the
+    same namespace and path are given again, the same UUID would be returned.
+    UUIDs are memoized by their path for the rest of the Python session.
+
+    Warning
+    -------
+    The UUIDs generated by this method are version 3, which is different
+    from standard processes defined elsewhere (e.g., DQSystems and Units).
+
+    Parameters
+    ----------
+    args : tuple
+        A tuple of key words representing a path (order matters).
+        The path is a string with each argument separated by a forward slash.
+        For flows, the path is 'modeltype.flow', category, and flow name.
+        For processes, the path is 'modeltype.process', process category,
+        location, and name.
+
+    Returns
+    -------
+    str
+        A version 3 universally unique identifier (UUID)
+    """
+    return _uuid_of_path('/'.join([str(arg).strip() for arg in args]).lower())
+
+
+def make_uuids(*columns):
+    """Generate version 3 UUIDs for columns of path key words.
+
+    The batch counterpart of :func:`make_uuid` (e.g., to give UUIDs to the
+    flows or processes of a data frame before their dictionaries are made,
+    as in process_dictionary_writer.py). Each unique path is hashed once.
+
+    Parameters
+    ----------
+    columns : tuple
+        Path key words (order matters), each either a sequence (e.g., a
+        list or pandas.Series) or a single value that is shared by all rows
+        (e.g., ``olca_schema.ModelType.FLOW``). Sequences must be of equal
+        length.
+
+    Returns
+    -------
+    list
+        UUIDs (str), one for each row; the same as :func:`make_uuid` on
+        each row's key words.
+
+    Raises
+    ------
+    ValueError
+        If the sequences are not of equal length.
+
+    Examples
+    --------
+    >>> make_uuids(o.ModelType.FLOW, df['Category'], df['FlowName'])
+    """
+    n_rows = None
+    parts = []
+    for col in columns:
+        if isinstance(col, (str, bytes)) or not hasattr(col, '__len__'):
+            # A single value, shared by all rows
+            parts.append(str(col).strip())
+            continue
+        if n_rows is None:
+            n_rows = len(col)
+        elif len(col) != n_rows:
+            raise ValueError("Expected columns of length %d, found %d" % (
+                n_rows, len(col)))
+        parts.append([str(x).strip() for x in col])
+    if n_rows is None:
+        return [make_uuid(*columns)]
+
+    rows = zip(*[[x] * n_rows if isinstance(x, str) else x for x in parts])
+    return [_uuid_of_path('/'.join(r).lower()) for r in rows]
+
+
+def set_time_stamp(time_stamp=None):
+    """Pin the creation and last-change dates of new root entities (and
+    the creation date in product system descriptions) to a fixed time.
+
+    By default, these dates are the current time, so that two runs on the
+    same inputs give different JSON-LD. With a pinned time stamp, they give
+    the same JSON-LD, and so a byte-identical zip archive (see
+    :func:`_write_jsonld`). Entities read from an existing archive keep
+    their dates.
+
+    Parameters
+    ----------
+    time_stamp : str, datetime.datetime, or datetime.date, optional
+        An ISO-formatted time stamp (e.g., '2024-01-01T00:00:00+00:00'),
+        datetime, or date (i.e., midnight); a time without a time zone is
+        taken to be UTC.
+        Defaults to None (i.e., the current time).
 
-def write(processes, file_path, to_save=True):
+    Examples
+    --------
+    >>> set_time_stamp("2024-01-01T00:00:00Z")
+    >>> _current_time()
+    '2024-01-01T00:00:00+00:00'
+    >>> set_time_stamp()  # back to the current time
+    """
+    global _TIME_STAMP
+    if isinstance(time_stamp, str):
+        time_stamp = datetime.datetime.fromisoformat(
+            time_stamp.replace("Z", "+00:00"))
+    elif (isinstance(time_stamp, datetime.date)
+            and not isinstance(time_stamp, datetime.datetime)):
+        time_stamp = datetime.datetime.combine(time_stamp, datetime.time())
+    if isinstance(time_stamp, datetime.datetime):
+        if time_stamp.tzinfo is None:
+            time_stamp = time_stamp.replace(tzinfo=pytz.utc)
+    elif time_stamp is not None:
+        raise TypeError(
+            "time_stamp must be a string, datetime, or date, not %s"
+            % type(time_stamp).__name__)
+    _TIME_STAMP = time_stamp
+
+
+def write(processes, file_path, to_save=True, parallel=False,
+          compression=None):
     """Write a process dictionary as a olca-schema zip file to the given path.
 
     Note that a process has several root entity types associated with it,
@@ -353,6 +1273,12 @@ def write(processes, file_path, to_save=True):
     The same methodology is adopted in NetlOlca Python class for interfacing
     with openLCA v2 projects. This is the way.
 
+    Re-zipping on every call makes the total file I/O grow with the square
+    of the number of calls. If a :class:`JSONLDSession` is open for the
+    file path (as in electricitylci.main), the root entities are instead
+    kept in the session's memory and the zip is written once, when the
+    session is closed.
+
     Parameters
     ----------
     processes : dict
@@ -361,6 +1287,15 @@ def write(processes, file_path, to_save=True):
         A path to a zip file where the JSON-LD will be written.
     to_save : bool
         Whether this method should write the JSON-LD to zip file.
+    parallel : bool, optional
+        Whether to make process exchanges (and serialize entities) in
+        parallel worker processes, by default False (see
+        :func:`_write_processes` and :func:`_write_jsonld`).
+    compression : int or str, optional
+        The compression of the zip archive (see :func:`_zip_compression`),
+        by default None (deflated). Use "stored" for an archive that is
+        re-written later (e.g., by :func:`clean_json`). Ignored if a
+        :class:`JSONLDSession` is open for the file path.
 
     Returns
     -------
@@ -372,6 +1307,10 @@ def write(processes, file_path, to_save=True):
     GreenDelta, olca-schema, Python tests (e.g., test_zipio.py).
     Online: https://github.com/GreenDelta/olca-schema/
     """
+    session = _SESSIONS.get(_session_key(file_path))
+    if session is not None:
+        return session.write(processes, parallel)
+
     # Make sure output folder exists
     file_dir = os.path.dirname(file_path)
     if not os.path.exists(file_dir):
@@ -381,39 +1320,16 @@ def write(processes, file_path, to_save=True):
     # Initialize root entity mapper (i.e., dictionary), which includes all
     # entities already written to the JSON-LD file, or simply GreenDelta's
     # FlowProperties and UnitGroups.
-    spec_map = _init_root_entities(file_path)
-
-    for p_key in processes.keys():
-        # Pull the process dictionary
-        d_vals = processes[p_key]
-
-        # Create new process object and find quantitative reference exchange
-        logging.info("Generating process for %s" % p_key)
-        p, spec_map, e = _process(d_vals, spec_map)
-        spec_map['Process']['ids'].append(p.id)
-        spec_map['Process']['objs'].append(p)
-
-        # Update the process dictionary and add UUID and reference details
-        processes[p_key].update(p.to_dict())
-        processes[p_key]['uuid'] = p.id
-        if e is not None and isinstance(e, o.Exchange):
-            try:
-                processes[p_key]['q_reference_name'] = e.flow.name
-                processes[p_key]['q_reference_id'] = e.flow.id
-                processes[p_key]['q_reference_cat'] = e.flow.category
-                processes[p_key]['q_reference_unit'] = e.unit.name
-            except Exception as exception:
-                logging.warning(
-                    "Unexpected error when accessing quantitative "
-                    "reference exchange for '%s'. %s" % (
-                        p_key, str(exception)
-                    )
-                )
+    with _profiled("init_root_entities"):
+        spec_map = _init_root_entities(file_path)
+    with _profiled("write_processes"):
+        processes = _write_processes(processes, spec_map, parallel)
 
     # Write to JSON-LD zip format
     if to_save:
         logging.info("Saving to '%s'" % file_path)
-        _save_to_json(file_path, spec_map)
+        with _profiled("save_to_json"):
+            _save_to_json(file_path, spec_map, compression, parallel)
 
     return processes
 
@@ -439,25 +1355,85 @@ def _actor(name, dict_s):
         return None
 
     # Generate a standard UUID based on actor name:
-    uid = _uid(o.ModelType.ACTOR, name)
+    uid = make_uuid(o.ModelType.ACTOR, name)
 
     # Check to see if Actor is already recorded.
     # If so, retrieve it; otherwise, make new and record it!
-    if uid in dict_s['Actor']['ids']:
-        idx = dict_s['Actor']['ids'].index(uid)
-        actor = dict_s['Actor']['objs'][idx]
+    if uid in dict_s['Actor']:
+        actor = dict_s['Actor'].get(uid)
         logging.debug("Found existing actor, %s" % actor.name)
     else:
         logging.debug("Creating new actor entity for '%s'" % name)
-        actor = o.Actor()
+        actor = o.Actor(last_change=_current_time())
         actor.id = uid
         actor.name = name
-        dict_s['Actor']['ids'].append(uid)
-        dict_s['Actor']['objs'].append(actor)
+        dict_s['Actor'].add(uid, actor)
 
     return (actor.to_ref(), dict_s)
 
 
+def _add_lookup(name, hit):
+    """Count a hit (or miss) of a lookup, if a profile is running (see
+    :class:`WriteProfile`)."""
+    if _PROFILE is not None:
+        _PROFILE.add_lookup(name, hit)
+
+
+def _add_product_systems(data, elci_config):
+    """Add product systems for electricity at user consumption mixes to a
+    root entity dictionary.
+
+    Called by :func:`build_product_systems`.
+
+    Parameters
+    ----------
+    data : dict
+        A dictionary of root entity registries with process data.
+    elci_config : str
+        The model configuration used to make the inventory (e.g., "ELCI_1")
+
+    Returns
+    -------
+    dict
+        The same root entity dictionary with product systems added.
+    """
+    check_exchanges(data['Process']['objs'])
+    logging.info("Building product systems in JSON-LD")
+
+    # Find all processes for 'at user' consumption mixes
+    q1 = re.compile("^Electricity; at user; consumption mix - (.*) - BA$")
+    q2 = re.compile("^Electricity; at user; consumption mix - (.*) - FERC$")
+    q3 = re.compile("^Electricity; at user; consumption mix - US - US$")
+    r1 = _match_process_names(data['Process']['objs'], q1)
+    r2 = _match_process_names(data['Process']['objs'], q2)
+    r3 = _match_process_names(data['Process']['objs'], q3)
+    r = r1 + r2 + r3
+    logging.info("Processing %d product systems" % len(r))
+
+    # Create a common description text
+    d_txt = (
+        "This product system was created in openLCA "
+        "by linking default providers. "
+        "The processes were generated by ElectricityLCI "
+        "(https://github.com/USEPA/ElectricityLCI) "
+        f"version {VERSION} using "
+        f"the {elci_config} configuration. "
+        f"Created: {_current_time()}."
+    )
+
+    # Index the default providers once for all product systems
+    graph = _ProviderGraph(data['Process'])
+    for pid in r:
+        p_obj = data['Process'].get(pid)
+        ps_obj = _make_product_system(graph, p_obj, d_txt)
+
+        # Update master data dictionary
+        data['ProductSystem'].add(ps_obj.id, ps_obj)
+        logging.debug("Created %s" % ps_obj.name)
+
+    return data
+
+
 def _add_fed_commons(spec_map):
     """Append openLCA unit groups, flow properties, and DQI to a spec map
     dictionary.
@@ -466,7 +1442,8 @@ def _add_fed_commons(spec_map):
     ----------
     spec_map : dict
         A dictionary of openLCA root entities.
-        Requires 'UnitGroup' key dictionary value with keys, 'objs' and 'ids'.
+        Requires 'UnitGroup', 'FlowProperty', 'DQSystem', and 'Source' keys
+        with :class:`RootEntityRegistry` values.
 
     Returns
     -------
@@ -495,19 +1472,15 @@ def _add_fed_commons(spec_map):
 
     u_list, p_list = _read_fedefl()
     for u_obj in u_list:
-        spec_map['UnitGroup']['objs'].append(u_obj)
-        spec_map['UnitGroup']['ids'].append(u_obj.id)
+        spec_map['UnitGroup'].add(u_obj.id, u_obj)
     for p_obj in p_list:
-        spec_map['FlowProperty']['objs'].append(p_obj)
-        spec_map['FlowProperty']['ids'].append(p_obj.id)
+        spec_map['FlowProperty'].add(p_obj.id, p_obj)
 
     d_list, s_list =  _read_fedcore()
     for d_obj in d_list:
-        spec_map['DQSystem']['objs'].append(d_obj)
-        spec_map['DQSystem']['ids'].append(d_obj.id)
+        spec_map['DQSystem'].add(d_obj.id, d_obj)
     for s_obj in s_list:
-        spec_map['Source']['objs'].append(s_obj)
-        spec_map['Source']['ids'].append(s_obj.id)
+        spec_map['Source'].add(s_obj.id, s_obj)
 
     return spec_map
 
@@ -529,60 +1502,6 @@ def _archive_json(data_list, file_path):
         f.write(out_str)
 
 
-def _build_supply_chain(zh, pid, e_list=[], p_list=[]):
-    """Populate the processes and process links lists based on the
-    default providers assigned to a given process.
-
-    Parameters
-    ----------
-    zh : zipio.ZipReader
-        File handle to an opened JSON-LD archive.
-    pid : str
-        A process's universally unique identifier.
-    e_list : list, optional
-        A list of ProcessLinks, by default [].
-    p_list : list, optional
-        A list of Process UUIDs, by default [].
-
-    Returns
-    -------
-    tuple
-        A tuple of length two: list of ProcessLinks and a list of
-        Process UUIDs.
-
-    Notes
-    -----
-    1.  This method does not apply any standardization for UUID generation.
-        It is arbitrarily generated by olca_schema class initialization.
-    2.  The methods here are heavily based on those from NETL's NetlOlca class
-        currently under development by KeyLogic, here:
-        https://github.com/KeyLogicLCA/netlolca
-    """
-    # Pull process object from JSON-LD and add to the processes list.
-    p_obj = zh.read(o.Process, pid)
-    if p_obj and (pid not in p_list):
-        logging.debug("Adding process, '%s'" % p_obj.name)
-        p_list.append(pid)
-        # Iterate over input exchanges w/ default providers.
-        for ex in p_obj.exchanges:
-            if ex.is_input and (ex.default_provider is not None):
-                # NOTE: should id be generated?
-                p_link = o.ProcessLink(
-                    exchange=o.ExchangeRef(internal_id=ex.internal_id),
-                    flow=ex.flow,
-                    process=_make_process_ref(p_obj),
-                    provider=ex.default_provider,
-                )
-                e_list.append(p_link)
-
-                # Build supply chain for default provider, which should
-                # itself be a process.
-                e_list, p_list = _build_supply_chain(
-                    zh, ex.default_provider.id, e_list, p_list)
-
-    return (e_list, p_list)
-
-
 def _check_source_year(s_year):
     """Checks value as valid year.
 
@@ -617,8 +1536,115 @@ def _check_source_year(s_year):
         return r_year
 
 
+def _clean_data(data, rules=None):
+    """Perform the clean-up steps of :func:`clean_json` on a root entity
+    dictionary.
+
+    Each process's exchange list is rebuilt in one pass: every exchange is
+    run through the exchange rules, in order, and is dropped if a rule
+    says so. Exchange internal IDs are then numbered consecutively.
+
+    Parameters
+    ----------
+    data : dict
+        A dictionary of root entity registries (see
+        :func:`_root_entity_dict`).
+    rules : list, optional
+        The exchange rules, as (name, function) tuples, by default None
+        (see :func:`_clean_rules`). A rule function takes the process, the
+        exchange, its flow object, and the root entity dictionary, and
+        returns True if it modified the exchange or its flow, False if it
+        did not, or :data:`_DROP` to remove the exchange.
+
+    Returns
+    -------
+    tuple
+        dict : The same dictionary, cleaned.
+        dict : Rule names and their number of hits ('hits') and run time
+            ('seconds').
+    """
+    logging.info("Cleaning JSON-LD")
+    if rules is None:
+        rules = _clean_rules()
+    stats = {name: {'hits': 0, 'seconds': 0.0} for name, _ in rules}
+
+    for p in data["Process"]['objs']:
+        e_list = []
+        for e in p.exchanges or []:
+            # Get the flow object
+            f_obj = data["Flow"].get(e.flow.id)
+            if f_obj is None:
+                logging.warning("Missing flow, %s (%s), in %s" % (
+                    e.flow.name, e.flow.id, p.name))
+                e_list.append(e)
+                continue
+
+            for name, rule in rules:
+                t_start = time.perf_counter()
+                r_val = rule(p, e, f_obj, data)
+                stats[name]['seconds'] += time.perf_counter() - t_start
+                if r_val:
+                    stats[name]['hits'] += 1
+                if r_val is _DROP:
+                    break
+                elif r_val:
+                    # The rule may have swapped the exchange's flow
+                    f_obj = data["Flow"].get(e.flow.id, f_obj)
+            else:
+                e_list.append(e)
+
+        # Re-number the internal IDs of the exchanges to a consecutive order.
+        p.exchanges = e_list
+        p.last_internal_id = 0
+        for e in p.exchanges:
+            p.last_internal_id += 1
+            e.internal_id = p.last_internal_id
+
+    for name, _ in rules:
+        logging.info("Clean-up rule '%s': %d hits in %.3f s" % (
+            name, stats[name]['hits'], stats[name]['seconds']))
+
+    if _PROFILE is not None:
+        _PROFILE.clean_rules = stats
+
+    return (data, stats)
+
+
+def _clean_rules():
+    """Return the default exchange rules of :func:`clean_json`.
+
+    Returns
+    -------
+    list
+        A list of (name, function) tuples, in the order they are run.
+    """
+    return [
+        ("zero product flow", _rule_zero_product),
+        ("resource direction", _rule_resource_direction),
+        ("heat to FEDEFL", _rule_heat_to_fedefl),
+        ("elementary flows category", _rule_elementary_category),
+        ("NAICS category", _rule_naics_category),
+    ]
+
+
+def _close_archive(json_file):
+    """Close the file handle of an archive opened by :func:`_open_archive`
+    (e.g., before the file is replaced); unread entities from the archive
+    are read from the new file on demand.
+
+    Parameters
+    ----------
+    json_file : str
+        A file path to a JSON-LD zip archive.
+    """
+    archive = _ARCHIVES.get(os.path.abspath(json_file))
+    if archive is not None:
+        archive.close()
+
+
 def _current_time():
-    """Return a ISO-formatted time stamp for right now.
+    """Return a ISO-formatted time stamp for right now (or the pinned time
+    stamp; see :func:`set_time_stamp`).
 
     Returns
     -------
@@ -630,17 +1656,22 @@ def _current_time():
     >>> _current_time()
     '2023-10-25T21:06:19.200675+00:00'
     """
+    if _TIME_STAMP is not None:
+        return _TIME_STAMP.isoformat()
     return datetime.datetime.now(pytz.utc).isoformat()
 
 
 def _current_year():
-    """Return today's calendar year.
+    """Return today's calendar year (or that of the pinned time stamp;
+    see :func:`set_time_stamp`).
 
     Returns
     -------
     int
         Year.
     """
+    if _TIME_STAMP is not None:
+        return _TIME_STAMP.year
     return datetime.datetime.now(pytz.utc).year
 
 
@@ -712,29 +1743,47 @@ def _dq_system(dict_d, dict_s, dq_type):
 
     dq_id = _val(dq, '@id')
     dq_name = _val(dq, 'name', default="none")
-    if dq_id in dict_s['DQSystem']['ids']:
-        idx = dict_s['DQSystem']['ids'].index(dq_id)
-        dq_obj = dict_s['DQSystem']['objs'][idx]
+    if dq_id in dict_s['DQSystem']:
+        dq_obj = dict_s['DQSystem'].get(dq_id)
         logging.debug("Found existing DQSystem, %s" % dq_obj.name)
     else:
         logging.debug("Creating new DQSystem entity for '%s'" % dq_name)
-        dq_obj = o.DQSystem()
+        dq_obj = o.DQSystem(last_change=_current_time())
         # HOTFIX: pre-defined UUIDs are set using version 4 (not 3)
-        if not _uid_is_valid(dq_id, 4):
+        if not is_valid_uuid(dq_id, 4):
             # HOTFIX: add standard UUID naming
             logging.debug("Generating DQSystem UUID")
-            dq_id = _uid(o.ModelType.DQ_SYSTEM, dq_type, dq_name)
+            dq_id = make_uuid(o.ModelType.DQ_SYSTEM, dq_type, dq_name)
         dq_obj.id = dq_id
         dq_obj.name = dq_name
         dq_obj.description = dq_desc
         # NOTE: uncertainty, indicators, and source are not included here!
-        dict_s['DQSystem']['ids'].append(dq_obj.id)
-        dict_s['DQSystem']['objs'].append(dq_obj)
+        dict_s['DQSystem'].add(dq_obj.id, dq_obj)
     return (dq_obj.to_ref(), dict_s)
 
 
-def _exchange(dict_d, dict_s):
-    """Generate an Exchange object.
+def _entities_to_json(start, stop):
+    """Serialize a slice of the root entities in :data:`_TO_JSON`.
+
+    Called in forked worker processes by :func:`_iter_json`, which inherit
+    the entity list (i.e., the entities are not pickled).
+
+    Parameters
+    ----------
+    start, stop : int
+        The slice of the entity list.
+
+    Returns
+    -------
+    list
+        The entities' JSON strings.
+    """
+    return [x.to_json() for x in _TO_JSON[start:stop]]
+
+
+def _exchange(dict_d, dict_s, f_cache=None):
+    """Resolve the root entities (e.g., flow and provider) referenced by an
+    exchange.
 
     Note that the process_dictionary_writer.py methods responsible for
     generating the data dictionary for exchanges does not include location
@@ -745,6 +1794,9 @@ def _exchange(dict_d, dict_s):
     duplicate input or output flows within the same process, so they can be
     linked to different providers.
 
+    The Exchange object itself is made by :func:`_make_exchanges`, which
+    does not depend on the root entity dictionary.
+
     Parameters
     ----------
     dict_d : dict
@@ -765,14 +1817,16 @@ def _exchange(dict_d, dict_s):
         - amountFormula : str
         - unit : dict
         - pedigreeUncertainty : str
-
     dict_s : dict
         Dictionary with olca-schema root entity information.
+    f_cache : dict, optional
+        A cache of new flows (see :func:`_flow`), by default None.
 
     Returns
     -------
     tuple
-        olca_schema.Exchange : Exchange object (or NoneType)
+        tuple : The exchange dictionary and its flow property, flow, and
+            provider references (or NoneType)
         dict : The olca-schema root entity dictionary, updated
     """
     # Error handle missing data:
@@ -780,41 +1834,28 @@ def _exchange(dict_d, dict_s):
         logging.debug("No exchange data!")
         return (None, dict_s)
 
-    e = o.Exchange.from_dict({
-        'isQuantitativeReference': _val(
-            dict_d, 'quantitativeReference', default=False),
-        'isInput': _val(dict_d, 'input', default=False),
-        'isAvoidedProduct': _val(dict_d, 'avoidedProduct', default=False),
-        'amount': _val(dict_d, 'amount', default=0.0),
-        'dqEntry': _format_dq_entry(_val(dict_d, 'dqEntry')),
-        'description': _val(dict_d, 'comment')
-    })
-
-    # Set unit (uses olca unit references)
-    unit_name = _val(dict_d, 'unit', default='kg')
-    e.unit = _unit(unit_name)
-
     # Set reference to flow property
+    unit_name = _val(dict_d, 'unit', default='kg')
     f_prop = _flow_property(unit_name, dict_s)
+    fp_ref = None
     if f_prop is not None:
-        e.flow_property = f_prop.to_ref()
+        fp_ref = f_prop.to_ref()
 
-    # Set flow and uncertainty
-    e.flow, dict_s = _flow(_val(dict_d, 'flow'), f_prop, dict_s)
-    e.uncertainty = _uncertainty(_val(dict_d, 'uncertainty'))
+    # Set flow
+    f_ref, dict_s = _flow(_val(dict_d, 'flow'), f_prop, dict_s, f_cache)
 
     # Find the provider process reference (or create one);
     #  note that this does not update the dict_s entries, but searches them!
     #  BUG: are you sure this doesn't update dict_s?
     p_ref, dict_s, _ = _process(_val(dict_d, 'provider'), dict_s)
     if p_ref is not None:
-        e.default_provider = p_ref.to_ref()
+        p_ref = p_ref.to_ref()
 
-    return (e, dict_s)
+    return ((dict_d, fp_ref, f_ref, p_ref), dict_s)
 
 
-def _exchange_list(dict_d, dict_s):
-    """Generates a list of exchanges.
+def _exchange_list(dict_d, dict_s, f_cache=None):
+    """Resolve the root entities referenced by a process's exchanges.
 
     Parameters
     ----------
@@ -824,30 +1865,61 @@ def _exchange_list(dict_d, dict_s):
         dictionaries, where each dictionary describes an exchange.
     dict_s : dict
         Data dictionary for storing olca-schema root entities.
+    f_cache : dict, optional
+        A cache of new flows (see :func:`_flow`), by default None.
 
     Returns
     -------
     tuple
-        list : List of Exchange objects
+        list : List of exchange tuples (see :func:`_exchange`) for
+            :func:`_make_exchanges`
         dict : The olca-schema root entity dictionary, updated
-        olca_schema.Exchange or NoneType : quantitative reference exchange
     """
     r_list = []
-    last_id = 0
-    q_ref = None
     for e in _val(dict_d, 'exchanges', default=[]):
-        ex_obj, dict_s = _exchange(e, dict_s)
-        if ex_obj is not None:
-            last_id += 1
-            ex_obj.internal_id = last_id
-            r_list.append(ex_obj)
+        ex_tup, dict_s = _exchange(e, dict_s, f_cache)
+        if ex_tup is not None:
+            r_list.append(ex_tup)
+
+    return (r_list, dict_s)
+
 
-            # NOTE: there should be at most one quantitative reference in an
-            # exchange list; if there is more than one, then the last
-            # instance is returned.
-            if ex_obj.is_quantitative_reference:
-                q_ref = ex_obj
-    return (r_list, dict_s, q_ref)
+def _fedefl_update(data):
+    """Replace flows found in the Federal Elementary Flow List with their
+    FEDEFL versions.
+
+    Flows are created with perfunctory metadata (see :func:`_flow`) and
+    FEDEFL flows are written to JSON-LD by fedelemflowlist, so reading back
+    a JSON-LD file replaces them with their full FEDEFL metadata. This
+    method does the same for data held in memory.
+
+    Parameters
+    ----------
+    data : dict
+        A dictionary of root entity registries (see
+        :func:`_root_entity_dict`).
+
+    Returns
+    -------
+    dict
+        The same dictionary with FEDEFL flows updated.
+    """
+    flows = select_fedefl_flows(data['Flow'].ids())
+    logging.info("Updating %d flows with FEDEFL metadata" % len(flows))
+    with tempfile.TemporaryDirectory() as t_dir:
+        t_file = os.path.join(t_dir, "fedefl.zip")
+        with zipio.ZipWriter(t_file) as writer:
+            fedelemflowlist.write_jsonld(flows, path=None, zw=writer)
+        f_data = _read_jsonld(t_file, _root_entity_dict())
+
+    for k in f_data.keys():
+        for uid, obj in f_data[k].items():
+            # Flows are replaced; other entities (e.g., flow properties)
+            # are added only if missing.
+            if k == 'Flow' or uid not in data[k]:
+                data[k].add(uid, obj)
+
+    return data
 
 
 def _find_dq(dict_d, dict_key):
@@ -901,7 +1973,7 @@ def _find_ref_exchange(p):
     return e_obj
 
 
-def _flow(dict_d, flowprop, dict_s):
+def _flow(dict_d, flowprop, dict_s, f_cache=None):
     """Generate a reference to a flow object.
 
     Called by :func:`_exchange`.
@@ -914,6 +1986,10 @@ def _flow(dict_d, flowprop, dict_s):
         FlowProperty or Ref to a FlowProperty object.
     dict_s : dict
         Dictionary with olca_schema root entities.
+    f_cache : dict, optional
+        A cache of the new flows made from the same flow data, by default
+        None. New flows replace any flow with the same UUID in the root
+        entity dictionary; the cache only saves re-making them.
 
     Returns
     -------
@@ -934,19 +2010,33 @@ def _flow(dict_d, flowprop, dict_s):
     # it duplicates every waste flow in the JSON-LD [2023-12-05; TWD]
 
     # Check for flow existence
-    if uid in dict_s['Flow']['ids']:
-        idx = dict_s['Flow']['ids'].index(uid)
-        flow = dict_s['Flow']['objs'][idx]
+    f_key = (
+        uid,
+        name,
+        category_path,
+        _val(dict_d, 'flowType'),
+        getattr(flowprop, 'id', None),
+    )
+    if uid in dict_s['Flow']:
+        _add_lookup('flow', True)
+        flow = dict_s['Flow'].get(uid)
         logging.debug("Found previous flow, '%s'" % flow.name)
+    elif f_cache is not None and f_key in f_cache:
+        _add_lookup('flow', True)
+        flow = f_cache[f_key]
+        if is_waste:
+            dict_d['flowType'] = "WASTE_FLOW"
+        dict_s['Flow'].add(flow.id, flow)
     else:
+        _add_lookup('flow', False)
         logging.debug("Creating new flow for, '%s' (%s)" % (name, uid))
-        if _uid_is_valid(uid, 3) or _uid_is_valid(uid, 4):
+        if is_valid_uuid(uid, 3) or is_valid_uuid(uid, 4):
             # Keep the good UUID
             pass
         else:
             # Generate new v3 ID based on standard format
             logging.debug("Generating new UUID for flow, '%s'" % name)
-            uid = _uid(o.ModelType.FLOW, category_path, name)
+            uid = make_uuid(o.ModelType.FLOW, category_path, name)
 
         # Correct the default flow type for waste flows.
         def_type = "ELEMENTARY_FLOW"
@@ -959,11 +2049,13 @@ def _flow(dict_d, flowprop, dict_s):
 
         # Add perfunctory flow metadata now; update w/ FEDEFL metadata in post
         flow.id = uid
+        flow.last_change = _current_time()
         flow.category = category_path
 
         # Update master list
-        dict_s['Flow']['ids'].append(uid)
-        dict_s['Flow']['objs'].append(flow)
+        dict_s['Flow'].add(uid, flow)
+        if f_cache is not None:
+            f_cache[f_key] = flow
     return (flow.to_ref(), dict_s)
 
 
@@ -1032,10 +2124,9 @@ def _flow_property(unit_name, dict_s):
     if p_ref is None:
         logging.error(
             "Unknown unit, '%s'; no flow property reference!" % unit_name)
-    elif p_ref.id in dict_s['FlowProperty']['ids']:
+    elif p_ref.id in dict_s['FlowProperty']:
         logging.debug("Reading existing flow property")
-        pid = dict_s['FlowProperty']['ids'].index(p_ref.id)
-        r_obj = dict_s['FlowProperty']['objs'][pid]
+        r_obj = dict_s['FlowProperty'].get(p_ref.id)
     else:
         # Assumes federal elementary flow list was used to populate flow
         # properties; therefore, the old way of trying to recreate a
@@ -1179,9 +2270,8 @@ def _init_root_entities(json_file):
     -------
     dict
         Dictionary with primary keys for each root entity (camel-case).
-        The values are dictionaries with three keys: 'class', 'objs', and 'ids'.
-        The 'ids' list is for quick referencing and 'objs' list is for actual
-        writing to file. The 'class' is value added (if needed).
+        The values are :class:`RootEntityRegistry` objects (see
+        :func:`_root_entity_dict`).
     """
     # Create the empty dictionary for each olca schema root entity
     # (these are the ones that need to be written to the JSON-LD zip file)
@@ -1191,7 +2281,7 @@ def _init_root_entities(json_file):
     # if so, read the old root entity data; otherwise, add data from the
     # Federal LCA Commons (e.g., unit groups, flow properties, and DQI data).
     if os.path.exists(json_file):
-        r_dict = _read_jsonld(json_file, r_dict)
+        r_dict = _read_jsonld(json_file, r_dict, lazy=True)
     else:
         r_dict = _add_fed_commons(r_dict)
 
@@ -1218,6 +2308,52 @@ def _isnum(n):
     return not math.isnan(n)
 
 
+def _iter_json(entities, parallel=False):
+    """Serialize root entities to JSON strings, in order.
+
+    Parameters
+    ----------
+    entities : list
+        The olca-schema root entities.
+    parallel : bool, optional
+        Whether to serialize in parallel worker processes, by default
+        False. Requires an operating system that can fork processes;
+        otherwise, entities are serialized serially. The results are the
+        same either way.
+
+    Yields
+    ------
+    str
+        Each entity's JSON string.
+    """
+    global _TO_JSON
+    mp_context = None
+    if parallel and len(entities) > 1:
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            logging.warning(
+                "Parallel JSON-LD writing requires forked processes; "
+                "serializing entities serially")
+    if mp_context is None:
+        for x in entities:
+            yield x.to_json()
+        return
+
+    logging.info("Serializing %d entities in parallel" % len(entities))
+    # Worker processes inherit the entity list when they are forked.
+    _TO_JSON = entities
+    try:
+        with ProcessPoolExecutor(mp_context=mp_context) as executor:
+            chunk = max(1, len(entities) // (4 * (os.cpu_count() or 1)))
+            starts = range(0, len(entities), chunk)
+            stops = [x + chunk for x in starts]
+            for j_list in executor.map(_entities_to_json, starts, stops):
+                yield from j_list
+    finally:
+        _TO_JSON = []
+
+
 def _location(dict_d, dict_s):
     """Create a new location or reference an existing one.
 
@@ -1264,34 +2400,37 @@ def _location(dict_d, dict_s):
         return (None, dict_s)
 
     # Check for valid UUID; otherwise, generate one
-    if not _uid_is_valid(uid):
-        uid = _uid(o.ModelType.LOCATION, code)
+    if not is_valid_uuid(uid):
+        uid = make_uuid(o.ModelType.LOCATION, code)
 
     # Check if location already exists in our records; otherwise, create
     # and record the new location.
-    if uid in dict_s['Location']['ids']:
-        idx = dict_s['Location']['ids'].index(uid)
-        location = dict_s['Location']['objs'][idx]
+    if uid in dict_s['Location']:
+        _add_lookup('location', True)
+        location = dict_s['Location'].get(uid)
         logging.debug("Using existing location, %s" % location.name)
     else:
+        _add_lookup('location', False)
         logging.debug("Creating new location entry for '%s'" % code)
-        location = o.Location(id=uid, code=code)
+        location = o.Location(
+            id=uid, code=code, last_change=_current_time())
         location.name = code
         location.latitude = _val(dict_d, 'latitude')
         location.longitude = _val(dict_d, 'longitude')
         location.description = _val(dict_d, 'description')
-        dict_s['Location']['ids'].append(uid)
-        dict_s['Location']['objs'].append(location)
+        dict_s['Location'].add(uid, location)
     return (location.to_ref(), dict_s)
 
 
 def _make_entity_dict(e_dict, e_key):
-    """Convenience function to convert two lists into a single dictionary.
+    """Convenience function to convert a root entity registry into a
+    dictionary.
 
     Parameters
     ----------
     e_dict : dict
-        A data dictionary containing olca schema UUIDs (ids) and their respective class objects (objs)
+        A data dictionary containing olca schema root entity registries
+        (see :func:`_root_entity_dict`).
     e_key : str
         The data dictionary key to convert into a dictionary; corresponds to olca root entity names (e.g., 'Actor' or 'Flow')
 
@@ -1299,14 +2438,12 @@ def _make_entity_dict(e_dict, e_key):
     -------
     dict
         A dictionary of UUID keys and their class objects as values.
+        Entities not yet read from file are kept unread (see
+        :class:`_LazyEntity`).
     """
     r_dict = {}
-    num_ids = len(e_dict[e_key]['ids'])
-    for i in range(num_ids):
-        uid = e_dict[e_key]['ids'][i]
-        try:
-            obj = e_dict[e_key]['objs'][i]
-        except IndexError:
+    for uid, obj in e_dict[e_key]._raw_items():
+        if obj is None:
             # Happens, for example, if current data dictionary was
             # created with IDs only (i.e., no objects). Since we
             # don't have the object data, it isn't getting copied!
@@ -1318,13 +2455,65 @@ def _make_entity_dict(e_dict, e_key):
     return r_dict
 
 
-def _make_product_system(f_path, process, description=""):
+def _make_exchanges(e_list):
+    """Generate a process's Exchange objects.
+
+    Parameters
+    ----------
+    e_list : list
+        Exchange tuples, as provided by :func:`_exchange_list`.
+
+    Returns
+    -------
+    tuple
+        list : List of Exchange objects, with consecutive internal IDs
+        olca_schema.Exchange or NoneType : quantitative reference exchange
+    """
+    r_list = []
+    last_id = 0
+    q_ref = None
+    for dict_d, fp_ref, f_ref, p_ref in e_list:
+        e = o.Exchange.from_dict({
+            'isQuantitativeReference': _val(
+                dict_d, 'quantitativeReference', default=False),
+            'isInput': _val(dict_d, 'input', default=False),
+            'isAvoidedProduct': _val(dict_d, 'avoidedProduct', default=False),
+            'amount': _val(dict_d, 'amount', default=0.0),
+            'dqEntry': _format_dq_entry(_val(dict_d, 'dqEntry')),
+            'description': _val(dict_d, 'comment')
+        })
+
+        # Set unit (uses olca unit references)
+        e.unit = _unit(_val(dict_d, 'unit', default='kg'))
+
+        # Set flow property, flow, uncertainty, and provider
+        if fp_ref is not None:
+            e.flow_property = fp_ref
+        e.flow = f_ref
+        e.uncertainty = _uncertainty(_val(dict_d, 'uncertainty'))
+        if p_ref is not None:
+            e.default_provider = p_ref
+
+        last_id += 1
+        e.internal_id = last_id
+        r_list.append(e)
+
+        # NOTE: there should be at most one quantitative reference in an
+        # exchange list; if there is more than one, then the last
+        # instance is returned.
+        if e.is_quantitative_reference:
+            q_ref = e
+
+    return (r_list, q_ref)
+
+
+def _make_product_system(graph, process, description=""):
     """Generate a product system for a given process.
 
     Parameters
     ----------
-    f_path : str
-        A file path to an existing JSON-LD file with all process data saved.
+    graph : _ProviderGraph
+        The default provider graph of all processes.
     process : olca-schema.Process
         A Process object to be converted to a Product System.
     description : str, optional
@@ -1338,10 +2527,11 @@ def _make_product_system(f_path, process, description=""):
     # Find the reference process
     r_ex = _find_ref_exchange(process)
 
-    # Create a new product system
+    # Create a new product system, identified by its reference process
     # https://greendelta.github.io/olca-schema/classes/ProductSystem.html
-    # NOTE: ``last_change`` automatically set to current date/time
     product = o.ProductSystem(
+        id=make_uuid(o.ModelType.PRODUCT_SYSTEM, process.id),
+        last_change=_current_time(),
         description=description,
         name=process.name,
         ref_exchange=o.ExchangeRef(r_ex.internal_id),
@@ -1352,16 +2542,11 @@ def _make_product_system(f_path, process, description=""):
         version=process.version
     )
 
-    f = zipio.ZipReader(f_path)
-
-    # Build processLinks and processes; hotfix w/ empty lists
-    ex_list, pd_list = _build_supply_chain(f, process.id, [], [])
-    product.processes = [
-        _make_process_ref(f.read(o.Process, x)) for x in pd_list]
+    # Build processLinks and processes
+    ex_list, pd_list = graph.supply_chain(process.id)
+    product.processes = pd_list
     product.process_links = ex_list
 
-    f.close()
-
     return product
 
 
@@ -1426,11 +2611,54 @@ def _match_process_names(p_list, q):
     return r_list
 
 
-def _process(dict_d, dict_s):
-    """Generate a new Process object.
+def _open_archive(json_file):
+    """Return the shared, on-demand reader of a JSON-LD zip archive.
 
-    If the process includes exchanges, and one of the exchanges is marked
-    as a quantitative reference, then that exchange object is also returned.
+    Parameters
+    ----------
+    json_file : str
+        A file path to a JSON-LD zip archive.
+
+    Returns
+    -------
+    _JsonldArchive
+        The archive reader.
+    """
+    key = os.path.abspath(json_file)
+    if key not in _ARCHIVES:
+        _ARCHIVES[key] = _JsonldArchive(json_file)
+    return _ARCHIVES[key]
+
+
+def _peak_rss():
+    """Return the peak resident set size of this process and its finished
+    child processes.
+
+    Returns
+    -------
+    dict or NoneType
+        The peak memory (MB) of 'self' and 'children'; NoneType if not
+        available (e.g., on Windows).
+    """
+    if resource is None:
+        return None
+    # Linux reports kilobytes; macOS reports bytes.
+    scale = 1024.0**2 if sys.platform == "darwin" else 1024.0
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+        'children': resource.getrusage(
+            resource.RUSAGE_CHILDREN).ru_maxrss / scale,
+    }
+
+
+def _plan_process(dict_d, dict_s, f_cache=None):
+    """Generate a new Process object without its exchanges.
+
+    This is the first of two steps to making a process: the process and all
+    root entities it references (e.g., locations, actors, sources, flows,
+    and providers) are resolved and recorded in the root entity dictionary.
+    The second step, :func:`_make_exchanges`, makes the exchanges, which
+    does not depend on the root entity dictionary.
 
     Parameters
     ----------
@@ -1438,13 +2666,16 @@ def _process(dict_d, dict_s):
         Process data dictionary.
     dict_s : dict
         olca-schema root entity dictionary.
+    f_cache : dict, optional
+        A cache of new flows (see :func:`_flow`), by default None.
 
     Returns
     -------
     tuple
         olca_schema.Process or NoneType : the process object
         dict : the root entity dictionary, updated
-        olca_schema.Exchange or NoneType : quantitative reference exchange
+        list or NoneType : exchange tuples for :func:`_make_exchanges`;
+            NoneType for an existing process.
     """
     if not isinstance(dict_d, dict):
         return (None, dict_s, None)
@@ -1457,23 +2688,22 @@ def _process(dict_d, dict_s):
     # Generate the standardized UUID, if absent
     if uid is None:
         logging.debug("Generating new process UUID for '%s'" % name)
-        uid = _uid(
+        uid = make_uuid(
             o.ModelType.PROCESS,
             category,
             location_code,
             name)
 
     # Check for process existence:
-    if uid in dict_s['Process']['ids']:
-        idx = dict_s['Process']['ids'].index(uid)
-        p = dict_s['Process']['objs'][idx]
+    if uid in dict_s['Process']:
+        p = dict_s['Process'].get(uid)
         logging.debug("Found existing process, %s" % p.name)
-        # HOTFIX: add missing e_ref from existing process
-        e_ref = _find_ref_exchange(p)
+        e_list = None
     else:
         logging.debug("Creating new Process entity for '%s'" % name)
         p = o.new_process(name=name)
         p.id = uid
+        p.last_change = _current_time()
         p.category = category
         p.version = _val(dict_d, 'version', default=VERSION)
         p.description = _val(dict_d, 'description')
@@ -1500,7 +2730,40 @@ def _process(dict_d, dict_s):
             dict_d, dict_s, 'exchangeDqSystem'
         )
 
-        p.exchanges, dict_s, e_ref = _exchange_list(dict_d, dict_s)
+        e_list, dict_s = _exchange_list(dict_d, dict_s, f_cache)
+
+    return (p, dict_s, e_list)
+
+
+def _process(dict_d, dict_s):
+    """Generate a new Process object.
+
+    If the process includes exchanges, and one of the exchanges is marked
+    as a quantitative reference, then that exchange object is also returned.
+
+    Parameters
+    ----------
+    dict_d : dict
+        Process data dictionary.
+    dict_s : dict
+        olca-schema root entity dictionary.
+
+    Returns
+    -------
+    tuple
+        olca_schema.Process or NoneType : the process object
+        dict : the root entity dictionary, updated
+        olca_schema.Exchange or NoneType : quantitative reference exchange
+    """
+    p, dict_s, e_list = _plan_process(dict_d, dict_s)
+    if p is None:
+        return (None, dict_s, None)
+
+    if e_list is None:
+        # HOTFIX: add missing e_ref from existing process
+        e_ref = _find_ref_exchange(p)
+    else:
+        p.exchanges, e_ref = _make_exchanges(e_list)
 
     return (p, dict_s, e_ref)
 
@@ -1582,6 +2845,27 @@ def _process_doc(dict_d, dict_s):
     return (doc, dict_s)
 
 
+@contextlib.contextmanager
+def _profiled(name):
+    """Time a stage of the JSON-LD writer, if a profile is running (see
+    :class:`WriteProfile`).
+
+    Parameters
+    ----------
+    name : str
+        The stage name (e.g., 'write_jsonld').
+    """
+    profile = _PROFILE
+    if profile is None:
+        yield
+        return
+    t_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_stage(name, time.perf_counter() - t_start)
+
+
 def _read_fedefl():
     """Return list of GreenDelta's unit group and flow property objects.
 
@@ -1663,17 +2947,11 @@ def _read_fedefl():
 
     # Only read locally if needed (i.e., if data wasn't just downloaded)
     if os.path.exists(u_path) and len(u_list) == 0:
-        logging.info("Reading unit groups from local JSON")
-        with open(u_path, 'r') as f:
-            my_list = json.load(f)
-        for my_item in my_list:
+        for my_item in _read_json_list(u_path):
             u_list.append(o.UnitGroup.from_dict(my_item))
 
     if os.path.exists(p_path) and len(p_list) == 0:
-        logging.info("Reading flow properties from local JSON")
-        with open(p_path, 'r') as f:
-            my_list = json.load(f)
-        for my_item in my_list:
+        for my_item in _read_json_list(p_path):
             p_list.append(o.FlowProperty.from_dict(my_item))
 
     return (u_list, p_list)
@@ -1757,23 +3035,39 @@ def _read_fedcore():
 
     # Only read locally if needed (i.e., if data wasn't just downloaded)
     if os.path.exists(d_path) and len(d_list) == 0:
-        logging.info("Reading DQSystems from local JSON")
-        with open(d_path, 'r') as f:
-            my_list = json.load(f)
-        for my_item in my_list:
+        for my_item in _read_json_list(d_path):
             d_list.append(o.DQSystem.from_dict(my_item))
 
     if os.path.exists(s_path) and len(s_list) == 0:
-        logging.info("Reading DQI sources from local JSON")
-        with open(s_path, 'r') as f:
-            my_list = json.load(f)
-        for my_item in my_list:
+        for my_item in _read_json_list(s_path):
             s_list.append(o.Source.from_dict(my_item))
 
     return (d_list, s_list)
 
 
-def _read_jsonld(json_file, root_dict, id_only=False):
+# lru_cache allows us to only read each JSON file once.
+@lru_cache(maxsize=10)
+def _read_json_list(file_path):
+    """Read a list of root entity dictionaries from a local JSON file.
+
+    Parameters
+    ----------
+    file_path : str
+        A file path to a JSON file (e.g., as written by
+        :func:`_archive_json`).
+
+    Returns
+    -------
+    tuple
+        The root entity dictionaries. New olca-schema objects should be
+        made from these for each call, as the same tuple is returned.
+    """
+    logging.info("Reading %s from local JSON" % os.path.basename(file_path))
+    with open(file_path, 'r') as f:
+        return tuple(json.load(f))
+
+
+def _read_jsonld(json_file, root_dict, id_only=False, lazy=False):
     """Read root entities from JSON-LD file and append to root entity
     dictionary.
 
@@ -1787,11 +3081,17 @@ def _read_jsonld(json_file, root_dict, id_only=False):
     id_only : bool
         Whether to save UUIDs and olca-schema class objects.
         If true, only 'ids' list is read.
+    lazy : bool, optional
+        Whether to register the root entities unread, by default False.
+        Unread entities are parsed when they are first accessed (see
+        :class:`RootEntityRegistry`), so only the entities used are held
+        in memory. The file must not be deleted while it has unread
+        entities.
 
     Returns
     -------
     dict
-        The same root entity dictionary with 'ids' and 'objs' lists updated.
+        The same root entity dictionary with its registries updated.
 
     Raises
     ------
@@ -1801,9 +3101,9 @@ def _read_jsonld(json_file, root_dict, id_only=False):
     Notes
     -----
     -   Methods are based on those from NETL's NetlOlca Python class.
-    -   Reads full Class objects into memory (when `id_only` is false),
-        which may be large for large projects (e.g., >2000 flows in the
-        2016 baseline).
+    -   Reads full Class objects into memory (when `id_only` and `lazy`
+        are false), which may be large for large projects (e.g., >2000
+        flows in the 2016 baseline).
 
     Examples
     --------
@@ -1823,40 +3123,37 @@ def _read_jsonld(json_file, root_dict, id_only=False):
     """
     if not os.path.isfile(json_file):
         raise OSError("File not found! %s" % json_file)
+
+    # Create a file handle to the JSON-LD zip
+    logging.info("Opening JSON-LD file, %s" % os.path.basename(json_file))
+    if lazy:
+        j_file = _open_archive(json_file)
     else:
-        # Create a file handle to the JSON-LD zip
-        logging.info("Opening JSON-LD file, %s" % os.path.basename(json_file))
-        j_file = zipio.ZipReader(json_file)
-        for name in root_dict.keys():
-            # Get IDs for each root entity
-            spec = root_dict[name]['class']
-            r_ids = j_file.ids_of(spec)
-            logging.info("Read %d UUIDs for %s" % (len(r_ids), name))
-            # Get the root entity object based on its type
-            for rid in r_ids:
-                # Only read from file when a new UUID is found.
-                # (easier to debug this way, rather than a set for unique vals)
-                if rid in root_dict[name]['ids']:
-                    logging.debug(
-                        "Skipping existing UUID for %s (%s)" % (name, rid))
-                else:
-                    if id_only:
-                        root_dict[name]['ids'].append(rid)
-                    else:
-                        r_obj = None
-                        try:
-                            r_obj = j_file.read(spec, rid)
-                        except Exception as e:
-                            logging.warning(
-                                "Failed to read %s (%s) from file! %s" % (
-                                    name, rid, str(e)))
-                        # Add the UUID and Class object pair to their lists
-                        if r_obj is not None:
-                            root_dict[name]['ids'].append(rid)
-                            root_dict[name]['objs'].append(r_obj)
+        j_file = _JsonldArchive(json_file)
+    for name in root_dict.keys():
+        # Get IDs for each root entity
+        spec = root_dict[name]['class']
+        r_ids = j_file.ids_of(spec)
+        logging.info("Read %d UUIDs for %s" % (len(r_ids), name))
+        # Get the root entity object based on its type
+        for rid in r_ids:
+            # Only read from file when a new UUID is found.
+            if rid in root_dict[name]:
+                logging.debug(
+                    "Skipping existing UUID for %s (%s)" % (name, rid))
+            elif id_only:
+                root_dict[name].add(rid)
+            elif lazy:
+                root_dict[name].add(rid, _LazyEntity(j_file, spec, rid))
+            else:
+                # Add the UUID and Class object pair to the registry
+                r_obj = _LazyEntity(j_file, spec, rid).load()
+                if r_obj is not None:
+                    root_dict[name].add(rid, r_obj)
+    if not lazy:
         j_file.close()
 
-        return root_dict
+    return root_dict
 
 
 def _rm_untracked_flows(data):
@@ -1881,119 +3178,154 @@ def _rm_untracked_flows(data):
     This finds 'Heat' technosphere input flow and elementary resource flow,
     which (somewhere in v2) are replaced with 'Energy, heat' elementary resource flow (from air).
     """
-    # Pull full flow list (for removing untracked flows)
-    f_list = sorted(data["Flow"]['ids'])
-
-    # Initialize exchange flows
-    e_list = []
-
-    # Add flows to list of tracked exchanges
+    # Add flows to set of tracked exchanges
+    e_set = set()
     for p in data["Process"]['objs']:
         for e in p.exchanges:
-            e_list.append(e.flow.id)
-
-    # Sort unique values to speed up search
-    e_list = sorted(list(set(e_list)))
+            e_set.add(e.flow.id)
 
     # Remove untracked flows (i.e., any flows that aren't in an exchange)
-    u_list = [x for x in f_list if x not in e_list]
+    u_list = sorted([x for x in data["Flow"].ids() if x not in e_set])
     logging.info("Removing %d untracked flows" % len(u_list))
     for u_id in u_list:
-        idx = data["Flow"]['ids'].index(u_id)
+        f_obj = data['Flow'].get(u_id)
         logging.info("Untracked flow: '%s' in '%s'" % (
-            data['Flow']['objs'][idx].name,
-            data['Flow']['objs'][idx].category,
+            getattr(f_obj, 'name', None),
+            getattr(f_obj, 'category', None),
         ))
-        data['Flow']['ids'].pop(idx)
-        data['Flow']['objs'].pop(idx)
+    data['Flow'].remove(u_list)
 
     return data
 
 
 def _root_entity_dict():
-    """Generate empty dictionary for each openLCA schema root entity.
+    """Generate an empty registry for each openLCA schema root entity.
 
     Returns
     -------
     dict
         Dictionary with primary keys for each root entity (camel-case).
-        The values are dictionaries with three keys: 'class', 'objs', and 'ids'.
-        The 'ids' list is for quick referencing and 'objs' list is for actual
-        writing to file. The 'class' is value added (if needed).
+        The values are :class:`RootEntityRegistry` objects, which provide
+        lookups by UUID and (for compatibility) the 'class', 'objs', and
+        'ids' keys. The 'ids' list is for quick referencing and 'objs' list
+        is for actual writing to file. The 'class' is value added (if needed).
     """
     return {
-        'Actor': {
-            'class': o.Actor,
-            'objs': [],
-            'ids': []},
-        "Currency": {
-            'class': o.Currency,
-            'objs': [],
-            'ids': []},
-        'DQSystem': {
-            'class': o.DQSystem,
-            'objs': [],
-            'ids': []},
-        'EPD': {
-            'class': o.Epd,
-            'objs': [],
-            'ids': []},
-        'Flow': {
-            'class': o.Flow,
-            'objs': [],
-            'ids': []},
-        'FlowProperty': {
-            'class': o.FlowProperty,
-            'objs': [],
-            'ids': []},
-        'ImpactCategory': {
-            'class': o.ImpactCategory,
-            'objs': [],
-            'ids': []},
-        'ImpactMethod': {
-            'class': o.ImpactMethod,
-            'objs': [],
-            'ids': []},
-        'Location': {
-            'class': o.Location,
-            'objs': [],
-            'ids': []},
-        'Parameter': {
-            'class': o.Parameter,
-            'objs': [],
-            'ids': []},
-        'Process': {
-            'class': o.Process,
-            'objs': [],
-            'ids': []},
-        'ProductSystem': {
-            'class': o.ProductSystem,
-            'objs': [],
-            'ids': []},
-        'Project': {
-            'class': o.Project,
-            'objs': [],
-            'ids': []},
-        'Result': {
-            'class': o.Result,
-            'objs': [],
-            'ids': []},
-        'SocialIndicator': {
-            'class': o.SocialIndicator,
-            'objs': [],
-            'ids': []},
-        'Source': {
-            'class': o.Source,
-            'objs': [],
-            'ids': []},
-        'UnitGroup': {
-            'class': o.UnitGroup,
-            'objs': [],
-            'ids': []}
+        'Actor': RootEntityRegistry(o.Actor),
+        "Currency": RootEntityRegistry(o.Currency),
+        'DQSystem': RootEntityRegistry(o.DQSystem),
+        'EPD': RootEntityRegistry(o.Epd),
+        'Flow': RootEntityRegistry(o.Flow),
+        'FlowProperty': RootEntityRegistry(o.FlowProperty),
+        'ImpactCategory': RootEntityRegistry(o.ImpactCategory),
+        'ImpactMethod': RootEntityRegistry(o.ImpactMethod),
+        'Location': RootEntityRegistry(o.Location),
+        'Parameter': RootEntityRegistry(o.Parameter),
+        'Process': RootEntityRegistry(o.Process),
+        'ProductSystem': RootEntityRegistry(o.ProductSystem),
+        'Project': RootEntityRegistry(o.Project),
+        'Result': RootEntityRegistry(o.Result),
+        'SocialIndicator': RootEntityRegistry(o.SocialIndicator),
+        'Source': RootEntityRegistry(o.Source),
+        'UnitGroup': RootEntityRegistry(o.UnitGroup),
+    }
+
+
+def _rule_elementary_category(p, e, f_obj, data):
+    """Exchange rule: correct the double Elementary Flows category.
+
+    https://github.com/USEPA/ElectricityLCI/issues/149
+    """
+    if f_obj.category and f_obj.category.startswith(
+            "Elementary flows/Elementary Flows"):
+        logging.warning(
+            "Fixing duplicate Elementary flows category "
+            "for '%s'" % f_obj.name)
+        f_obj.category = f_obj.category.replace("/Elementary Flows/", "/")
+        return True
+    return False
+
+
+def _rule_heat_to_fedefl(p, e, f_obj, data):
+    """Exchange rule: map heat inputs to the FEDEFL heat resource flow.
+
+    https://github.com/USEPA/ElectricityLCI/issues/293
+    """
+    if not (e.is_input and e.flow.name == 'Heat'):
+        return False
+
+    # The new FEDEFL heat resource flow; add elementary flow if missing
+    h_flow = _heat_elem_flow()
+    if h_flow.id not in data['Flow']:
+        data['Flow'].add(h_flow.id, h_flow)
+
+    e.flow = h_flow.to_ref()
+    if e.description:
+        e.description = "mapped to FEDEFL; " + e.description
+    else:
+        e.description = "mapped to FEDEFL"
+    return True
+
+
+def _rule_naics_category(p, e, f_obj, data):
+    """Exchange rule: map third-party technosphere flows to NAICS.
+
+    https://github.com/USEPA/ElectricityLCI/issues/149
+
+    NOTE: this overwrite breaks the reproducibility of the UUIDs for these
+    two flows.
+    """
+    if f_obj.flow_type != o.FlowType.PRODUCT_FLOW:
+        return False
+
+    tech_cat = "Technosphere Flows"
+    pri_cat = "31-33: Manufacturing"
+    naics_cats = {
+        "Light fuel oil": (
+            "3241", "3241: Petroleum and Coal Products Manufacturing"),
+        "Ammonium nitrate": (
+            "3253",
+            "3253: Pesticide, Fertilizer, and Other Agricultural "
+            "Chemical Manufacturing"
+        ),
     }
+    if f_obj.name in naics_cats and pri_cat not in (f_obj.category or ""):
+        code, cat = naics_cats[f_obj.name]
+        logging.warning(
+            "Mapping '%s' technosphere flow to NAICS %s" % (f_obj.name, code))
+        f_obj.category = "/".join([tech_cat, pri_cat, cat])
+        return True
+    return False
+
+
+def _rule_resource_direction(p, e, f_obj, data):
+    """Exchange rule: make output exchanges of resource flows inputs.
+
+    https://github.com/USEPA/ElectricityLCI/issues/233
+    """
+    if not e.is_input and 'resource' in (f_obj.category or "").lower():
+        logging.warning(
+            "Fixing resource flow in output exchange! "
+            "'%s' in %s (%s)" % (f_obj.name, p.name, p.id))
+        e.is_input = True
+        e.description = "mislabeled resources"
+        return True
+    return False
+
+
+def _rule_zero_product(p, e, f_obj, data):
+    """Exchange rule: remove product flows with zero exchange value.
+
+    https://github.com/USEPA/ElectricityLCI/issues/217
+    """
+    if e.amount == 0 and f_obj.flow_type != o.FlowType.ELEMENTARY_FLOW:
+        logging.debug("Removing zero product flow, %s, from %s" % (
+            e.flow.name, p.name))
+        return _DROP
+    return False
 
 
-def _save_to_json(json_file, e_dict):
+def _save_to_json(json_file, e_dict, compression=None, parallel=False):
     """Write an entity dictionary to JSON-LD format.
 
     Parameters
@@ -2002,22 +3334,27 @@ def _save_to_json(json_file, e_dict):
         A file path to an existing or desired JSON-LD zip file.
     e_dict : dict
         An olca-schema entity dictionary where keys are entity names
-        (e.g., 'Actor' and 'Flow') and the values are dictionaries
-        containing lists of olca-schema objects (objs) and their universally
-        unique identifiers (ids).
+        (e.g., 'Actor' and 'Flow') and the values are their root entity
+        registries (see :class:`RootEntityRegistry`).
+    compression : int or str, optional
+        The compression of the zip archive (see :func:`_zip_compression`),
+        by default None (deflated).
+    parallel : bool, optional
+        Whether to serialize entities in parallel worker processes, by
+        default False.
     """
     logging.info("Looking for %s" % os.path.basename(json_file))
     try:
         # Grab UUIDs and class objs from existing JSON-LD
         logging.info("Found existing data in JSON-LD")
-        c_data = _read_jsonld(json_file, _root_entity_dict())
+        c_data = _read_jsonld(json_file, _root_entity_dict(), lazy=True)
     except OSError:
         logging.info("No existing JSON-LD found")
         c_data = _root_entity_dict()
     else:
+        # NOTE: the old archive is replaced when the new one is written
+        # (unread entities are copied from it).
         logging.info("Successfully read data from previous JSON-LD")
-        logging.info("Removing old archive file")
-        os.remove(json_file)
     finally:
         # Update current data (c_data) with new (e_dict).
         # If JSON-LD exists, then current data are those UUIDs and class
@@ -2026,31 +3363,13 @@ def _save_to_json(json_file, e_dict):
         # Remove untracked flows; primarily to reduce database size.
         e_dict = _rm_untracked_flows(e_dict)
 
-    logging.info("Writing to %s" % os.path.basename(json_file))
-    with zipio.ZipWriter(json_file) as writer:
-        for k in e_dict.keys():
-            logging.info("Writing %d %s" % (len(e_dict[k]['ids']), k))
-            if k == "Flow":
-                # FEDEFL flows are not added as objects, write them separately
-                # using fedelmflowlist.write_jsonld() [20240911; BY]
-                flowlist = fedelemflowlist.get_flows()
-                flows = flowlist[flowlist['Flow UUID'].isin(e_dict[k]['ids'])]
-                fedelemflowlist.write_jsonld(flows, path=None, zw=writer)
-
-            for k_obj in e_dict[k]['objs']:
-                # Last chance to fix Ref's and it's not perfect.
-                if isinstance(k_obj, o.Ref):
-                    logging.warning("Found Ref object in JSON-LD writer!")
-                    logging.debug("%s Ref (%s)" % (k, k_obj.id))
-                    k_type = k_obj.ref_type.value
-                    k_dict = k_obj.to_dict()
-                    k_obj = e_dict[k_type]['class'].from_dict(k_dict)
-
-                if k == "Flow" and k_obj.id in flows['Flow UUID'].values:
-                    # all FEDEFL flows written above
-                    continue
-                logging.debug("Writing %s entity (%s)" % (k, k_obj.id))
-                writer.write(k_obj)
+    with _profiled("write_jsonld"):
+        _write_jsonld(json_file, e_dict, compression, parallel)
+
+
+def _session_key(file_path):
+    """Return the key of a JSON-LD file path in the open sessions."""
+    return os.path.abspath(file_path)
 
 
 def _source(src_data, dict_s):
@@ -2093,17 +3412,16 @@ def _source(src_data, dict_s):
     except KeyError:
         category = ''
     finally:
-        uid = _uid(o.ModelType.SOURCE, category, src_data["Name"])
+        uid = make_uuid(o.ModelType.SOURCE, category, src_data["Name"])
 
     # Check if source already exists.
     # If so, retrieve it; otherwise, create new source and record it!
-    if uid in dict_s['Source']['ids']:
-        idx = dict_s['Source']['ids'].index(uid)
-        source = dict_s['Source']['objs'][idx]
+    if uid in dict_s['Source']:
+        source = dict_s['Source'].get(uid)
         logging.debug("Found existing source, %s" % source.name)
     else:
         logging.debug("Creating new source entity for '%s'" % src_data['Name'])
-        source = o.Source()
+        source = o.Source(last_change=_current_time())
         source.id = uid
         source.category = category
         source.name = src_data["Name"]
@@ -2112,8 +3430,7 @@ def _source(src_data, dict_s):
         source.text_reference = _val(
             src_data, "TextReference", default=src_data['Name'])
         source.year = _check_source_year(_val(src_data, "Year"))
-        dict_s['Source']['ids'].append(uid)
-        dict_s['Source']['objs'].append(source)
+        dict_s['Source'].add(uid, source)
 
     return (source.to_ref(), dict_s)
 
@@ -2146,71 +3463,6 @@ def _source_list(s_data, dict_s):
     return (r_list, dict_s)
 
 
-def _uid(*args):
-    """Generate UUID from the MD5 hash of a namespace identifier and a name.
-
-    This method uses OID namespace, which assumes that the name is an ISO OID.
-    Essentially, two strings are hashed together to create a UUID and, if the
-    same namespace and path are given again, the same UUID would be returned.
-
-    Warning
-    -------
-    The UUIDs generated by this method are version 3, which is different
-    from standard processes defined elsewhere (e.g., DQSystems and Units).
-
-    Parameters
-    ----------
-    args : tuple
-        A tuple of key words representing a path (order matters).
-        The path is a string with each argument separated by a forward slash.
-        For flows, the path is 'modeltype.flow', flow name, compartment, and
-        unit.
-        For processes, the path is 'modeltype.process', process category,
-        location, and name.
-
-    Returns
-    -------
-    str
-        A version 3 universally unique identifier (UUID)
-    """
-    path = '/'.join([str(arg).strip() for arg in args]).lower()
-    logging.debug(path)
-    return str(uuid.uuid3(uuid.NAMESPACE_OID, path))
-
-
-def _uid_is_valid(uuid_str, version=3):
-    """Check if string is a valid UUID.
-
-    Parameters
-    ----------
-    uuid_str : str
-    version : {1, 2, 3, 4}
-
-    Returns
-    -------
-    bool
-        `True` if uuid_str is a valid UUID, otherwise `False`.
-
-    Examples
-    --------
-    >>> _uid_is_valid('c9bf9e57-1685-4c89-bafb-ff5af830be8a', 4)
-    True
-    >>> _uid_is_valid('c9bf9e58')
-    False
-
-    Notes
-    -----
-    Code snipped by Rafael (2020). CC-BY-SA 4.0. Online:
-    https://stackoverflow.com/a/33245493
-    """
-    # HOTFIX: deal with non-strings (e.g., nan) [2023-11-14; TWD]
-    try:
-        uuid_obj = uuid.UUID(uuid_str, version=version)
-    except (TypeError, ValueError, AttributeError):
-        return False
-    return str(uuid_obj) == uuid_str
-
-
 def _uncertainty(dict_d):
     """Generate an uncertainty object.
 
@@ -2300,12 +3552,12 @@ def _update_data(cur_data, new_data):
     Parameters
     ----------
     cur_data : dict
-        A data dictionary with UUIDs (ids) and olca root entities (objs) read
-        from a JSON-LD zip archive (i.e., current data).
+        A data dictionary of root entity registries read from a JSON-LD zip
+        archive (i.e., current data).
     new_data : dict
-        A data dictionary with UUIDs (ids) and olca root entities (objs)
-        processed by electricitylci.main; it may be the same or new values as
-        already written to JSON-LD.
+        A data dictionary of root entity registries processed by
+        electricitylci.main; it may be the same or new values as already
+        written to JSON-LD.
 
     Returns
     -------
@@ -2319,18 +3571,23 @@ def _update_data(cur_data, new_data):
         d_new = _make_entity_dict(new_data, k)
         d_cur.update(d_new)
 
-        # Plop the new lists back into the data dictionary
-        ids = []
-        objs = []
+        # Plop the new entities back into the data dictionary
+        r_obj = RootEntityRegistry(cur_data[k].spec)
         for uid, obj in d_cur.items():
-            ids.append(uid)
-            objs.append(obj)
-        new_data[k]['ids'] = ids
-        new_data[k]['objs'] = objs
+            r_obj.add(uid, obj)
+        new_data[k] = r_obj
 
     return new_data
 
 
+@lru_cache(maxsize=None)
+def _uuid_of_path(path):
+    """Return the version 3 UUID (OID namespace) of a normalized path (see
+    :func:`make_uuid`)."""
+    logging.debug(path)
+    return str(uuid.uuid3(uuid.NAMESPACE_OID, path))
+
+
 def _val(dict_d, *path, **kvargs):
     """Return value from a dictionary.
 
@@ -2377,3 +3634,238 @@ def _val(dict_d, *path, **kvargs):
     if r_val is None and 'default' in kvargs:
         r_val = kvargs['default']
     return r_val
+
+
+def _write_jsonld(json_file, e_dict, compression=None, parallel=False):
+    """Write root entity registries to a new JSON-LD zip file.
+
+    Parameters
+    ----------
+    json_file : str
+        A file path to the JSON-LD zip file (overwritten, if it exists).
+    e_dict : dict
+        An olca-schema entity dictionary where keys are entity names
+        (e.g., 'Actor' and 'Flow') and the values are their root entity
+        registries (see :class:`RootEntityRegistry`).
+    compression : int or str, optional
+        The compression of archive members (see :func:`_zip_compression`),
+        by default None (deflate at zlib's default level).
+    parallel : bool, optional
+        Whether to serialize entities to JSON in parallel worker processes,
+        by default False (see :func:`_iter_json`).
+
+    Notes
+    -----
+    Members are written in sorted order (by folder and UUID) with a fixed
+    modification time, so the same entities give a byte-identical archive.
+    Entities that were never read from their JSON-LD archive (see
+    :func:`_read_jsonld`) are copied as-is, without parsing.
+    """
+    logging.info("Writing to %s" % os.path.basename(json_file))
+    c_type, c_level = _zip_compression(compression)
+
+    # Gather the archive members by their path in the zip file.
+    members = {}
+    for k in e_dict.keys():
+        logging.info("Writing %d %s" % (len(e_dict[k]), k))
+        fedefl_ids = set()
+        if k == "Flow":
+            # FEDEFL flows are not added as objects, write them separately
+            # using fedelmflowlist.write_jsonld() [20240911; BY]
+            flows = select_fedefl_flows(e_dict[k].ids())
+            collector = _EntityCollector()
+            fedelemflowlist.write_jsonld(flows, path=None, zw=collector)
+            for k_obj in collector.entities:
+                folder = zipio._folder_of_entity(k_obj)
+                members["%s/%s.json" % (folder, k_obj.id)] = k_obj
+            fedefl_ids = set(flows['Flow UUID'].values)
+
+        folder = zipio._folder_of_class(e_dict[k]['class'])
+        for uid, k_obj in e_dict[k]._raw_items():
+            if uid in fedefl_ids:
+                # all FEDEFL flows written above
+                continue
+            if k_obj is None:
+                continue
+            if isinstance(k_obj, _LazyEntity):
+                # Copy the unread entity's JSON (bytes) as-is.
+                k_obj = k_obj.archive.read_bytes(k_obj.spec, k_obj.uid)
+                if k_obj is not None:
+                    members["%s/%s.json" % (folder, uid)] = k_obj
+                continue
+
+            # Last chance to fix Ref's and it's not perfect.
+            if isinstance(k_obj, o.Ref):
+                logging.warning("Found Ref object in JSON-LD writer!")
+                logging.debug("%s Ref (%s)" % (k, k_obj.id))
+                k_type = k_obj.ref_type.value
+                k_dict = k_obj.to_dict()
+                k_obj = e_dict[k_type]['class'].from_dict(k_dict)
+
+            members["%s/%s.json" % (folder, k_obj.id)] = k_obj
+
+    names = sorted(members.keys())
+    to_json = _iter_json(
+        [members[x] for x in names if not isinstance(members[x], bytes)],
+        parallel
+    )
+
+    # Write to a temporary file and swap it in, so that a failed write
+    # never leaves a partial archive behind.
+    tmp_file = json_file + ".part"
+    n_members = collections.Counter()
+    n_bytes = {}
+    with ZipFile(tmp_file, mode="w", compression=c_type) as z_file:
+        for name in ["olca-schema.json"] + names:
+            if name == "olca-schema.json":
+                data = '{"version": 2}'
+            elif isinstance(members[name], bytes):
+                data = members[name]
+            else:
+                data = next(to_json)
+            z_info = ZipInfo(name, date_time=_ZIP_DATE_TIME)
+            z_info.compress_type = c_type
+            z_info.external_attr = 0o644 << 16
+            z_file.writestr(z_info, data, compresslevel=c_level)
+
+            # Count the entities and their bytes in each folder
+            if "/" not in name:
+                continue
+            folder = name.split("/")[0]
+            n_members[folder] += 1
+            f_bytes = n_bytes.setdefault(
+                folder, {'uncompressed': 0, 'compressed': 0})
+            f_bytes['uncompressed'] += z_info.file_size
+            f_bytes['compressed'] += z_info.compress_size
+
+    if _PROFILE is not None:
+        _PROFILE.entities = dict(n_members)
+        _PROFILE.bytes = n_bytes
+
+    # Release the old archive, if any, before it is replaced
+    _close_archive(json_file)
+    os.replace(tmp_file, json_file)
+
+
+def _write_processes(processes, spec_map, parallel=False):
+    """Create olca-schema processes (and their root entities) from process
+    dictionaries and add them to a root entity dictionary.
+
+    Called by :func:`write`. Processes are made in two steps: first, the
+    processes and the root entities they share (e.g., flows, locations,
+    sources, actors, and DQ systems) are resolved in order (see
+    :func:`_plan_process`); second, each process's exchanges are made,
+    which is independent of the other processes (see
+    :func:`_make_exchanges`) and may be run in a process pool. The results
+    are the same either way.
+
+    Parameters
+    ----------
+    processes : dict
+        OLCA schema dictionaries (e.g. Process).
+    spec_map : dict
+        A dictionary of root entity registries (see
+        :func:`_root_entity_dict`), which is updated in place.
+    parallel : bool, optional
+        Whether to make exchanges in parallel worker processes, by default
+        False. Requires an operating system that can fork processes;
+        otherwise, exchanges are made serially.
+
+    Returns
+    -------
+    dict
+        Original processes dictionary updated.
+    """
+    # Step one: resolve the processes and their shared root entities.
+    f_cache = {}
+    p_list = []
+    for p_key in processes.keys():
+        # Pull the process dictionary
+        d_vals = processes[p_key]
+
+        # Create new process object; exchanges are made below
+        logging.info("Generating process for %s" % p_key)
+        p, spec_map, e_list = _plan_process(d_vals, spec_map, f_cache)
+        spec_map['Process'].add(p.id, p)
+        p_list.append((p_key, p, e_list))
+
+    # Step two: make the exchanges of new processes.
+    e_lists = [x[2] for x in p_list if x[2] is not None]
+    mp_context = None
+    if parallel and len(e_lists) > 1:
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            logging.warning(
+                "Parallel JSON-LD writing requires forked processes; "
+                "making exchanges serially")
+    if mp_context is None:
+        results = map(_make_exchanges, e_lists)
+    else:
+        logging.info(
+            "Making exchanges for %d processes in parallel" % len(e_lists))
+        with ProcessPoolExecutor(mp_context=mp_context) as executor:
+            chunk = max(1, len(e_lists) // (4 * (os.cpu_count() or 1)))
+            results = list(executor.map(
+                _make_exchanges, e_lists, chunksize=chunk))
+    results = iter(results)
+
+    for p_key, p, e_list in p_list:
+        if e_list is None:
+            # HOTFIX: add missing e_ref from existing process
+            e = _find_ref_exchange(p)
+        else:
+            p.exchanges, e = next(results)
+
+        # Update the process dictionary and add UUID and reference details
+        processes[p_key].update(p.to_dict())
+        processes[p_key]['uuid'] = p.id
+        if e is not None and isinstance(e, o.Exchange):
+            try:
+                processes[p_key]['q_reference_name'] = e.flow.name
+                processes[p_key]['q_reference_id'] = e.flow.id
+                processes[p_key]['q_reference_cat'] = e.flow.category
+                processes[p_key]['q_reference_unit'] = e.unit.name
+            except Exception as exception:
+                logging.warning(
+                    "Unexpected error when accessing quantitative "
+                    "reference exchange for '%s'. %s" % (
+                        p_key, str(exception)
+                    )
+                )
+
+    return processes
+
+
+def _zip_compression(compression=None):
+    """Return the zip file compression method and level for JSON-LD.
+
+    Parameters
+    ----------
+    compression : int or str, optional
+        Either "stored" (no compression; e.g., for intermediate archives
+        that are re-opened by :func:`clean_json` and
+        :func:`build_product_systems`), "deflated", or a deflate
+        compression level (0--9). Defaults to None (i.e., "deflated" at
+        zlib's default level).
+
+    Returns
+    -------
+    tuple
+        The zipfile compression constant (int) and level (int or NoneType).
+
+    Raises
+    ------
+    ValueError
+        If the compression is not recognized.
+    """
+    if compression is None or compression == "deflated":
+        return (ZIP_DEFLATED, None)
+    if compression == "stored":
+        return (ZIP_STORED, None)
+    if isinstance(compression, int) and not isinstance(compression, bool):
+        if 0 <= compression <= 9:
+            return (ZIP_DEFLATED, compression)
+    raise ValueError(
+        "Unknown JSON-LD compression, '%s'; expected 'stored', "
+        "'deflated', or a level from 0 to 9" % compression)
@@ -10,6 +10,7 @@ import logging
 import os
 import time
 
+import numpy as np
 import yaml
 import pandas as pd
 
@@ -38,7 +39,7 @@ JSON-LD format as prescribed by OpenLCA software.
 Portions of this code were cleaned using ChatGPTv3.5.
 
 Last updated:
-    2025-06-09
+    2026-10-17
 """
 __all__ = [
     'con_process_ref',
@@ -55,6 +56,7 @@ __all__ = [
     'exchange_table_creation_ref',
     'exchange_table_creation_ref_cons',
     'flow_table_creation',
+    'flow_table_records',
     'gen_process_ref',
     'location',
     'lookup_location_uuid',
@@ -69,6 +71,7 @@ __all__ = [
     'process_table_creation_usaverage',
     'ref_exchange_creator',
     'uncertainty_table_creation',
+    'uncertainty_table_records',
     'unit'
 ]
 
@@ -190,6 +193,47 @@ VALID_FUEL_CATS=[
 ##############################################################################
 # FUNCTIONS
 ##############################################################################
+def _flow_category(flowtype, comp):
+    """
+    Return the flow category path for a flow type and compartment.
+
+    Used by :func:`flow_table_creation` and :func:`flow_table_records`.
+
+    Parameters
+    ----------
+    flowtype : str
+        The flow type (e.g., 'ELEMENTARY_FLOW').
+    comp : str
+        The flow compartment (e.g., 'emission/air').
+
+    Returns
+    -------
+    str
+        The category path.
+    """
+    if (flowtype == "ELEMENTARY_FLOW") and (comp != ""):
+        # HOTFIX duplicate compartment [25.06.09; TWD]
+        if comp.startswith("Elementary Flows/"):
+            comp = comp.replace("Elementary Flows/", "")
+        if "emission" in comp or "resource" in comp:
+            category = "Elementary Flows/" + comp
+        elif "input" in comp:
+            category = "Elementary Flows/resource"
+        else:
+            category = "Elementary Flows/emission/" + comp.lstrip("/")
+    elif (flowtype == "PRODUCT_FLOW") and (comp != ""):
+        category = comp
+    elif flowtype == "WASTE_FLOW":
+        category = comp
+    else:
+        # Assume this is electricity or a byproduct
+        category = (
+            "Technosphere Flows/22: Utilities/"
+            "2211: Electric Power Generation, Transmission and Distribution")
+
+    return category
+
+
 def con_process_ref(reg, ref_type="generation"):
     """
     Generate a reference process entry for electricity consumption or
@@ -763,30 +807,57 @@ def flow_table_creation(data):
     ar["name"] = data["FlowName"].iloc[0][:255]  # Corrected string slicing
     ar["id"] = data["FlowUUID"].iloc[0]
     comp = str(data["Compartment"].iloc[0])
-
-    if (flowtype == "ELEMENTARY_FLOW") and (comp != ""):
-        # HOTFIX duplicate compartment [25.06.09; TWD]
-        if comp.startswith("Elementary Flows/"):
-            comp = comp.replace("Elementary Flows/", "")
-        if "emission" in comp or "resource" in comp:
-            ar["category"] = "Elementary Flows/" + comp
-        elif "input" in comp:
-            ar["category"] = "Elementary Flows/resource"
-        else:
-            ar["category"] = "Elementary Flows/emission/" + comp.lstrip("/")
-    elif (flowtype == "PRODUCT_FLOW") and (comp != ""):
-        ar["category"] = comp
-    elif flowtype == "WASTE_FLOW":
-        ar["category"] = comp
-    else:
-        # Assume this is electricity or a byproduct
-        ar["category"] = (
-            "Technosphere Flows/22: Utilities/"
-            "2211: Electric Power Generation, Transmission and Distribution")
+    ar["category"] = _flow_category(flowtype, comp)
 
     return ar
 
 
+def flow_table_records(data):
+    """
+    Create flow table entries for every row of provided data.
+
+    The column-wise counterpart of :func:`flow_table_creation`, which avoids
+    slicing a one-row data frame for each flow. Category paths are derived
+    once per unique flow type and compartment pair.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Data containing flow information, including flow type, name, UUID, and
+        category (see :func:`flow_table_creation`).
+
+    Returns
+    -------
+    list
+        A list of dictionaries representing flow table entries, one for each
+        row in the data frame (in the same order).
+    """
+    flow_type = data["FlowType"].to_numpy()
+    comp = data["Compartment"].astype(str).to_numpy()
+
+    # Find the category for each unique (flow type, compartment) pair
+    cat_df = pd.DataFrame({"FlowType": flow_type, "Compartment": comp})
+    codes, uniques = pd.factorize(
+        pd.MultiIndex.from_frame(cat_df), use_na_sentinel=False)
+    categories = []
+    for ft, c in uniques:
+        categories.append(_flow_category(ft, c))
+    categories = np.array(categories, dtype=object)[codes]
+
+    names = data["FlowName"].str[:255].to_numpy()
+    ids = data["FlowUUID"].to_numpy()
+
+    return [
+        {
+            "flowType": ft,
+            "flowProperties": "",
+            "name": n,
+            "id": i,
+            "category": c,
+        } for ft, n, i, c in zip(flow_type, names, ids, categories)
+    ]
+
+
 def gen_process_ref(fuel, reg):
     """
     Generate a reference process entry for electricity generation.
@@ -1560,6 +1631,39 @@ def uncertainty_table_creation(data):
     return ar
 
 
+def uncertainty_table_records(data):
+    """
+    Create uncertainty table entries for every row of provided data.
+
+    The column-wise counterpart of :func:`uncertainty_table_creation`.
+    Rows without a geometric mean or geometric standard deviation get an
+    empty dictionary.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Data containing uncertainty information, including 'GeomMean' and
+        'GeomSD' columns.
+
+    Returns
+    -------
+    list
+        A list of dictionaries representing uncertainty table entries, one
+        for each row in the data frame (in the same order).
+    """
+    gm = data["GeomMean"].to_numpy(dtype=float)
+    gs = data["GeomSD"].to_numpy(dtype=float)
+    is_valid = ~(np.isnan(gm) | np.isnan(gs))
+
+    return [
+        {
+            "geomMean": m,
+            "geomSd": sd,
+            "distributionType": "Logarithmic Normal Distribution",
+        } if v else {} for m, sd, v in zip(gm, gs, is_valid)
+    ]
+
+
 def unit(unt):
     """
     Create a unit entry based on the provided unit name.
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# qio_tests.py
+#
+##############################################################################
+# REQUIRED MODULES
+##############################################################################
+import numpy as np
+import pandas as pd
+
+import electricitylci.model_config as config
+from unit_tests import print_messages
+from unit_tests import show_msg
+
+
+##############################################################################
+# GLOBALS
+##############################################################################
+QIO_BAS = [
+    'EPE', 'MISO', 'PNM', 'PSCO', 'SWPP', 'WACM', 'WAUE', 'WAUW', 'ZERO']
+'''list : Balancing authority codes of the regression case, including the
+codes used to split the eastern and western interconnects.'''
+QIO_NET_GEN = [1200., 60000., 2500., 4000., 25000., 3000., 9000., 800., 0.]
+'''list : Net generation (MWh) of the regression case; ZERO has no inflow.'''
+QIO_TRADES = {
+    ('EPE', 'PNM'): 150.,
+    ('MISO', 'SWPP'): 1100.,
+    ('PNM', 'EPE'): 40.,
+    ('PNM', 'PSCO'): 90.,
+    ('PSCO', 'WACM'): 300.,
+    ('SWPP', 'EPE'): 60.,
+    ('SWPP', 'MISO'): 900.,
+    ('SWPP', 'PSCO'): 80.,
+    ('SWPP', 'WAUE'): 400.,
+    ('WACM', 'PSCO'): 120.,
+    ('WAUE', 'MISO'): 2000.,
+    ('WAUE', 'WACM'): 25.,
+    ('WAUE', 'WAUW'): 30.,
+    ('WAUW', 'WAUE'): 10.,
+}
+'''dict : Trades (MWh) of the regression case from exporter to importer.'''
+QIO_H = [
+    [1152.0063972084909, 0.0, 142.89037510904333, 4.758367744195779, 0.0,
+     0.34485993827005423, 0.0, 0.0, 0.0],
+    [0.0, 61840.815018317975, 0.0, 0.0, 1039.9967440308583, 0.0,
+     13.185358800790798, 0.0, 0.0],
+    [35.44635068333818, 0.0, 2524.396626926432, 84.06449681412543, 0.0,
+     6.0925255761042925, 0.0, 0.0, 0.0],
+    [0.0, 0.0, 0.0, 4000.0954087818254, 0.0, 289.90459121817514, 0.0, 0.0,
+     0.0],
+    [0.0, 968.4290709994431, 0.0, 0.0, 24676.28638109582, 0.0,
+     312.85260427330894, 0.0, 0.0],
+    [0.0, 0.0, 0.0, 111.89078066522589, 0.0, 3213.1092193347745, 0.0, 0.0,
+     0.0],
+    [0.0, 1966.3216222040692, 0.0, 0.0, 33.0682589516966, 0.0,
+     7355.419248292553, 0.0, 0.0],
+    [0.0, 2.0896085251902967, 0.0, 0.0, 0.03514161418883805, 0.0,
+     7.816598563541501, 820.0, 0.0],
+    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+]
+'''list : The pinned trade matrix, H, of the regression case, as computed
+with dense matrix inverses before the LU solve; that is, (I - B)^-1 diag(c)
+without the diag(x)^-1 factor that was passed to numpy.matmul as its
+output argument.'''
+
+
+##############################################################################
+# FUNCTIONS
+##############################################################################
+def check_qio_matrix():
+    a = 'Checking QIO trade matrix regression'
+    is_okay = True
+    err = None
+
+    # Import here, after the model specs are set.
+    import electricitylci.eia_io_trading as eio
+
+    net_gen_df, trade_pivot = make_qio_case()
+    expected = np.array(QIO_H)
+
+    # Check both the sparse and the dense LU solves.
+    details = ''
+    sparse_density = eio.QIO_SPARSE_DENSITY
+    try:
+        for solver, density in [('sparse', 1.0), ('dense', 0.0)]:
+            eio.QIO_SPARSE_DENSITY = density
+            H = eio._qio_matrix(net_gen_df, trade_pivot)
+            if not np.allclose(H.values, expected, rtol=1e-9, atol=1e-9):
+                diff = np.abs(H.values - expected).max()
+                details += '%s solve differs by up to %g MWh.\n' % (
+                    solver, diff)
+            if list(H.index) != QIO_BAS or list(H.columns) != QIO_BAS:
+                details += '%s solve has the wrong BA order.\n' % solver
+    finally:
+        eio.QIO_SPARSE_DENSITY = sparse_density
+
+    if details == '':
+        show_msg(a, 'PASSED')
+    else:
+        show_msg(a, 'FAILED')
+        is_okay = False
+        err = {
+            'msg': 'The QIO trade matrix differs from the pinned matrix!',
+            'details': details,
+        }
+
+    return (is_okay, err)
+
+
+def make_qio_case():
+    """Return the net generation and trade pivot of the regression case."""
+    net_gen_df = pd.DataFrame({0: QIO_NET_GEN}, index=QIO_BAS)
+    trade_pivot = pd.DataFrame(0.0, index=QIO_BAS, columns=QIO_BAS)
+    for (exporter, importer), amount in QIO_TRADES.items():
+        trade_pivot.loc[exporter, importer] = amount
+
+    return (net_gen_df, trade_pivot)
+
+
+##############################################################################
+# MAIN
+##############################################################################
+if __name__ == '__main__':
+    config.model_specs = config.build_model_class("ELCI_1")
+
+    is_okay, error = check_qio_matrix()
+    if not is_okay:
+        print_messages([error], 57)
+        print(error['details'])